@@ -40,6 +40,9 @@ setup(
         'django-filter>=0.8',
         'django-nose>=1.3',
     ],
+    extras_require={
+        'numpy': ['numpy'],
+    },
     entry_points={
         'django.pluggable_app': [
             'scrooge = ralph_scrooge.app:Scrooge',
@@ -30,6 +30,7 @@ from tastypie.resources import Resource
 from tastypie.exceptions import ImmediateHttpResponse
 
 from ralph_scrooge.models import (
+    CostInputChange,
     DailyUsage,
     PricingObject,
     PricingService,
@@ -426,6 +427,12 @@ class PricingServiceUsageResource(Resource):
 
         # bulk save all usages
         DailyUsage.objects.bulk_create(daily_usages)
+        # usages are not tracked by signals - mark changes explicitly
+        CostInputChange.mark_usages(
+            usages_daily_pricing_objects.keys(),
+            pricing_service_usages.date,
+            pricing_service_usages.date,
+        )
 
     # =================
     # GET
@@ -0,0 +1,6 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks of Scrooge internals. Every benchmark is runnable as a module, ex.:
+
+    python -m ralph_scrooge.benchmarks.cost_tree
+"""
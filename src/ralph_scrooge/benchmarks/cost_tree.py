@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of costs tree representation - dicts (previous format returned by
+costs plugins) vs CostNode.
+
+Generates costs tree similar to pricing service costs (for every pricing
+object there is a hierarchy of costs of usage types and dependent pricing
+services) and measures time of building it and (approximated) memory used by
+it.
+
+Usage:
+
+    python -m ralph_scrooge.benchmarks.cost_tree [pricing_objects] [depth]
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import sys
+import time
+from decimal import Decimal as D
+
+from ralph_scrooge.utils.cost_tree import CostNode
+
+CHILDREN_COUNT = 3
+
+
+def build_dict_tree(pricing_object_id, depth, type_id=1):
+    node = {
+        'type_id': type_id,
+        'pricing_object_id': pricing_object_id,
+        'cost': D('1.234567'),
+        'value': 10.0,
+    }
+    if depth:
+        node['_children'] = [
+            build_dict_tree(pricing_object_id, depth - 1, type_id * 10 + i)
+            for i in range(CHILDREN_COUNT)
+        ]
+    return node
+
+
+def build_nodes_tree(pricing_object_id, depth, type_id=1):
+    node = CostNode(
+        type_id=type_id,
+        pricing_object_id=pricing_object_id,
+        cost=D('1.234567'),
+        value=10.0,
+    )
+    if depth:
+        node.children = [
+            build_nodes_tree(pricing_object_id, depth - 1, type_id * 10 + i)
+            for i in range(CHILDREN_COUNT)
+        ]
+    return node
+
+
+def get_size(node):
+    """
+    Returns approximated size (in bytes) of costs tree - size of every node
+    (and its children list). Values (shared between both representations) are
+    not counted.
+    """
+    if isinstance(node, dict):
+        children = node.get('_children', [])
+    else:
+        children = node.children or []
+    size = sys.getsizeof(node)
+    if children:
+        size += sys.getsizeof(children)
+    return size + sum(get_size(child) for child in children)
+
+
+def run(builder, pricing_objects, depth):
+    start = time.time()
+    tree = [builder(po, depth) for po in range(pricing_objects)]
+    duration = time.time() - start
+    size = sum(get_size(node) for node in tree)
+    return duration, size
+
+
+def main(pricing_objects=10000, depth=2):
+    nodes_count = pricing_objects * sum(
+        CHILDREN_COUNT ** i for i in range(depth + 1)
+    )
+    print('Costs tree: {} pricing objects, depth {} ({} nodes)'.format(
+        pricing_objects,
+        depth,
+        nodes_count,
+    ))
+    results = {}
+    for name, builder in (
+        ('dict', build_dict_tree),
+        ('CostNode', build_nodes_tree),
+    ):
+        duration, size = results[name] = run(builder, pricing_objects, depth)
+        print('{:>10}: {:8.3f} s, {:8.2f} MB ({} B per node)'.format(
+            name,
+            duration,
+            size / 1024 / 1024,
+            size // nodes_count,
+        ))
+    print('Memory saved: {:.1%}, time saved: {:.1%}'.format(
+        1 - results['CostNode'][1] / results['dict'][1],
+        1 - results['CostNode'][0] / results['dict'][0],
+    ))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
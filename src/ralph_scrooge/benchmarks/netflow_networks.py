@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of classification of nfdump rows by networks (NFSEN_CLASS_ADDRESS)
+- linear scan of networks using `ipaddr` objects for every row (previous
+implementation of `netflow.extract_ip_and_bytes`) vs `NetworksIndex`.
+
+Generates nfdump output rows (addresses of some of them are in networks)
+and measures time of selecting addresses belonging to networks.
+
+Usage:
+
+    python -m ralph_scrooge.benchmarks.netflow_networks [rows] [networks]
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import random
+import socket
+import struct
+import sys
+import time
+
+import ipaddr
+
+from ralph_scrooge.utils.networks import NetworksIndex
+
+# ratio of rows which addresses belong to networks
+MATCH_RATIO = 0.5
+
+
+def _int_to_ip(value):
+    return socket.inet_ntoa(struct.pack(b'!I', value)).decode('ascii')
+
+
+def generate_networks(count):
+    networks = []
+    for i in range(count):
+        prefix_length = random.choice([16, 20, 24, 24, 28, 32])
+        network = random.getrandbits(32) & (
+            (2 ** 32 - 1) ^ (2 ** (32 - prefix_length) - 1)
+        )
+        networks.append('{}/{}'.format(_int_to_ip(network), prefix_length))
+    return networks
+
+
+def generate_rows(count, networks):
+    parsed = [ipaddr.IPv4Network(network) for network in networks]
+    rows = []
+    for i in range(count):
+        if random.random() < MATCH_RATIO:
+            network = random.choice(parsed)
+            address = _int_to_ip(random.randint(
+                int(network.network),
+                int(network.broadcast),
+            ))
+        else:
+            address = _int_to_ip(random.getrandbits(32))
+        rows.append('{} | 10.0.0.1 | {} | 443 | TCP | {}'.format(
+            address,
+            random.randint(1, 65535),
+            random.randint(1, 10 ** 6),
+        ))
+    return rows
+
+
+def _get_address(row):
+    return row.split('|')[0].strip()
+
+
+def classify_linear(rows, networks):
+    """
+    Previous implementation of `netflow.extract_ip_and_bytes`.
+    """
+    result = []
+    for row in rows:
+        address = _get_address(row)
+        for network in networks:
+            if ipaddr.IPv4Address(address) in ipaddr.IPv4Network(network):
+                result.append(address)
+                break
+    return result
+
+
+def classify_index(rows, networks):
+    index = NetworksIndex(networks)
+    return [
+        address for address in map(_get_address, rows) if address in index
+    ]
+
+
+def run(func, *args):
+    start = time.time()
+    result = func(*args)
+    return time.time() - start, result
+
+
+def main(rows_count=1000000, networks_count=20):
+    networks = generate_networks(networks_count)
+    rows = generate_rows(rows_count, networks)
+    print('Netflow networks: {} rows, {} networks'.format(
+        rows_count,
+        networks_count,
+    ))
+    results = {}
+    for name, func in [
+        ('linear', classify_linear),
+        ('index', classify_index),
+    ]:
+        duration, matched = results[name] = run(func, rows, networks)
+        print('{:>10}: {:8.3f} s ({} rows matched)'.format(
+            name,
+            duration,
+            len(matched),
+        ))
+    if results['index'][1] != results['linear'][1]:
+        print('index results are different than linear results!')
+    print('Time saved: {:.1%}'.format(
+        1 - results['index'][0] / results['linear'][0],
+    ))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
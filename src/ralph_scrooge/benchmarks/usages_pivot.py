@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of pivot of daily usages into rows of services usages report -
+nested loops (previous implementation, lookup and formatting of every cell
+separately) vs pivot in pure Python vs vectorized (NumPy) pivot.
+
+Generates usages of usage types for every service environment and day (with
+some cells missing) and measures time of building rows of report.
+
+Usage:
+
+    python -m ralph_scrooge.benchmarks.usages_pivot [service_environments] \
+        [days] [usage_types]
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import datetime
+import random
+import sys
+import time
+from collections import namedtuple
+
+from dateutil import rrule
+
+from ralph_scrooge.report import pivot
+
+ServiceEnvironment = namedtuple('ServiceEnvironment', ['id'])
+UsageType = namedtuple('UsageType', ['id', 'divide_by', 'rounding'])
+
+START = datetime.date(2014, 1, 1)
+FILL_RATIO = 0.8
+
+
+def generate_data(service_environments, days, usage_types):
+    data = {}
+    for day in rrule.rrule(rrule.DAILY, dtstart=START, count=days):
+        data[day.date()] = dict(
+            (ut.id, dict(
+                (se.id, random.random() * 1000)
+                for se in service_environments
+                if random.random() < FILL_RATIO
+            )) for ut in usage_types
+        )
+    return data
+
+
+def _prepare_field(value, usage_type):
+    if usage_type.divide_by:
+        value = value / float(10 ** usage_type.divide_by)
+    return round(value, usage_type.rounding)
+
+
+def pivot_loops(start, end, usage_types, data, service_environments):
+    """
+    Previous implementation of `ServicesUsagesReport._prepare_final_report`.
+    """
+    rows = []
+    for se in service_environments:
+        row = []
+        for day in rrule.rrule(rrule.DAILY, dtstart=start, until=end):
+            date = day.date()
+            for usage_type in usage_types:
+                try:
+                    value = _prepare_field(
+                        data[date][usage_type.id][se.id],
+                        usage_type,
+                    )
+                except KeyError:
+                    value = _prepare_field(0, usage_type)
+                row.append(value)
+        rows.append(row)
+    return rows
+
+
+def run(func, *args):
+    start = time.time()
+    result = func(*args)
+    return time.time() - start, result
+
+
+def main(service_environments_count=3000, days=90, usage_types_count=3):
+    service_environments = [
+        ServiceEnvironment(i) for i in range(service_environments_count)
+    ]
+    usage_types = [
+        UsageType(i, divide_by=i % 3, rounding=i % 4)
+        for i in range(usage_types_count)
+    ]
+    end = START + datetime.timedelta(days=days - 1)
+    data = generate_data(service_environments, days, usage_types)
+    columns = pivot.get_columns(START, end, usage_types)
+    print('Usages pivot: {} service environments, {} days, {} usage types '
+          '({} cells)'.format(
+              service_environments_count,
+              days,
+              usage_types_count,
+              service_environments_count * len(columns),
+          ))
+    benchmarks = [
+        ('loops', pivot_loops, (
+            START,
+            end,
+            usage_types,
+            data,
+            service_environments,
+        )),
+        ('python', pivot.pivot_python, (
+            columns,
+            data,
+            service_environments,
+        )),
+    ]
+    if pivot.is_available():
+        benchmarks.append(('numpy', pivot.pivot_numpy, (
+            columns,
+            data,
+            service_environments,
+        )))
+    results = {}
+    for name, func, args in benchmarks:
+        duration, rows = results[name] = run(func, *args)
+        print('{:>10}: {:8.3f} s'.format(name, duration))
+    for name in results:
+        if results[name][1] != results['loops'][1]:
+            print('{} results are different than loops results!'.format(name))
+    for name in results:
+        if name != 'loops':
+            print('Time saved ({}): {:.1%}'.format(
+                name,
+                1 - results[name][0] / results['loops'][0],
+            ))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
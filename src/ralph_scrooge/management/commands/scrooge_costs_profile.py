@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import logging
+from datetime import date, datetime, timedelta
+from optparse import make_option
+
+from django.db.models import Count, Sum
+from django.utils.translation import ugettext_lazy as _
+
+from ralph_scrooge.management.commands._scrooge_base import ScroogeBaseCommand
+from ralph_scrooge.models import CostPluginProfile
+
+logger = logging.getLogger(__name__)
+
+ORDER_BY_CHOICES = [
+    'wall_time',
+    'db_time',
+    'queries_count',
+    'rows_count',
+    'nodes_count',
+]
+
+
+class Command(ScroogeBaseCommand):
+    """
+    Show cost plugins, which were the slowest (or executed most SQL queries
+    etc.) in costs collecting between start and end (see COSTS_PROFILING
+    setting).
+    """
+    HEADERS = [
+        'Plugin',
+        'Name',
+        'Total cost',
+        'Days',
+        'Wall time [s]',
+        'DB time [s]',
+        'Queries',
+        'Rows',
+        'Cost nodes',
+    ]
+    option_list = ScroogeBaseCommand.option_list + (
+        make_option(
+            '-s', '--start',
+            dest='start',
+            default=None,
+            help=_('Date from which show profiles (default: yesterday)'),
+        ),
+        make_option(
+            '--end',
+            dest='end',
+            default=None,
+            help=_('Date to which show profiles (default: yesterday)'),
+        ),
+        make_option(
+            '--forecast',
+            dest='forecast',
+            default=False,
+            action='store_true',
+            help=_('Show profiles of forecast costs collecting'),
+        ),
+        make_option(
+            '-o', '--order-by',
+            dest='order_by',
+            type='choice',
+            choices=ORDER_BY_CHOICES,
+            default='wall_time',
+            help=_('Sort plugins by (descending)'),
+        ),
+        make_option(
+            '-l', '--limit',
+            dest='limit',
+            type='int',
+            default=20,
+            help=_('Number of plugins to show'),
+        ),
+    )
+
+    def _parse_date(self, date_):
+        """
+        Parse given date or returns default (yesterday).
+        """
+        if date_:
+            return datetime.strptime(date_, '%Y-%m-%d').date()
+        else:
+            return date.today() - timedelta(days=1)
+
+    def get_profiles(self, start, end, forecast, order_by, limit):
+        """
+        Returns profiles of plugins (summed for all days between start and
+        end) sorted descending by order_by field.
+        """
+        return CostPluginProfile.objects.filter(
+            date__gte=start,
+            date__lte=end,
+            forecast=forecast,
+        ).values(
+            'plugin_name',
+            'name',
+            'total_cost',
+        ).annotate(
+            days=Count('id'),
+            **dict([
+                ('{}_sum'.format(field), Sum(field))
+                for field in ORDER_BY_CHOICES
+            ])
+        ).order_by('-{}_sum'.format(order_by))[:limit]
+
+    def get_data(self, *args, **options):
+        profiles = self.get_profiles(
+            start=self._parse_date(options['start']),
+            end=self._parse_date(options['end']),
+            forecast=options['forecast'],
+            order_by=options['order_by'],
+            limit=options['limit'],
+        )
+        return [
+            [
+                profile['plugin_name'],
+                profile['name'],
+                profile['total_cost'],
+                profile['days'],
+                '{:.3f}'.format(profile['wall_time_sum']),
+                '{:.3f}'.format(profile['db_time_sum']),
+                profile['queries_count_sum'],
+                profile['rows_count_sum'],
+                profile['nodes_count_sum'],
+            ] for profile in profiles
+        ]
@@ -7,12 +7,15 @@ from __future__ import unicode_literals
 
 import datetime
 import logging
+import multiprocessing
 import pkg_resources
 import textwrap
+import Queue
 from optparse import make_option
 
 from django.core.management.base import BaseCommand
 from django.conf import settings
+from django.db import connection
 from ralph.util import plugin
 
 from ralph_scrooge.models import SyncStatus
@@ -66,10 +69,97 @@ def _run_plugin(name, today):
         logger.info('Done: {0}'.format(message))
 
 
-def run_plugins(today, plugins, run_only=False):
+def _init_worker():
+    """
+    Initialize process pool worker - drop database connection inherited from
+    parent process (new one will be opened on first query in the worker).
+    """
+    connection.close()
+
+
+def _run_plugin_in_worker(params):
+    """
+    Run single plugin in process pool worker.
+
+    :param tuple params: plugin name and date
+    :returns tuple: plugin name and status of its run
+    """
+    name, today = params
+    try:
+        _run_plugin(name, today)
+        return name, True
+    except Exception:
+        return name, False
+
+
+def _run_plugins_sequential(today, plugins, tried):
+    """
+    Runs plugins one by one (plugin with highest priority first).
+    """
+    done = set()
+    while True:
+        to_run = plugin.next('scrooge', done) - tried
+        if not to_run:
+            break
+        name = plugin.highest_priority('scrooge', to_run)
+        tried.add(name)
+        if name in plugins:
+            try:
+                _run_plugin(name, today)
+                done.add(name)
+                yield name, True
+            except PluginError:
+                yield name, False
+
+
+def _run_plugins_parallel(today, plugins, tried, workers):
+    """
+    Runs plugins in pool of processes - every plugin, which dependencies are
+    satisfied, is started at once (plugins with highest priority first), so
+    independent plugins are running concurrently.
+    """
+    done = set()
+    results = Queue.Queue()
+    # close connection before forking to not share it between processes
+    connection.close()
+    pool = multiprocessing.Pool(processes=workers, initializer=_init_worker)
+    running = 0
+    try:
+        while True:
+            to_run = plugin.next('scrooge', done) - tried
+            for name in plugin.prioritize('scrooge', to_run):
+                tried.add(name)
+                if name in plugins:
+                    logger.info('Scheduling {0}...'.format(name))
+                    pool.apply_async(
+                        _run_plugin_in_worker,
+                        ((name, today),),
+                        callback=results.put,
+                    )
+                    running += 1
+            if not running:
+                break
+            name, success = results.get()
+            running -= 1
+            if success:
+                done.add(name)
+            yield name, success
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def run_plugins(today, plugins, run_only=False, workers=None):
+    """
+    Runs collect plugins (in order of their dependencies). When workers is
+    greater than 1 (default is `COLLECT_PLUGINS_WORKERS` setting), plugins
+    which dependencies are satisfied are running concurrently in pool of
+    processes.
+
+    :returns: generator of tuples (plugin name, status of its run)
+    """
     _load_plugins()
     logger.info('Synchronizing for {0}.'.format(today.isoformat()))
-    done = set()
     tried = set()
     if run_only:
         name = plugins[0]
@@ -79,19 +169,14 @@ def run_plugins(today, plugins, run_only=False):
         except Exception:
             yield name, False
     else:
-        while True:
-            to_run = plugin.next('scrooge', done) - tried
-            if not to_run:
-                break
-            name = plugin.highest_priority('scrooge', to_run)
-            tried.add(name)
-            if name in plugins:
-                try:
-                    _run_plugin(name, today)
-                    done.add(name)
-                    yield name, True
-                except PluginError:
-                    yield name, False
+        if workers is None:
+            workers = settings.COLLECT_PLUGINS_WORKERS
+        if workers > 1:
+            results = _run_plugins_parallel(today, plugins, tried, workers)
+        else:
+            results = _run_plugins_sequential(today, plugins, tried)
+        for result in results:
+            yield result
 
         # save not executed plugins
         for p in set(plugins) - tried:
@@ -22,6 +22,7 @@ from ralph_scrooge.models import (
     UsageType,
 )
 from ralph_scrooge.plugins.cost.collector import Collector
+from ralph_scrooge.plugins.cost.price_book import PriceBook
 from ralph_scrooge.utils.common import memoize, normalize_decimal
 
 logger = logging.getLogger(__name__)
@@ -110,6 +111,13 @@ class Command(ScroogeBaseCommand):
         for day in dates_to_calculate:
             collector.process(day, forecast, plugins)
 
+    @memoize(skip_first=True)
+    def _get_price_book(self, start, end):
+        """
+        Return usage prices (of all usage types) between start and end.
+        """
+        return PriceBook(start, end)
+
     @memoize(skip_first=True)
     def _get_usage_prices(self, type_id, start, end, forecast):
         """
@@ -117,10 +125,11 @@ class Command(ScroogeBaseCommand):
         """
         usage_type = UsageType.objects.get(pk=type_id)
         prices = []
-        for price in usage_type.usageprice_set.filter(
-            start__lte=end,
-            end__gte=start,
-        ).order_by('start'):
+        for price in self._get_price_book(start, end).get_usage_prices_between(
+            usage_type,
+            start,
+            end,
+        ):
             prices.append(price.forecast_price if forecast else price.price)
         return usage_type, ' / '.join(
             map(lambda x: unicode(normalize_decimal(x)), prices)
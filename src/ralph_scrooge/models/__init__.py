@@ -1,6 +1,12 @@
 from ralph_scrooge.models.base import BaseUsage, BaseUsageType
 
-from ralph_scrooge.models.cost import CostDateStatus, DailyCost
+from ralph_scrooge.models.cost import (
+    CostDateStatus,
+    CostInputChange,
+    CostPluginProfile,
+    DailyCost,
+    MonthlyCost,
+)
 
 from ralph_scrooge.models.extra_cost import (
     DynamicExtraCost,
@@ -79,6 +85,8 @@ __all__ = [
     'BaseUsageType',
     'BusinessLine',
     'CostDateStatus',
+    'CostInputChange',
+    'CostPluginProfile',
     'DailyAssetInfo',
     'DailyDatabaseInfo',
     'DailyCost',
@@ -95,6 +103,7 @@ __all__ = [
     'ExtraCost',
     'ExtraCostType',
     'HistoricalService',  # dynamic model
+    'MonthlyCost',
     'OwnershipType',
     'Owner',
     'ProfitCenter',
@@ -124,3 +133,8 @@ __all__ = [
     'VirtualInfo',
     'Warehouse',
 ]
+
+# connect signals tracking changes of costs inputs
+from ralph_scrooge.models import _cost_changes  # noqa
+# invalidate cached daily usages (of services usages report) when changed
+from ralph_scrooge.report import usages_cache  # noqa
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+Tracking of changes of costs inputs.
+
+Every save or delete of costs input (price, team cost, extra cost etc.)
+marks its base usage as changed in days covered by it (see
+`CostInputChange.mark`). Notice that bulk operations (like `bulk_create`)
+don't send signals - changes have to be marked explicitly then.
+
+Daily usages are not tracked by signals (they are saved in large volumes by
+collect plugins) - code saving them marks their changes explicitly, once for
+all saved usages (see `CostInputChange.mark_usages`).
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from django.core.exceptions import ObjectDoesNotExist
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from ralph_scrooge.models.cost import CostInputChange
+from ralph_scrooge.models.extra_cost import (
+    DynamicExtraCost,
+    DynamicExtraCostDivision,
+    ExtraCost,
+    SupportCost,
+)
+from ralph_scrooge.models.service import ServiceUsageTypes
+from ralph_scrooge.models.team import TeamCost, TeamServiceEnvironmentPercent
+from ralph_scrooge.models.usage import UsagePrice
+
+
+def _get_division_changes(division):
+    """
+    Division of dynamic extra cost changes costs only in periods of dynamic
+    extra costs of its type.
+    """
+    return [
+        ([division.dynamic_extra_cost_type_id], start, end)
+        for start, end in set(DynamicExtraCost.objects.filter(
+            dynamic_extra_cost_type=division.dynamic_extra_cost_type_id,
+        ).values_list('start', 'end'))
+    ]
+
+
+# functions returning list of changes - changed base usages ids and dates
+# range (start, end) - for every tracked model
+TRACKED_MODELS = {
+    UsagePrice: lambda obj: [([obj.type_id], obj.start, obj.end)],
+    TeamCost: lambda obj: [([obj.team_id], obj.start, obj.end)],
+    TeamServiceEnvironmentPercent: lambda obj: [(
+        [obj.team_cost.team_id],
+        obj.team_cost.start,
+        obj.team_cost.end,
+    )],
+    ExtraCost: lambda obj: [([obj.extra_cost_type_id], obj.start, obj.end)],
+    SupportCost: lambda obj: [
+        ([obj.extra_cost_type_id], obj.start, obj.end),
+    ],
+    DynamicExtraCost: lambda obj: [(
+        [obj.dynamic_extra_cost_type_id],
+        obj.start,
+        obj.end,
+    )],
+    DynamicExtraCostDivision: _get_division_changes,
+    ServiceUsageTypes: lambda obj: [(
+        [obj.pricing_service_id],
+        obj.start,
+        obj.end,
+    )],
+}
+
+
+def mark_changed(sender, instance, **kwargs):
+    """
+    Marks costs input (instance) as changed.
+    """
+    try:
+        changes = TRACKED_MODELS[sender](instance)
+    except ObjectDoesNotExist:
+        # related object (ex. team cost) is already deleted (and marked as
+        # changed)
+        return
+    for types, start, end in changes:
+        CostInputChange.mark(types, start, end)
+
+
+def mark_previous_changed(sender, instance, **kwargs):
+    """
+    Marks previous version of updated costs input (instance) as changed (its
+    type or dates range could be changed).
+    """
+    if instance.pk:
+        for previous in sender.objects.filter(pk=instance.pk):
+            mark_changed(sender, previous)
+
+
+for model in TRACKED_MODELS:
+    post_save.connect(mark_changed, sender=model)
+    post_delete.connect(mark_changed, sender=model)
+    pre_save.connect(mark_previous_changed, sender=model)
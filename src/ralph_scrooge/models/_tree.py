@@ -7,6 +7,8 @@ from __future__ import unicode_literals
 
 from django.db import models as db
 
+from ralph_scrooge.utils.cost_tree import CostNode
+
 
 class PathFieldNotConfiguredError(Exception):
     pass
@@ -56,7 +58,7 @@ class MultiPathNode(db.Model):
 
     @classmethod
     def build_tree(cls, *args, **kwargs):
-        result = cls._build_tree(*args, **kwargs)
+        result = list(cls._build_tree(*args, **kwargs))
         cls.objects.bulk_create(result)
         return result
 
@@ -67,16 +69,17 @@ class MultiPathNode(db.Model):
     @classmethod
     def _build_tree(cls, tree, parent=None, **global_params):
         """
-        Build MultiPath tree Nodes according to tree list
+        Build MultiPath tree Nodes according to tree list. Nodes are generated
+        lazily (parent is always yielded before its children), so tree of any
+        size could be saved in batches.
 
-        :param list tree: list of dicts. dict values will be passed as kwargs
-            to new objects. Dict '_children' list value will be used to create
-            node children.
+        :param list tree: list of dicts (or CostNodes). dict values will be
+            passed as kwargs to new objects. Dict '_children' list value will
+            be used to create node children.
         """
         assert isinstance(tree, (list, tuple))
-        result = []
         for child in tree:
-            assert isinstance(child, dict)
+            assert isinstance(child, (dict, CostNode))
             params = dict(
                 [(k, v) for k, v in child.items() if (
                     not k.startswith('_') and
@@ -88,11 +91,10 @@ class MultiPathNode(db.Model):
                 if parent is None:
                     newobj = cls(**params)
                     newobj._create_path()
-                    result.append(newobj)
                 else:
                     newobj = parent.add_child(**params)
-                    result.append(newobj)
-                result.extend(cls._build_tree(
+                yield newobj
+                for node in cls._build_tree(
                     child.get('_children', []), newobj, **global_params
-                ))
-        return result
+                ):
+                    yield node
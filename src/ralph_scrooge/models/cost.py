@@ -5,16 +5,27 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
 
+import calendar
+from datetime import timedelta
+
+from django.db import IntegrityError
 from django.db import models as db
+from django.db.models import Sum
+from django.dispatch import Signal
 from django.utils.translation import ugettext_lazy as _
 
 from lck.django.common.models import WithConcurrentGetOrCreate
 
 from ralph_scrooge.models._tree import MultiPathNode
+from ralph_scrooge.models.usage import UsagePrice
 
 PRICE_DIGITS = 16
 PRICE_PLACES = 6
 
+# sent every time, when costs inputs of base usages are changed (see
+# `CostInputChange.mark`), even if costs were not calculated yet
+cost_input_changed = Signal(providing_args=['type_ids', 'start', 'end'])
+
 
 class DailyCostManager(db.Manager):
     def get_query_set(self):
@@ -122,3 +133,279 @@ class CostDateStatus(WithConcurrentGetOrCreate, db.Model):
         verbose_name = _("cost date status")
         verbose_name_plural = _("costs date status")
         app_label = 'ralph_scrooge'
+
+
+class CostInputChange(WithConcurrentGetOrCreate, db.Model):
+    """
+    Change of costs input (usages, prices, team costs, extra costs, division
+    of pricing service usage types etc.) of base usage in single day, for
+    which costs were already calculated. Costs of changed base usages (and
+    everything depending on them) are recalculated by incremental costs
+    collecting.
+    """
+    date = db.DateField(verbose_name=_('date'), db_index=True)
+    type = db.ForeignKey(
+        'BaseUsage',
+        related_name='cost_input_changes',
+        verbose_name=_('type'),
+    )
+    forecast = db.BooleanField(verbose_name=_('forecast'), default=False)
+
+    class Meta:
+        verbose_name = _("cost input change")
+        verbose_name_plural = _("cost input changes")
+        unique_together = ('date', 'type', 'forecast')
+        app_label = 'ralph_scrooge'
+
+    def __unicode__(self):
+        return '{} ({}{})'.format(
+            self.type,
+            self.date,
+            ', forecast' if self.forecast else '',
+        )
+
+    @classmethod
+    def mark(cls, types, start=None, end=None):
+        """
+        Marks costs inputs of base usages (types) as changed for every day
+        between start and end (None means no limit), for which (real or
+        forecast) costs were already calculated, but not accepted (accepted
+        costs are never recalculated).
+
+        :param types: list of base usages or its ids
+        """
+        type_ids = set([getattr(t, 'id', t) for t in types])
+        if not type_ids:
+            return
+        cost_input_changed.send(
+            sender=cls,
+            type_ids=type_ids,
+            start=start,
+            end=end,
+        )
+        statuses = CostDateStatus.objects.all()
+        if start:
+            statuses = statuses.filter(date__gte=start)
+        if end:
+            statuses = statuses.filter(date__lte=end)
+        calculated = []
+        for date, real, forecast, accepted, forecast_accepted in (
+            statuses.values_list(
+                'date',
+                'calculated',
+                'forecast_calculated',
+                'accepted',
+                'forecast_accepted',
+            )
+        ):
+            if real and not accepted:
+                calculated.append((date, False))
+            if forecast and not forecast_accepted:
+                calculated.append((date, True))
+        if not calculated:
+            return
+        existing = set(cls.objects.filter(
+            date__in=set([date for date, forecast in calculated]),
+            type__in=type_ids,
+        ).values_list('date', 'type', 'forecast'))
+        missing = [
+            (date, type_id, forecast)
+            for date, forecast in calculated
+            for type_id in type_ids
+            if (date, type_id, forecast) not in existing
+        ]
+        try:
+            cls.objects.bulk_create([
+                cls(date=date, type_id=type_id, forecast=forecast)
+                for date, type_id, forecast in missing
+            ])
+        except IntegrityError:
+            # some of changes were marked in the meantime (ex. by another
+            # process) - mark them one by one
+            for date, type_id, forecast in missing:
+                cls.concurrent_get_or_create(
+                    date=date,
+                    type_id=type_id,
+                    forecast=forecast,
+                )
+
+    @classmethod
+    def mark_usages(cls, usage_types, start=None, end=None):
+        """
+        Marks usages of usage types between start and end as changed.
+
+        Daily usages are saved in large volumes (ex. by collect plugins), so
+        they are not tracked by signals - their changes have to be marked
+        explicitly, once for all saved (or deleted) usages (ex. after collect
+        plugin run for a day).
+
+        Price of usage type charged by cost depends on total usages in the
+        whole period of price, so every day of (overlapping) periods of such
+        usage types is marked as changed too.
+
+        :param usage_types: list of usage types or its ids
+        """
+        type_ids = set([getattr(t, 'id', t) for t in usage_types])
+        cls.mark(type_ids, start, end)
+        prices = UsagePrice.objects.filter(
+            type__in=type_ids,
+            type__by_cost=True,
+        )
+        if start:
+            prices = prices.filter(end__gte=start)
+        if end:
+            prices = prices.filter(start__lte=end)
+        for type_id, price_start, price_end in set(prices.values_list(
+            'type',
+            'start',
+            'end',
+        )):
+            cls.mark([type_id], price_start, price_end)
+
+
+class CostPluginProfile(db.Model):
+    """
+    Profile of single cost plugin call (costs or pricing service total cost
+    calculation) in costs collecting for a day.
+    """
+    date = db.DateField(verbose_name=_('date'), db_index=True)
+    forecast = db.BooleanField(verbose_name=_('forecast'), default=False)
+    plugin_name = db.CharField(verbose_name=_('plugin name'), max_length=100)
+    name = db.CharField(verbose_name=_('name'), max_length=255)
+    total_cost = db.BooleanField(
+        verbose_name=_('total cost'),
+        default=False,
+        help_text=_('Profile of (pricing service) total cost calculation'),
+    )
+    wall_time = db.FloatField(verbose_name=_('wall time'), default=0)
+    db_time = db.FloatField(verbose_name=_('database time'), default=0)
+    queries_count = db.PositiveIntegerField(
+        verbose_name=_('queries count'),
+        default=0,
+    )
+    rows_count = db.PositiveIntegerField(
+        verbose_name=_('rows count'),
+        default=0,
+    )
+    nodes_count = db.PositiveIntegerField(
+        verbose_name=_('cost nodes count'),
+        default=0,
+    )
+
+    class Meta:
+        verbose_name = _("cost plugin profile")
+        verbose_name_plural = _("cost plugins profiles")
+        app_label = 'ralph_scrooge'
+
+    def __unicode__(self):
+        return '{} ({}{}): {:.3f}s'.format(
+            self.name,
+            self.date,
+            ', forecast' if self.forecast else '',
+            self.wall_time,
+        )
+
+
+class MonthlyCost(db.Model):
+    """
+    Rollup of daily costs (only top-level, with depth 0) per service
+    environment, type and month. Rollup of month is deleted together with
+    saving daily costs of any day in this month (reports are using daily
+    costs then) and it's refreshed by collector (once per month, when costs
+    of period are calculated).
+    """
+    month = db.DateField(
+        verbose_name=_('month'),
+        db_index=True,
+        help_text=_('First day of month'),
+    )
+    service_environment = db.ForeignKey(
+        'ServiceEnvironment',
+        related_name='monthly_costs',
+        verbose_name=_('service environment'),
+    )
+    type = db.ForeignKey(
+        'BaseUsage',
+        related_name='monthly_costs',
+        verbose_name=_('type'),
+    )
+    forecast = db.BooleanField(verbose_name=_('forecast'), default=False)
+    value = db.FloatField(verbose_name=_("value"), default=0)
+    cost = db.DecimalField(
+        max_digits=PRICE_DIGITS,
+        decimal_places=PRICE_PLACES,
+        default=0,
+        verbose_name=_("cost"),
+    )
+
+    class Meta:
+        verbose_name = _("monthly cost")
+        verbose_name_plural = _("monthly costs")
+        unique_together = ('month', 'service_environment', 'type', 'forecast')
+        app_label = 'ralph_scrooge'
+
+    def __unicode__(self):
+        return '{} - {} ({:%Y-%m})'.format(
+            self.service_environment,
+            self.type,
+            self.month,
+        )
+
+    @classmethod
+    def get_months(cls, start, end):
+        """
+        Returns list of months (first and last day of every month) between
+        start and end.
+        """
+        result = []
+        month = start.replace(day=1)
+        while month <= end:
+            days = calendar.monthrange(month.year, month.month)[1]
+            result.append((month, month.replace(day=days)))
+            month = month.replace(day=days) + timedelta(days=1)
+        return result
+
+    @classmethod
+    def split_period(cls, start, end):
+        """
+        Splits period between start and end into whole months and remaining
+        days (at the beginning and at the end of period).
+
+        :returns tuple: list of whole months (first and last day) and list
+            of periods (start, end) of remaining days
+        """
+        months = []
+        periods = []
+        for month_start, month_end in cls.get_months(start, end):
+            if month_start >= start and month_end <= end:
+                months.append((month_start, month_end))
+            else:
+                periods.append((max(month_start, start), min(month_end, end)))
+        return months, periods
+
+    @classmethod
+    def refresh(cls, start, end, forecast):
+        """
+        Rebuilds rollup of every month between start and end from daily
+        costs.
+        """
+        for month_start, month_end in cls.get_months(start, end):
+            cls.objects.filter(month=month_start, forecast=forecast).delete()
+            daily_costs = DailyCost.objects.filter(
+                date__gte=month_start,
+                date__lte=month_end,
+                forecast=forecast,
+            ).values('service_environment', 'type').annotate(
+                total_cost=Sum('cost'),
+                total_value=Sum('value'),
+            )
+            cls.objects.bulk_create([
+                cls(
+                    month=month_start,
+                    service_environment_id=dc['service_environment'],
+                    type_id=dc['type'],
+                    forecast=forecast,
+                    cost=dc['total_cost'] or 0,
+                    value=dc['total_value'] or 0,
+                ) for dc in daily_costs
+            ])
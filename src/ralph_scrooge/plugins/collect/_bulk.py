@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+Helpers for batched synchronization of daily pricing objects and usages.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from ralph_scrooge.models import DailyPricingObject, DailyUsage
+
+
+def bulk_create_daily_pricing_objects(model, objects, date):
+    """
+    Creates daily pricing objects (instances of model - subclass of
+    DailyPricingObject) in bulk. Django doesn't support bulk create of
+    inherited models, so daily pricing objects (parents) are bulk created
+    first, then their ids are fetched (by unique pricing object and date) and
+    objects are inserted (into child table only) in single query.
+    """
+    if not objects:
+        return
+    DailyPricingObject.objects.bulk_create([
+        DailyPricingObject(
+            date=date,
+            pricing_object_id=obj.pricing_object_id,
+            service_environment_id=obj.service_environment_id,
+        ) for obj in objects
+    ])
+    ids = dict(DailyPricingObject.objects.filter(
+        date=date,
+        pricing_object__in=[obj.pricing_object_id for obj in objects],
+    ).values_list('pricing_object', 'id'))
+    for obj in objects:
+        obj.id = obj.dailypricingobject_ptr_id = ids[obj.pricing_object_id]
+    model._base_manager._insert(
+        objects,
+        fields=model._meta.local_fields,
+        using=model.objects.db,
+    )
+
+
+def update_daily_usages(date, usage_types, usages):
+    """
+    Creates (in bulk) or updates (only if changed) daily usages.
+
+    Notice that daily usages are saved without sending signals - their
+    changes have to be marked explicitly (see `CostInputChange.mark_usages`).
+
+    :param list usage_types: usage types of saved usages
+    :param list usages: list of tuples (daily pricing object id, usage type,
+        dict with fields of usage, ex. value)
+    """
+    usages = list(usages)
+    existing = dict(
+        ((usage.daily_pricing_object_id, usage.type_id), usage)
+        for usage in DailyUsage.objects.filter(
+            date=date,
+            type__in=usage_types,
+            daily_pricing_object__in=set(
+                dpo_id for dpo_id, usage_type, fields in usages
+            ),
+        )
+    )
+    to_create = []
+    for daily_pricing_object_id, usage_type, fields in usages:
+        usage = existing.get((daily_pricing_object_id, usage_type.id))
+        if usage is None:
+            to_create.append(DailyUsage(
+                date=date,
+                type=usage_type,
+                daily_pricing_object_id=daily_pricing_object_id,
+                **fields
+            ))
+        elif any(
+            getattr(usage, field) != value
+            for field, value in fields.iteritems()
+        ):
+            DailyUsage.objects.filter(id=usage.id).update(**fields)
+    DailyUsage.objects.bulk_create(to_create)
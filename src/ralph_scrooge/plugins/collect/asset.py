@@ -6,8 +6,10 @@ from __future__ import print_function
 from __future__ import unicode_literals
 
 import logging
+from collections import namedtuple
 from decimal import Decimal as D
 
+from django.conf import settings
 from django.db import IntegrityError
 from django.db.transaction import commit_on_success
 
@@ -15,6 +17,7 @@ from ralph.util import plugin
 from ralph_assets.api_scrooge import get_assets
 from ralph_scrooge.models import (
     AssetInfo,
+    CostInputChange,
     DailyAssetInfo,
     DailyUsage,
     PricingObjectModel,
@@ -24,10 +27,23 @@ from ralph_scrooge.models import (
     UsageType,
     Warehouse,
 )
+from ralph_scrooge.plugins.collect._bulk import (
+    bulk_create_daily_pricing_objects,
+    update_daily_usages,
+)
+from ralph_scrooge.utils.common import chunks
 
 
 logger = logging.getLogger(__name__)
 
+# maps used to resolve ids of related objects of assets in batched sync
+Lookups = namedtuple(
+    'Lookups',
+    ['service_environments', 'warehouses', 'models'],
+)
+
+ASSET_INFO_UNIQUE_FIELDS = ('sn', 'barcode', 'device_id')
+
 
 class ServiceEnvironmentDoesNotExistError(Exception):
     """
@@ -232,6 +248,265 @@ def update_assets(data, date, usages):
     return new_created
 
 
+def get_lookups():
+    """
+    Returns maps (prefetched once for all assets) of ids of service
+    environments (by service and environment ci_id), warehouses (by id from
+    assets) and assets models (by model id).
+
+    :rtype: Lookups
+    """
+    return Lookups(
+        service_environments=dict(
+            ((service_ci_id, environment_ci_id), se_id)
+            for service_ci_id, environment_ci_id, se_id in (
+                ServiceEnvironment.objects.values_list(
+                    'service__ci_id',
+                    'environment__ci_id',
+                    'id',
+                )
+            )
+        ),
+        warehouses=dict(
+            Warehouse.objects.values_list('id_from_assets', 'id')
+        ),
+        models=dict(PricingObjectModel.objects.filter(
+            type=PRICING_OBJECT_TYPES.ASSET,
+        ).values_list('model_id', 'id')),
+    )
+
+
+def _resolve_assets(assets, lookups):
+    """
+    Returns list of tuples (asset data, fields of AssetInfo) for every asset
+    which service environment, warehouse and model exist.
+    """
+    result = []
+    for data in assets:
+        se_id = lookups.service_environments.get(
+            (data['service_id'], data['environment_id'])
+        )
+        if se_id is None:
+            logger.error(
+                'Asset {}: Service environment {} - {} does not exist'.format(
+                    data['asset_id'],
+                    data['service_id'],
+                    data['environment_id'],
+                )
+            )
+            continue
+        warehouse_id = lookups.warehouses.get(data['warehouse_id'])
+        if warehouse_id is None:
+            logger.error('Warehouse {0} does not exist'.format(
+                data['warehouse_id']
+            ))
+            continue
+        model_id = lookups.models.get(data['model_id'])
+        if model_id is None:
+            logger.error('Asset {}: Model {} does not exist'.format(
+                data['asset_id'],
+                data['model_id'],
+            ))
+            continue
+        result.append((data, dict(
+            service_environment_id=se_id,
+            warehouse_id=warehouse_id,
+            model_id=model_id,
+            name=data['asset_name'],
+            sn=data['sn'],
+            barcode=data['barcode'],
+            device_id=data['device_id'],
+        )))
+    return result
+
+
+def _clear_duplicates(assets):
+    """
+    Clears (sets to None) unique fields (sn, barcode, device_id) taken by
+    other assets - in database (for assets, which values are taken over by
+    assets in batch) and in batch (the last asset in batch with given value
+    keeps it).
+
+    :param list assets: list of tuples (asset data, fields of AssetInfo)
+    """
+    for field in ASSET_INFO_UNIQUE_FIELDS:
+        owners = {}
+        for data, fields in assets:
+            value = fields[field]
+            if value is None:
+                continue
+            if value in owners:
+                previous_data, previous_fields = owners[value]
+                logger.error('Duplicated {} ({}) on assets {} and {}'.format(
+                    field,
+                    value,
+                    data['asset_id'],
+                    previous_data['asset_id'],
+                ))
+                previous_fields[field] = None
+            owners[value] = (data, fields)
+        if not owners:
+            continue
+        to_clear = []
+        for asset_info_id, asset_id, value in AssetInfo.objects.filter(
+            **{'{}__in'.format(field): owners.keys()}
+        ).values_list('id', 'asset_id', field):
+            owner_asset_id = owners[value][0]['asset_id']
+            if asset_id != owner_asset_id:
+                logger.error('Duplicated {} ({}) on assets {} and {}'.format(
+                    field,
+                    value,
+                    owner_asset_id,
+                    asset_id,
+                ))
+                to_clear.append(asset_info_id)
+        if to_clear:
+            AssetInfo.objects.filter(id__in=to_clear).update(**{field: None})
+
+
+def _update_assets_info(assets):
+    """
+    Creates new assets info and updates existing (only if any of its fields
+    was changed).
+
+    :param list assets: list of tuples (asset data, fields of AssetInfo)
+    :returns tuple: list of tuples (AssetInfo, asset data), count of created
+        and updated assets
+    """
+    existing = dict((asset_info.asset_id, asset_info) for asset_info in (
+        AssetInfo.objects.filter(
+            asset_id__in=[data['asset_id'] for data, fields in assets],
+        )
+    ))
+    _clear_duplicates(assets)
+    result = []
+    new = updated = 0
+    for data, fields in assets:
+        asset_info = existing.get(data['asset_id'])
+        if asset_info is None:
+            asset_info = AssetInfo(
+                asset_id=data['asset_id'],
+                type_id=PRICING_OBJECT_TYPES.ASSET,
+                **fields
+            )
+            asset_info.save()
+            new += 1
+        else:
+            if any(
+                getattr(asset_info, field) != value
+                for field, value in fields.iteritems()
+            ):
+                for field, value in fields.iteritems():
+                    setattr(asset_info, field, value)
+                asset_info.save()
+            updated += 1
+        result.append((asset_info, data))
+    return result, new, updated
+
+
+def _update_daily_assets_info(assets_info, date):
+    """
+    Creates (in bulk) or updates (if changed) daily assets info.
+
+    :param list assets_info: list of tuples (AssetInfo, asset data)
+    :returns list: list of tuples (DailyAssetInfo, AssetInfo, asset data)
+    """
+    existing = dict((dai.asset_info_id, dai) for dai in (
+        DailyAssetInfo.objects.filter(
+            date=date,
+            asset_info__in=[ai.id for ai, data in assets_info],
+        )
+    ))
+    to_create = []
+    result = []
+    for asset_info, data in assets_info:
+        fields = dict(
+            service_environment_id=asset_info.service_environment_id,
+            depreciation_rate=data['depreciation_rate'],
+            is_depreciated=data['is_depreciated'],
+            price=data['price'] or 0,
+        )
+        daily_asset_info = existing.get(asset_info.id)
+        if daily_asset_info is None:
+            daily_asset_info = DailyAssetInfo(
+                pricing_object_id=asset_info.id,
+                asset_info_id=asset_info.id,
+                date=date,
+                **fields
+            )
+            daily_asset_info.calc_costs()
+            to_create.append(daily_asset_info)
+        elif any(
+            getattr(daily_asset_info, field) != value
+            for field, value in fields.iteritems()
+        ):
+            for field, value in fields.iteritems():
+                setattr(daily_asset_info, field, value)
+            daily_asset_info.save()
+        result.append((daily_asset_info, asset_info, data))
+    bulk_create_daily_pricing_objects(DailyAssetInfo, to_create, date)
+    return result
+
+
+def _get_usages_values(daily_asset_info, data):
+    """
+    Returns values of usages (by usage key) of single asset.
+    """
+    return {
+        'depreciation': daily_asset_info.daily_cost,
+        'assets_count': 1,
+        'cores_count': data['cores_count'],
+        'power_consumption': data['power_consumption'],
+        'collocation': data['collocation'],
+    }
+
+
+def _get_daily_usages(daily_assets_info, usages):
+    """
+    Yields daily usages (see `update_daily_usages`) of assets.
+
+    :param list daily_assets_info: list of tuples (DailyAssetInfo,
+        AssetInfo, asset data)
+    """
+    for daily_asset_info, asset_info, data in daily_assets_info:
+        values = _get_usages_values(daily_asset_info, data)
+        for key, value in values.iteritems():
+            yield daily_asset_info.id, usages[key], dict(
+                service_environment_id=daily_asset_info.service_environment_id,
+                warehouse_id=asset_info.warehouse_id,
+                value=value,
+            )
+
+
+@commit_on_success
+def update_assets_batch(assets, date, usages, lookups):
+    """
+    Updates batch of assets - AssetInfo, DailyAssetInfo and DailyUsage
+    objects are fetched for all assets in batch at once and only created or
+    changed objects are saved (new daily assets info and usages in bulk).
+
+    Notice that daily usages are saved without sending signals - their
+    changes have to be marked explicitly (see `CostInputChange.mark_usages`).
+
+    :param list assets: list of assets data from assets API
+    :param object date: datetime
+    :param dict usages: Dict with usage types from Django orm UsageType
+    :param Lookups lookups: maps of ids of related objects (see
+        `get_lookups`)
+    :returns tuple: count of created and updated assets
+    """
+    assets_info, new, updated = _update_assets_info(
+        _resolve_assets(assets, lookups),
+    )
+    daily_assets_info = _update_daily_assets_info(assets_info, date)
+    update_daily_usages(
+        date,
+        usages.values(),
+        _get_daily_usages(daily_assets_info, usages),
+    )
+    return new, updated
+
+
 def get_usage(symbol, name, by_warehouse, by_cost, average, type):
     """
     Creates power consumption usage type if not created.
@@ -327,6 +602,26 @@ def asset(**kwargs):
     }
 
     new = update = total = 0
+    batch_size = settings.ASSETS_SYNC_BATCH_SIZE
+    if batch_size:
+        lookups = get_lookups()
+        for assets in chunks(get_assets(date), batch_size):
+            total += len(assets)
+            batch_new, batch_updated = update_assets_batch(
+                assets,
+                date,
+                usages,
+                lookups,
+            )
+            new += batch_new
+            update += batch_updated
+        CostInputChange.mark_usages(usages.values(), date, date)
+        return True, '{0} new, {1} updated, {2} total'.format(
+            new,
+            update,
+            total,
+        )
+
     for data in get_assets(date):
         total += 1
         try:
@@ -349,4 +644,5 @@ def asset(**kwargs):
             ))
             continue
 
+    CostInputChange.mark_usages(usages.values(), date, date)
     return True, '{0} new, {1} updated, {2} total'.format(new, update, total)
@@ -11,6 +11,7 @@ from ralph.util import plugin
 from ralph.util.api_scrooge import get_blade_servers
 from ralph_scrooge.models import (
     AssetInfo,
+    CostInputChange,
     DailyAssetInfo,
     DailyUsage,
     UsageType,
@@ -99,6 +100,7 @@ def blade_server(today, **kwargs):
                 )
             )
         total += 1
+    CostInputChange.mark_usages([usage_type], today, today)
     return (
         True,
         '{} new Blade Servers usages, {} updated, {} total'.format(
@@ -6,14 +6,15 @@ from __future__ import print_function
 from __future__ import unicode_literals
 
 import logging
-import ipaddr
-from collections import defaultdict
+from collections import defaultdict, deque
+from multiprocessing.pool import ThreadPool
 
 import paramiko
 from django.conf import settings
 
 from ralph.util import plugin
 from ralph_scrooge.models import (
+    CostInputChange,
     DailyPricingObject,
     DailyUsage,
     PricingObject,
@@ -21,6 +22,7 @@ from ralph_scrooge.models import (
     ServiceEnvironment,
     UsageType,
 )
+from ralph_scrooge.utils.networks import get_networks_index
 
 
 logger = logging.getLogger(__name__)
@@ -48,6 +50,17 @@ class ServiceDoesNotExistError(Exception):
     pass
 
 
+# directions of traffic (address and nfdump aggregation fields)
+INPUTS_OUTPUTS = [
+    ('src', 'srcip,srcport'),
+    ('dst', 'dstip,dstport'),
+]
+
+# number of rows of nfdump output before and after flows (header and summary)
+NFDUMP_HEADER_ROWS = 1
+NFDUMP_SUMMARY_ROWS = 4
+
+
 def get_ssh_client(address, login, password):
     """
     Create ssh client and connect them to give address by using given
@@ -98,6 +111,21 @@ def get_names_of_data_files(ssh_client, channel, date):
     return sorted([row.strip('\n') for row in stdout.readlines()])
 
 
+def _skip_header_and_summary(rows, header, summary):
+    """
+    Yields rows (consumed lazily) without first header and last summary rows.
+    Only summary rows are buffered, so rows are never held in memory.
+    """
+    rows = iter(rows)
+    for _ in range(header):
+        next(rows, None)
+    buffered = deque()
+    for row in rows:
+        buffered.append(row)
+        if len(buffered) > summary:
+            yield buffered.popleft()
+
+
 def execute_nfdump(
     ssh_client,
     channel,
@@ -115,8 +143,8 @@ def execute_nfdump(
     :param list file_names: List with file names from remote server. This
     files contains trafic statistics.
     :param string input_output: Define direct of trafic (srcip or dstip)
-    :returns list: list of rows from stdout from remote server
-    :rtype list:
+    :returns generator: rows from stdout from remote server (read lazily)
+    :rtype generator:
     """
     def get_networks(input_output):
         direct = input_output.replace('ip', '')
@@ -143,7 +171,11 @@ def execute_nfdump(
     )
     logger.debug(nfdump_str)
     stdin, stdout, stderr = ssh_client.exec_command(nfdump_str)
-    return stdout.readlines()[1:-4]
+    return _skip_header_and_summary(
+        stdout,
+        NFDUMP_HEADER_ROWS,
+        NFDUMP_SUMMARY_ROWS,
+    )
 
 
 def extract_ip_and_bytes(row, input_output, class_addresses):
@@ -156,6 +188,8 @@ def extract_ip_and_bytes(row, input_output, class_addresses):
     :param string row: Single row gain from remote server by execute nfdump
     commands
     :param string input_output: Define which address will be take
+    :param class_addresses: networks (list or `NetworksIndex`, which should
+    be passed when many rows are extracted)
     :returns tuple: Pair ip_address with usage in bytes or None
     :rtype tuple:
     """
@@ -184,9 +218,9 @@ def extract_ip_and_bytes(row, input_output, class_addresses):
         ip_address = split_row[1]
         port = split_row[3]
 
-    for class_address in class_addresses:
-        if ipaddr.IPv4Address(ip_address) in ipaddr.IPv4Network(class_address):
-            return (ip_address, port, unification(split_row[-1]))
+    networks = get_networks_index(class_addresses)
+    if networks and ip_address in networks:
+        return (ip_address, port, unification(split_row[-1]))
 
 
 def get_network_usage(
@@ -215,6 +249,7 @@ def get_network_usage(
     :returns dict: list of ips with usages from given date
     :rtype dict:
     """
+    class_addresses = get_networks_index(class_addresses)
     ip_and_bytes = defaultdict(int)
     for row in execute_nfdump(
         ssh_client,
@@ -230,6 +265,42 @@ def get_network_usage(
     return ip_and_bytes
 
 
+def _get_job_network_usage(job):
+    """
+    Collect usages for single (server, channel, input/output) job. Used by
+    get_network_usages method (could be run in separate thread).
+    """
+    address, ssh_client, channel, date, input_output, class_addresses = job
+    logger.debug("Server:{0} Channel:{1} I/O:{2}".format(
+        address, channel, input_output[0]))
+    return get_network_usage(
+        ssh_client,
+        channel,
+        date,
+        get_names_of_data_files(ssh_client, channel, date),
+        input_output,
+        class_addresses,
+    )
+
+
+def _run_jobs(jobs, workers):
+    """
+    Yields usages of jobs (in order of completion if they are run in more
+    than one thread).
+    """
+    workers = min(workers, len(jobs))
+    if workers <= 1:
+        for job in jobs:
+            yield _get_job_network_usage(job)
+        return
+    pool = ThreadPool(workers)
+    try:
+        for usages in pool.imap_unordered(_get_job_network_usage, jobs):
+            yield usages
+    finally:
+        pool.terminate()
+
+
 def get_network_usages(date, class_addresses):
     """
     Based on settings, collect data from remote server. Returned data struct
@@ -240,30 +311,35 @@ def get_network_usages(date, class_addresses):
         ...
     }
 
+    Usages of every server, channel and input/output are collected
+    concurrently (in NFSEN_WORKERS threads), using single ssh connection per
+    server.
+
     :param datetime date: Date for which usages will collects
     :returns dict: list of ips with usages from given date
     :rtype dict:
     """
     logger.debug('Getting network usages per IP')
+    class_addresses = get_networks_index(class_addresses)
     network_usages = defaultdict(int)
-    for address, credentials in settings.SSH_NFSEN_CREDENTIALS.iteritems():
-        ssh_client = get_ssh_client(address, **credentials)
-        for channel in settings.NFSEN_CHANNELS:
-            for input_output in [
-                ('src', 'srcip,srcport'),
-                ('dst', 'dstip,dstport')
-            ]:
-                logger.debug("Server:{0} Channel:{1} I/O:{2}".format(
-                    address, channel, input_output[0]))
-                for ip, value in get_network_usage(
-                    ssh_client,
-                    channel,
-                    date,
-                    get_names_of_data_files(ssh_client, channel, date),
-                    input_output,
-                    class_addresses,
-                ).iteritems():
-                    network_usages[ip] += value
+    ssh_clients = {}
+    try:
+        for address, credentials in (
+            settings.SSH_NFSEN_CREDENTIALS.iteritems()
+        ):
+            ssh_clients[address] = get_ssh_client(address, **credentials)
+        jobs = [
+            (address, ssh_client, channel, date, input_output, class_addresses)
+            for address, ssh_client in ssh_clients.iteritems()
+            for channel in settings.NFSEN_CHANNELS
+            for input_output in INPUTS_OUTPUTS
+        ]
+        for usages in _run_jobs(jobs, settings.NFSEN_WORKERS):
+            for ip, value in usages.iteritems():
+                network_usages[ip] += value
+    finally:
+        for ssh_client in ssh_clients.values():
+            ssh_client.close()
     return network_usages
 
 
@@ -372,13 +448,15 @@ def netflow(**kwargs):
         return False, 'Unknown service environment for netflow not configured'
 
     date = kwargs['today']
+    usage_type = get_usage_type()
     delete_previous_usages(date)
     new, updated, total = update(
         get_network_usages(date, settings.NFSEN_CLASS_ADDRESS),
-        get_usage_type(),
+        usage_type,
         default_service,
         date,
     )
+    CostInputChange.mark_usages([usage_type], date, date)
 
     return True, '{0} new, {1} updated, {2} total'.format(
         new,
@@ -14,6 +14,7 @@ from sqlalchemy import create_engine
 
 from ralph.util import plugin
 from ralph_scrooge.models import (
+    CostInputChange,
     DailyTenantInfo,
     DailyUsage,
     TenantInfo,
@@ -160,4 +161,11 @@ def openstack_ceilometer(today, **kwargs):
         new += site_new
         total += site_total
 
+    CostInputChange.mark_usages(
+        UsageType.objects.filter(
+            symbol__startswith=METRIC_TMPL.format(''),
+        ),
+        today,
+        today,
+    )
     return True, 'Ceilometer usages: {} new, {} total'.format(new, total)
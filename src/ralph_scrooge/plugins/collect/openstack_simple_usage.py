@@ -11,7 +11,13 @@ from django.conf import settings
 from novaclient.v1_1 import client as nova_client
 
 from ralph.util import plugin
-from ralph_scrooge.models import DailyUsage, TenantInfo, UsageType, Warehouse
+from ralph_scrooge.models import (
+    CostInputChange,
+    DailyUsage,
+    TenantInfo,
+    UsageType,
+    Warehouse,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -123,6 +129,7 @@ def openstack_simple_usage(today, **kwargs):
             ))
             total += len(usages)
             success += region_success
+    CostInputChange.mark_usages(usage_types.values(), today, today)
     return True, 'OpenStack simple usages: {} success, {} total'.format(
         success,
         total
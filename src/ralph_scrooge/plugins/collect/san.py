@@ -11,6 +11,7 @@ from ralph.util import plugin
 from ralph.util.api_scrooge import get_fc_cards
 from ralph_scrooge.models import (
     AssetInfo,
+    CostInputChange,
     DailyAssetInfo,
     DailyUsage,
     UsageType,
@@ -99,6 +100,7 @@ def san(today, **kwargs):
                 )
             )
         total += 1
+    CostInputChange.mark_usages([usage_type], today, today)
     return (
         True,
         '{} new SAN usages, {} updated, {} total'.format(
@@ -12,6 +12,7 @@ from django.conf import settings
 from ralph.util.api_scrooge import get_shares
 from ralph.util import plugin
 from ralph_scrooge.models import (
+    CostInputChange,
     DailyUsage,
     AssetInfo,
     UsageType,
@@ -120,6 +121,7 @@ def share(**kwargs):
                             data['mount_device_id'],
                         ),
                     )
+        CostInputChange.mark_usages([usage_type], date, date)
     return True, '{0} new, {1} updated, {2} total'.format(
         None,
         updated,
@@ -5,25 +5,41 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
 
+import itertools
 import logging
+from collections import namedtuple
 
 from django.conf import settings
+from django.db.transaction import commit_on_success
 
 from ralph.util import plugin, api_scrooge
 from ralph_scrooge.models import (
     AssetInfo,
+    CostInputChange,
     DailyAssetInfo,
     DailyUsage,
+    DailyVirtualInfo,
     PRICING_OBJECT_TYPES,
     PricingObjectModel,
     ServiceEnvironment,
     UsageType,
     VirtualInfo,
 )
+from ralph_scrooge.plugins.collect._bulk import (
+    bulk_create_daily_pricing_objects,
+    update_daily_usages,
+)
+from ralph_scrooge.utils.common import chunks
 
 
 logger = logging.getLogger(__name__)
 
+# maps used to resolve related objects of virtual devices in batched sync
+Lookups = namedtuple(
+    'Lookups',
+    ['service_environments', 'hypervisors', 'models'],
+)
+
 
 class ServiceUidCannotBeNoneError(Exception):
     """
@@ -173,6 +189,262 @@ def update(group_name, data, usages, date):
         )
 
 
+def get_lookups(date):
+    """
+    Returns maps (prefetched once for all virtual devices) of ids of service
+    environments (by service and environment ci_id), ids of hypervisors
+    (daily assets info by device id) and virtual models (by model id).
+
+    :rtype: Lookups
+    """
+    return Lookups(
+        service_environments=dict(
+            ((service_ci_id, environment_ci_id), se_id)
+            for service_ci_id, environment_ci_id, se_id in (
+                ServiceEnvironment.objects.values_list(
+                    'service__ci_id',
+                    'environment__ci_id',
+                    'id',
+                )
+            )
+        ),
+        hypervisors=dict(DailyAssetInfo.objects.filter(
+            date=date,
+            asset_info__device_id__isnull=False,
+        ).values_list('asset_info__device_id', 'id')),
+        models=dict((model.model_id, model) for model in (
+            PricingObjectModel.objects.filter(
+                type_id=PRICING_OBJECT_TYPES.VIRTUAL,
+            )
+        )),
+    )
+
+
+def _resolve_virtuals(virtuals, lookups):
+    """
+    Returns list of tuples (virtual device data, service environment id,
+    hypervisor id) for every virtual device (the last one if device is
+    duplicated) which service environment exists.
+    """
+    result = {}
+    for data in virtuals:
+        if data.get('device_id') is None:
+            logger.warning('Device id cannot be None')
+            continue
+        if data.get('service_id') is None:
+            logger.warning('For device {0} service ci uid is none'.format(
+                data['device_id'],
+            ))
+            continue
+        if data.get('environment_id') is None:
+            logger.warning('For device {0} environment is none'.format(
+                data['device_id'],
+            ))
+            continue
+        se_id = lookups.service_environments.get(
+            (data['service_id'], data['environment_id'])
+        )
+        if se_id is None:
+            logger.error('Service {0} does not exist'.format(
+                data['service_id'],
+            ))
+            continue
+        hypervisor_id = None
+        if data.get('hypervisor_id') is not None:
+            hypervisor_id = lookups.hypervisors.get(data['hypervisor_id'])
+            if hypervisor_id is None:
+                logger.error('Hypervisor with device id {} not found'.format(
+                    data['hypervisor_id'],
+                ))
+        else:
+            logger.warning('For device {0} hypervisor is none'.format(
+                data['device_id'],
+            ))
+        result[data['device_id']] = (data, se_id, hypervisor_id)
+    return result.values()
+
+
+def _get_model_id(group_name, data, models):
+    """
+    Returns id of virtual model (created or updated if needed).
+
+    :param dict models: virtual models by model id (updated when model is
+        created)
+    """
+    model = models.get(data['model_id'])
+    if model is None:
+        model = models[data['model_id']] = PricingObjectModel(
+            model_id=data['model_id'],
+            type_id=PRICING_OBJECT_TYPES.VIRTUAL,
+        )
+    if (
+        model.id is None or
+        model.name != data['model_name'] or
+        model.manufacturer != group_name
+    ):
+        model.name = data['model_name']
+        model.manufacturer = group_name
+        model.save()
+    return model.id
+
+
+def _update_virtuals_info(group_name, virtuals, models):
+    """
+    Creates new virtuals info and updates existing (only if any of its fields
+    was changed).
+
+    :param list virtuals: list of tuples (virtual device data, service
+        environment id, hypervisor id)
+    :returns list: list of tuples (VirtualInfo, virtual device data,
+        hypervisor id)
+    """
+    existing = dict((vi.device_id, vi) for vi in VirtualInfo.objects.filter(
+        device_id__in=[data['device_id'] for data, se, h in virtuals],
+    ))
+    result = []
+    for data, se_id, hypervisor_id in virtuals:
+        fields = dict(
+            service_environment_id=se_id,
+            name=data['name'],
+            model_id=_get_model_id(group_name, data, models),
+        )
+        virtual_info = existing.get(data['device_id'])
+        if virtual_info is None:
+            virtual_info = VirtualInfo(
+                device_id=data['device_id'],
+                type_id=PRICING_OBJECT_TYPES.VIRTUAL,
+                **fields
+            )
+            virtual_info.save()
+        elif any(
+            getattr(virtual_info, field) != value
+            for field, value in fields.iteritems()
+        ):
+            for field, value in fields.iteritems():
+                setattr(virtual_info, field, value)
+            virtual_info.save()
+        result.append((virtual_info, data, hypervisor_id))
+    return result
+
+
+def _update_daily_virtuals_info(virtuals_info, date):
+    """
+    Creates (in bulk) or updates (if changed) daily virtuals info.
+
+    :param list virtuals_info: list of tuples (VirtualInfo, virtual device
+        data, hypervisor id)
+    :returns list: list of tuples (DailyVirtualInfo, virtual device data)
+    """
+    existing = dict((dvi.virtual_info_id, dvi) for dvi in (
+        DailyVirtualInfo.objects.filter(
+            date=date,
+            virtual_info__in=[vi.id for vi, data, h in virtuals_info],
+        )
+    ))
+    to_create = []
+    result = []
+    for virtual_info, data, hypervisor_id in virtuals_info:
+        fields = dict(
+            service_environment_id=virtual_info.service_environment_id,
+            hypervisor_id=hypervisor_id,
+        )
+        daily_virtual_info = existing.get(virtual_info.id)
+        if daily_virtual_info is None:
+            daily_virtual_info = DailyVirtualInfo(
+                pricing_object_id=virtual_info.id,
+                virtual_info_id=virtual_info.id,
+                date=date,
+                **fields
+            )
+            to_create.append(daily_virtual_info)
+        elif any(
+            getattr(daily_virtual_info, field) != value
+            for field, value in fields.iteritems()
+        ):
+            for field, value in fields.iteritems():
+                setattr(daily_virtual_info, field, value)
+            daily_virtual_info.save()
+        result.append((daily_virtual_info, data))
+    bulk_create_daily_pricing_objects(DailyVirtualInfo, to_create, date)
+    return result
+
+
+def _get_daily_usages(daily_virtuals_info, usages):
+    """
+    Yields daily usages (see `update_daily_usages`) of virtual devices.
+    """
+    for daily_virtual_info, data in daily_virtuals_info:
+        for key, usage_type in usages.iteritems():
+            yield daily_virtual_info.id, usage_type, dict(
+                service_environment_id=(
+                    daily_virtual_info.service_environment_id
+                ),
+                value=data.get(key),
+            )
+
+
+@commit_on_success
+def update_batch(group_name, virtuals, usages, date, lookups):
+    """
+    Updates batch of virtual devices (of single group) - VirtualInfo,
+    DailyVirtualInfo and DailyUsage objects are fetched for all devices in
+    batch at once and only created or changed objects are saved (new daily
+    virtuals info and usages in bulk).
+
+    Notice that daily usages are saved without sending signals - their
+    changes have to be marked explicitly (see `CostInputChange.mark_usages`).
+
+    :param list virtuals: list of virtual devices data from ralph
+    :param dict usages: dict with UsageType objects
+    :param datetime date: Date for which daily objects will create
+    :param Lookups lookups: maps of related objects (see `get_lookups`)
+    :returns int: count of updated virtual devices
+    """
+    virtuals_info = _update_virtuals_info(
+        group_name,
+        _resolve_virtuals(virtuals, lookups),
+        lookups.models,
+    )
+    daily_virtuals_info = _update_daily_virtuals_info(virtuals_info, date)
+    update_daily_usages(
+        date,
+        usages.values(),
+        _get_daily_usages(daily_virtuals_info, usages),
+    )
+    return len(daily_virtuals_info)
+
+
+def _virtual_in_batches(date, batch_size):
+    """
+    Updates virtual usages from Ralph in batches (see `update_batch`).
+    """
+    updated = total = 0
+    lookups = get_lookups(date)
+    for group_name, services in settings.VIRTUAL_SERVICES.items():
+        usages = get_or_create_usages(get_usage_names(group_name))
+        virtuals = itertools.chain.from_iterable(
+            api_scrooge.get_virtual_usages(service_uid)
+            for service_uid in services
+        )
+        for batch in chunks(virtuals, batch_size):
+            total += len(batch)
+            updated += update_batch(group_name, batch, usages, date, lookups)
+        CostInputChange.mark_usages(usages.values(), date, date)
+        logger.info('Group {0} done'.format(group_name))
+    return updated, total
+
+
+def get_usage_names(group_name):
+    """
+    Returns names of virtual usage types of group.
+    """
+    return {
+        'virtual_cores': '{0} Virtual CPU cores'.format(group_name),
+        'virtual_memory': '{0} Virtual memory MB'.format(group_name),
+        'virtual_disk': '{0} Virtual disk MB'.format(group_name),
+    }
+
+
 def get_or_create_usages(usage_names):
     """
     Creates virtual usage types
@@ -221,16 +493,21 @@ def virtual(**kwargs):
     """Updates the virtual usages from Ralph."""
 
     date = kwargs['today']
+    if settings.VIRTUAL_SYNC_BATCH_SIZE:
+        updated, total = _virtual_in_batches(
+            date,
+            settings.VIRTUAL_SYNC_BATCH_SIZE,
+        )
+        return True, 'Virtual: {0} new, {1} updated, {2} total'.format(
+            None,
+            updated,
+            total,
+        )
     # key in dict is group name (which is propagated to usages names)
     # value is list of services uids (in group)
     updated = total = 0
     for group_name, services in settings.VIRTUAL_SERVICES.items():
-        usage_names = {
-            'virtual_cores': '{0} Virtual CPU cores'.format(group_name),
-            'virtual_memory': '{0} Virtual memory MB'.format(group_name),
-            'virtual_disk': '{0} Virtual disk MB'.format(group_name),
-        }
-        usages = get_or_create_usages(usage_names)
+        usages = get_or_create_usages(get_usage_names(group_name))
         for service_uid in services:
             for data in api_scrooge.get_virtual_usages(service_uid):
                 total += 1
@@ -258,6 +535,7 @@ def virtual(**kwargs):
                 except DeviceIdCannotBeNoneError:
                     logger.warning('Device id cannot be None')
             logger.info('`Service {0} done '.format(service_uid))
+        CostInputChange.mark_usages(usages.values(), date, date)
 
     return True, 'Virtual: {0} new, {1} updated, {2} total'.format(
         None,
@@ -14,6 +14,12 @@ from ralph_scrooge.utils.common import memoize
 
 from ralph_scrooge.models import DailyUsage
 from ralph_scrooge.plugins.base import BasePlugin
+from ralph_scrooge.plugins.cost.period_totals import PeriodTotals, get_key
+from ralph_scrooge.plugins.cost.snapshot import (
+    DailySnapshot,
+    UsageRecord,
+    USAGE_RECORD_FIELDS,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -79,8 +85,11 @@ class BaseCostPlugin(BasePlugin):
         by daterange of usage_price.
 
         Price can be calculated overall or for single warehouse.
+
+        If `PeriodTotals` is active, total usage in period of usage_price is
+        calculated only once (for every day in this period).
         """
-        total_usage = self._get_total_usage(
+        total_usage_kwargs = dict(
             usage_type=usage_price.type,
             start=usage_price.start,
             end=usage_price.end,
@@ -89,12 +98,31 @@ class BaseCostPlugin(BasePlugin):
             excluded_services=excluded_services,
             excluded_services_environments=excluded_services_environments,
         )
+        period_totals = PeriodTotals.get_active()
+        total_usage = None
+        if period_totals:
+            key = get_key(**total_usage_kwargs)
+            total_usage = period_totals.get(key)
+        if total_usage is None:
+            total_usage = self._get_total_usage(**total_usage_kwargs)
+            if period_totals:
+                period_totals.set(key, total_usage)
         cost = usage_price.forecast_cost if forecast else usage_price.cost
         price = 0
         if total_usage and cost:
             price = cost / D(total_usage)
         return D(price)
 
+    def _get_snapshot(self, usage_type, date=None, start=None, end=None,
+                      **kwargs):
+        """
+        Returns active snapshot of pricing inputs if usages are requested for
+        single day (and snapshot for this day is active), otherwise None.
+        """
+        if date and not (start and end):
+            return DailySnapshot.get_active(date)
+        return None
+
     def _get_daily_usages_in_period(
         self,
         usage_type,
@@ -142,6 +170,9 @@ class BaseCostPlugin(BasePlugin):
 
         :rtype: float
         """
+        snapshot = self._get_snapshot(*args, **kwargs)
+        if snapshot:
+            return snapshot.get_total_usage(*args, **kwargs)
         daily_usages = self._get_daily_usages_in_period(*args, **kwargs)
         return daily_usages.aggregate(
             total=Sum('value')
@@ -156,6 +187,16 @@ class BaseCostPlugin(BasePlugin):
 
         :rtype: list
         """
+        snapshot = self._get_snapshot(*args, **kwargs)
+        if snapshot:
+            usages = snapshot.get_usages_per_service_environment(
+                *args,
+                **kwargs
+            )
+            return [
+                {'service_environment': se, 'usage': usage}
+                for se, usage in sorted(usages.items())
+            ]
         daily_usages = self._get_daily_usages_in_period(*args, **kwargs)
         return list(daily_usages.values('service_environment').annotate(
             usage=Sum('value'),
@@ -170,6 +211,13 @@ class BaseCostPlugin(BasePlugin):
 
         :rtype: list
         """
+        snapshot = self._get_snapshot(*args, **kwargs)
+        if snapshot:
+            usages = snapshot.get_usages_per_service(*args, **kwargs)
+            return [
+                {'service_environment__service': service, 'usage': usage}
+                for service, usage in sorted(usages.items())
+            ]
         daily_usages = self._get_daily_usages_in_period(*args, **kwargs)
         return list(
             daily_usages.values('service_environment__service').annotate(
@@ -180,10 +228,16 @@ class BaseCostPlugin(BasePlugin):
     def _get_usages_per_pricing_object(self, *args, **kwargs):
         """
         Works almost exactly as `_get_usages_in_period_per_service`, but
-        instead of returning data grouped by service, it returns usages
-        aggregated by single pricing_object.
+        instead of returning data grouped by service, it returns single usages
+        (of pricing objects) as UsageRecords.
 
         :rtype: list
         """
+        snapshot = self._get_snapshot(*args, **kwargs)
+        if snapshot:
+            return snapshot.get_usages(*args, **kwargs)
         daily_usages = self._get_daily_usages_in_period(*args, **kwargs)
-        return daily_usages
+        return map(
+            UsageRecord._make,
+            daily_usages.values_list(*USAGE_RECORD_FIELDS)
+        )
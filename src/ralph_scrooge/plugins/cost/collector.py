@@ -5,7 +5,11 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
 
+import itertools
 import logging
+import multiprocessing
+from collections import defaultdict
+from contextlib import contextmanager
 from dateutil import rrule
 
 from django.conf import settings
@@ -15,19 +19,35 @@ from django.db import transaction
 from ralph.util import plugin as plugin_runner
 from ralph_scrooge.models import (
     CostDateStatus,
+    CostInputChange,
+    CostPluginProfile,
     DailyCost,
+    DynamicExtraCostDivision,
     DynamicExtraCostType,
     ExtraCostType,
+    MonthlyCost,
     PricingService,
     ServiceEnvironment,
+    ServiceUsageTypes,
     Team,
+    TeamBillingType,
     UsageType,
 )
 from ralph_scrooge.plugins.cost.base import (
     NoPriceCostError,
     MultiplePriceCostError,
 )
-from ralph_scrooge.utils.common import memoize, AttributeDict
+from ralph_scrooge.plugins.cost.period_totals import PeriodTotals
+from ralph_scrooge.plugins.cost.price_book import PriceBook
+from ralph_scrooge.plugins.cost.snapshot import DailySnapshot
+from ralph_scrooge.utils.common import (
+    AttributeDict,
+    chunks,
+    memoize,
+    MemoizeCache,
+)
+from ralph_scrooge.utils.cost_tree import count_nodes
+from ralph_scrooge.utils.profiling import Profiler
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +56,33 @@ class VerifiedDailyCostsExistsError(Exception):
     pass
 
 
+def _init_worker():
+    """
+    Initialize process pool worker - drop database connection inherited from
+    parent process (new one will be opened on first query in the worker).
+    Total usages in periods are cached for worker lifetime (single run).
+    """
+    connection.close()
+    PeriodTotals().activate()
+
+
+def _process_day(params):
+    """
+    Process costs for single day in process pool worker.
+
+    :param tuple params: day, forecast and additional kwargs for
+        `Collector.process`
+    :returns tuple: day and status of costs calculation
+    """
+    day, forecast, kwargs = params
+    try:
+        Collector().process(day, forecast=forecast, **kwargs)
+        return day, True
+    except Exception as e:
+        logger.exception(e)
+        return day, False
+
+
 class Collector(object):
     """
     Costs collector
@@ -92,26 +139,131 @@ class Collector(object):
         end,
         forecast,
         force_recalculation=False,
+        workers=None,
+        incremental=False,
         **kwargs
     ):
+        """
+        Process costs for every day between start and end. Yields (day, status)
+        tuple for every processed day.
+
+        If workers is greater than 1 (by default COSTS_COLLECTOR_WORKERS
+        setting is used), days are processed in parallel in pool of processes
+        (each day is processed by single worker, using separated database
+        connection). Notice that in this case days are yielded in order of
+        finishing calculation, not in chronological order.
+
+        If incremental is True, days with changed costs inputs are processed
+        too (only changed costs are recalculated then - see `process`).
+
+        Usage prices for all days are loaded once (see `PriceBook`), when days
+        are processed sequentially. Total usages in periods of usage prices
+        are calculated once for all days (see `PeriodTotals`).
+
+        Monthly rollup of costs (see `MonthlyCost`) is refreshed once for
+        every month of processed days, after all days are processed (in
+        this process, not in workers).
+        """
         # calculate costs only if were not calculated for some date, unless
         # force_recalculation is True
-        dates = self._get_dates(start, end, forecast, force_recalculation)
+        dates = self._get_dates(
+            start,
+            end,
+            forecast,
+            force_recalculation,
+            incremental,
+        )
+        if incremental:
+            kwargs['incremental'] = incremental
+        kwargs['refresh_monthly'] = False
+        if workers is None:
+            workers = settings.COSTS_COLLECTOR_WORKERS
+        processed = []
+        try:
+            for day, success in self._process_days(
+                dates,
+                forecast,
+                workers,
+                **kwargs
+            ):
+                if success:
+                    processed.append(day)
+                yield day, success
+        finally:
+            self.refresh_monthly_costs(processed, forecast)
+
+    def _process_days(self, dates, forecast, workers, **kwargs):
+        """
+        Process costs for dates (in pool of processes if workers is greater
+        than 1). Yields (day, status) tuple for every processed day.
+        """
+        if workers > 1 and len(dates) > 1:
+            for result in self._process_period_parallel(
+                dates,
+                forecast,
+                workers,
+                **kwargs
+            ):
+                yield result
+            return
         service_environments = self._get_services_environments()
-        for day in dates:
-            try:
-                self.process(
-                    day,
-                    service_environments=service_environments,
-                    forecast=forecast,
-                    **kwargs
-                )
-                yield day, True
-            except Exception as e:
-                logger.exception(e)
-                yield day, False
+        price_book = PriceBook(min(dates), max(dates)) if dates else None
+        with PeriodTotals():
+            for day in dates:
+                try:
+                    self.process(
+                        day,
+                        service_environments=service_environments,
+                        forecast=forecast,
+                        price_book=price_book,
+                        **kwargs
+                    )
+                    yield day, True
+                except Exception as e:
+                    logger.exception(e)
+                    yield day, False
 
-    def _get_dates(self, start, end, forecast, force_recalculation):
+    def refresh_monthly_costs(self, dates, forecast):
+        """
+        Refreshes monthly rollup of costs once for every month of dates
+        (every month in separate transaction).
+        """
+        for month in sorted(set(day.replace(day=1) for day in dates)):
+            with transaction.commit_on_success():
+                MonthlyCost.refresh(month, month, forecast)
+
+    def _process_period_parallel(self, dates, forecast, workers, **kwargs):
+        """
+        Process costs for dates in pool of processes.
+        """
+        logger.info('Calculating costs for {} days using {} workers'.format(
+            len(dates),
+            workers,
+        ))
+        # close connection before forking to not share it between processes
+        connection.close()
+        pool = multiprocessing.Pool(
+            processes=min(workers, len(dates)),
+            initializer=_init_worker,
+        )
+        try:
+            for day, success in pool.imap_unordered(
+                _process_day,
+                [(day, forecast, kwargs) for day in dates],
+            ):
+                yield day, success
+        finally:
+            pool.terminate()
+            pool.join()
+
+    def _get_dates(
+        self,
+        start,
+        end,
+        forecast,
+        force_recalculation,
+        incremental=False,
+    ):
         days = [d.date() for d in rrule.rrule(
             rrule.DAILY,
             dtstart=start,
@@ -119,12 +271,25 @@ class Collector(object):
         )]
         if force_recalculation:
             return days
-        else:
-            return sorted(set(days) - set(CostDateStatus.objects.filter(
+        dates = set(days) - set(CostDateStatus.objects.filter(
+            date__gte=start,
+            date__lte=end,
+            **{'forecast_calculated' if forecast else 'calculated': True}
+        ).values_list('date', flat=True))
+        if incremental:
+            # accepted costs are never recalculated
+            dates.update(set(CostInputChange.objects.filter(
                 date__gte=start,
                 date__lte=end,
-                **{'forecast_calculated' if forecast else 'calculated': True}
-            ).values_list('date', flat=True)))
+                forecast=forecast,
+            ).values_list('date', flat=True)) - set(
+                CostDateStatus.objects.filter(
+                    date__gte=start,
+                    date__lte=end,
+                    **{'forecast_accepted' if forecast else 'accepted': True}
+                ).values_list('date', flat=True)
+            ))
+        return sorted(dates)
 
     def process(
         self,
@@ -133,6 +298,9 @@ class Collector(object):
         delete_verified=False,
         service_environments=None,
         plugins=None,
+        incremental=False,
+        price_book=None,
+        refresh_monthly=True,
     ):
         """
         Process costs for single date.
@@ -141,15 +309,51 @@ class Collector(object):
         1) delete previously saved costs (if they were not verified, except
             sitution, where delete_verified=True was passed explicitly)
         2) collect costs from all plugins
-        3) save costs in database in tree format
+        3) save costs in database in tree format (and delete monthly rollup
+            of month of date, so costs of this month are taken from daily
+            costs until rollup is refreshed)
+        4) refresh monthly rollup of costs (in separate transaction), unless
+            refresh_monthly is False - then it has to be refreshed by caller
+            (ex. once for all days in period, see `refresh_monthly_costs`)
+
+        If incremental is True (and costs for date were already calculated),
+        only costs of base usages, which inputs changed since last
+        calculation (see `CostInputChange`) and base usages depending on them
+        (ex. pricing services) are recalculated - only these costs are
+        replaced in database.
+
+        If price_book is passed, usage prices are taken from it instead of
+        loading them for date.
         """
         logger.info('Calculating costs (forecast: {}) for date {}'.format(
             forecast,
             date,
         ))
+        # memoized results are valid only in single run
+        MemoizeCache.clear_all()
+        self._profiles = []
+        self._price_book = price_book
         if service_environments is None:
             service_environments = self._get_services_environments()
         self._verify_accepted_costs(date, forecast, delete_verified)
+        changes = CostInputChange.objects.filter(date=date, forecast=forecast)
+        # changes are consumed only when all (affected) costs are recalculated
+        changes_ids = []
+        if incremental or plugins is None:
+            changes_ids = list(changes.values_list('id', flat=True))
+        types = None
+        if incremental and self._is_calculated(date, forecast):
+            types = self._get_affected_types(
+                date,
+                set(changes.values_list('type', flat=True)),
+            )
+            if not types:
+                logger.info('No changes for date {}'.format(date))
+                return
+            plugins = [
+                plugin for plugin in (plugins or self.get_plugins())
+                if self._get_plugin_type_id(plugin) in types
+            ]
         costs = self._collect_costs(
             date,
             service_environments,
@@ -157,23 +361,221 @@ class Collector(object):
             plugins,
         )
         with transaction.commit_on_success():
-            self._delete_daily_costs(date, forecast, delete_verified)
+            self._delete_daily_costs(date, forecast, delete_verified, types)
             self._save_costs(date, costs, forecast)
+            self._save_profiles(date, forecast)
+            CostInputChange.objects.filter(id__in=changes_ids).delete()
+            # rollup of month is outdated (until it's refreshed)
+            MonthlyCost.objects.filter(
+                month=date.replace(day=1),
+                forecast=forecast,
+            ).delete()
+        if refresh_monthly:
+            self.refresh_monthly_costs([date], forecast)
         logger.info('Costs saved for date {}'.format(date))
+        self._log_memoize_stats()
+
+    @contextmanager
+    def _profile(self, date, forecast, plugin_name, name, total_cost=False):
+        """
+        Profiles plugin call (if COSTS_PROFILING is enabled). Yields profile
+        (or None if profiling is disabled), which is saved together with
+        costs (number of produced cost nodes should be set in it by caller).
+        """
+        if not settings.COSTS_PROFILING:
+            yield None
+            return
+        profile = CostPluginProfile(
+            date=date,
+            forecast=forecast,
+            plugin_name=plugin_name,
+            name=name,
+            total_cost=total_cost,
+        )
+        with Profiler() as profiler:
+            yield profile
+        profile.wall_time = profiler.wall_time
+        profile.db_time = profiler.db_time
+        profile.queries_count = profiler.queries_count
+        profile.rows_count = profiler.rows_count
+        logger.debug(
+            'Plugin {} ({}): {:.3f}s, {} SQL queries ({:.3f}s)'.format(
+                plugin_name,
+                name,
+                profile.wall_time,
+                profile.queries_count,
+                profile.db_time,
+            )
+        )
+        getattr(self, '_profiles', []).append(profile)
 
-    def _delete_daily_costs(self, date, forecast, delete_verified=False):
+    def _save_profiles(self, date, forecast):
+        """
+        Saves profiles of plugins called in costs collecting for date
+        (replacing previous profiles of the same plugins).
+        """
+        profiles = getattr(self, '_profiles', [])
+        if not profiles:
+            return
+        CostPluginProfile.objects.filter(
+            date=date,
+            forecast=forecast,
+            name__in=set([p.name for p in profiles]),
+        ).delete()
+        CostPluginProfile.objects.bulk_create(profiles)
+        self._profiles = []
+
+    def _log_memoize_stats(self):
+        """
+        Logs statistics of memoized functions caches per plugin (module).
+        """
+        stats = defaultdict(lambda: defaultdict(int))
+        for name, func_stats in MemoizeCache.get_all_stats().items():
+            module = name.rsplit('.', 1)[0]
+            for key, value in func_stats.items():
+                stats[module][key] += value
+        for module, module_stats in sorted(stats.items()):
+            logger.info(
+                'Memoize stats for {}: {hits} hits, {misses} misses, '
+                '{evictions} evictions, {size} cached'.format(
+                    module,
+                    **module_stats
+                )
+            )
+
+    def _delete_daily_costs(
+        self,
+        date,
+        forecast,
+        delete_verified=False,
+        types=None,
+    ):
         """
         Check if there are any verfifed daily costs for given date.
         If no, delete previously saved costs for given date.
         If yes,
+
+        If types are passed, only costs (subtrees) of these base usages are
+        deleted.
         """
+        query = "DELETE FROM {} WHERE date=%s and forecast=%s".format(
+            DailyCost._meta.db_table,
+        )
+        params = [date, forecast]
+        if types is not None:
+            # every cost in subtree has path starting with root type id
+            query += " and ({})".format(' or '.join(
+                ["path=%s or path LIKE %s"] * len(types)
+            ))
+            for type_id in types:
+                params.extend([str(type_id), '{}/%'.format(type_id)])
         cursor = connection.cursor()
-        cursor.execute(
-            "DELETE FROM {} WHERE date=%s and forecast=%s".format(
-                DailyCost._meta.db_table,
-            ),
-            [date, forecast]
+        cursor.execute(query, params)
+
+    def _is_calculated(self, date, forecast):
+        return CostDateStatus.objects.filter(
+            date=date,
+            **{'forecast_calculated' if forecast else 'calculated': True}
+        ).exists()
+
+    def _get_affected_types(self, date, changed_types):
+        """
+        Returns ids of base usages, which costs should be recalculated, when
+        inputs of changed_types changed:
+        * every changed base usage
+        * pricing services (and dynamic extra costs) charging by changed usage
+          types
+        * teams charging by assets (and cores) count, when assets (or cores)
+          usages changed
+        * teams distributing (or averaging) costs, when any team changed
+          (they are charged by costs and shares of other teams)
+        * every pricing service, when base or regular usage type, team or
+          (dynamic) extra cost changed (pricing service costs are composed of
+          them)
+        * pricing services depending on affected pricing services (using
+          their resources or charged by diff between real and calculated
+          costs)
+        """
+        result = set(changed_types)
+        if not result:
+            return result
+        pricing_services = list(PricingService.objects.all())
+        pricing_services_ids = set([ps.id for ps in pricing_services])
+        usage_types = UsageType.objects.filter(id__in=changed_types)
+        result.update(ServiceUsageTypes.objects.filter(
+            usage_type__in=usage_types,
+        ).values_list('pricing_service', flat=True))
+        result.update(DynamicExtraCostDivision.objects.filter(
+            usage_type__in=usage_types,
+        ).values_list('dynamic_extra_cost_type', flat=True))
+        service_usage_types = set(usage_types.filter(
+            usage_type='SU',
+        ).values_list('id', flat=True))
+        teams = self._get_affected_teams(
+            changed_types,
+            set(usage_types.values_list('symbol', flat=True)),
         )
+        result.update(teams)
+        changed_types = changed_types | teams
+        if changed_types - pricing_services_ids - service_usage_types:
+            result.update(pricing_services_ids)
+        # pricing services using resources of (depending on) pricing service
+        dependents = defaultdict(set)
+        for ps in pricing_services:
+            for dependent in ps.get_dependent_services(date):
+                dependents[dependent.id].add(ps.id)
+            if ps.charge_diff_to_real_costs_id:
+                dependents[ps.id].add(ps.charge_diff_to_real_costs_id)
+        to_visit = list(result & pricing_services_ids)
+        while to_visit:
+            for ps_id in dependents[to_visit.pop()]:
+                if ps_id not in result:
+                    result.add(ps_id)
+                    to_visit.append(ps_id)
+        return result
+
+    def _get_affected_teams(self, changed_types, changed_symbols):
+        """
+        Returns ids of teams, which costs depend on changed base usages (and
+        usage types with changed_symbols), but are not changed directly.
+        """
+        billing_types = []
+        if 'assets_count' in changed_symbols:
+            billing_types.extend([
+                TeamBillingType.assets,
+                TeamBillingType.assets_cores,
+            ])
+        elif 'physical_cpu_cores' in changed_symbols:
+            billing_types.append(TeamBillingType.assets_cores)
+        teams = set(Team.objects.filter(
+            billing_type__in=billing_types,
+        ).values_list('id', flat=True)) if billing_types else set()
+        if teams or Team.objects.filter(id__in=changed_types).exists():
+            teams.update(Team.objects.filter(billing_type__in=(
+                TeamBillingType.distribute,
+                TeamBillingType.average,
+            )).values_list('id', flat=True))
+        return teams - changed_types
+
+    @classmethod
+    def _get_plugin_type_id(cls, plugin):
+        """
+        Returns id of base usage, which costs are calculated by plugin (type
+        of top-level costs returned by plugin).
+        """
+        if plugin.plugin_name == 'support_plugin':
+            return 2  # support extra cost type (from fixture)
+        plugin_kwargs = plugin.get('plugin_kwargs', {})
+        for key in (
+            'usage_type',
+            'pricing_service',
+            'team',
+            'extra_cost_type',
+            'dynamic_extra_cost_type',
+        ):
+            if key in plugin_kwargs:
+                return plugin_kwargs[key].id
+        return None
 
     def _verify_accepted_costs(self, date, forecast, delete_verified):
         if not delete_verified and CostDateStatus.objects.filter(
@@ -186,20 +588,27 @@ class Collector(object):
         """
         For every service environment in costs save tree structure in database
 
+        DailyCosts are generated lazily and saved in batches of
+        COSTS_SAVE_BATCH_SIZE (multi-row insert for every batch), so only
+        single batch is kept in memory at once.
+
         At the end update status of date costs to calculated.
         """
-        daily_costs = []
-        for service_environment, se_costs in costs.iteritems():
-            # use _build_tree directly, to collect DailyCosts for all services
-            # and save all at the end
-            daily_costs.extend(DailyCost._build_tree(
+        # use _build_tree directly, to generate DailyCosts for all services
+        # and save them in batches
+        daily_costs = itertools.chain.from_iterable(
+            DailyCost._build_tree(
                 tree=se_costs,
                 date=date,
                 service_environment_id=service_environment,
                 forecast=forecast,
-            ))
-        logger.info('Saving {} costs'.format(len(daily_costs)))
-        DailyCost.objects.bulk_create(daily_costs)
+            ) for service_environment, se_costs in costs.iteritems()
+        )
+        saved = 0
+        for batch in chunks(daily_costs, settings.COSTS_SAVE_BATCH_SIZE):
+            DailyCost.objects.bulk_create(batch)
+            saved += len(batch)
+        logger.info('Saved {} costs'.format(saved))
         # update status to created
         status, created = CostDateStatus.concurrent_get_or_create(date=date)
         if forecast:
@@ -218,32 +627,114 @@ class Collector(object):
     ):
         """
         Collects costs from all plugins and stores them per service environment
+
+        During collecting costs, snapshot of pricing inputs (usages, prices,
+        team costs and daily pricing objects) for date is active, so every
+        plugin is using (and aggregating) the same, once loaded, data.
+
+        When costs are collected from all plugins, total costs of pricing
+        services are calculated first in order of dependencies (see
+        `_calculate_pricing_services_costs`).
         """
         logger.debug("Getting report date")
-        old_queries_count = len(connection.queries)
+        with DailySnapshot(
+            date,
+            price_book=getattr(self, '_price_book', None),
+        ) as snapshot:
+            if plugins is None:
+                self._calculate_pricing_services_costs(
+                    date,
+                    forecast,
+                    snapshot,
+                )
+            data = self._collect_plugins_costs(
+                date,
+                service_environments,
+                forecast,
+                plugins,
+            )
+        return data
+
+    def _calculate_pricing_services_costs(self, date, forecast, snapshot):
+        """
+        Calculates total costs of all pricing services in topological order of
+        dependencies graph (pricing service is calculated after all pricing
+        services on which it depends). Costs hierarchies are cached in
+        snapshot, so every one of them is calculated only once, no matter how
+        many pricing services depends on it.
+        """
+        for pricing_service in (
+            snapshot.get_pricing_services_in_dependency_order()
+        ):
+            try:
+                with self._profile(
+                    date,
+                    forecast,
+                    pricing_service.get_plugin_name(),
+                    pricing_service.name,
+                    total_cost=True,
+                ) as profile:
+                    total_cost = plugin_runner.run(
+                        'scrooge_costs',
+                        pricing_service.get_plugin_name(),
+                        type='total_cost',
+                        pricing_service=pricing_service,
+                        date=date,
+                        forecast=forecast,
+                        for_all_service_environments=True,
+                        service_environments=None,
+                    )
+                    if profile:
+                        profile.nodes_count = count_nodes(total_cost)
+            except (
+                KeyError,
+                AttributeError,
+                NoPriceCostError,
+                MultiplePriceCostError,
+            ):
+                logger.warning(
+                    'Invalid call for {0} total cost'.format(
+                        pricing_service.name
+                    )
+                )
+
+    def _collect_plugins_costs(
+        self,
+        date,
+        service_environments,
+        forecast,
+        plugins=None
+    ):
+        """
+        Calls every plugin and stores it's costs per service environment
+        """
         data = {se.id: [] for se in service_environments}
         for i, plugin in enumerate(plugins or self.get_plugins()):
             try:
-                plugin_old_queries_count = len(connection.queries)
-                plugin_report = plugin_runner.run(
-                    'scrooge_costs',
+                with self._profile(
+                    date,
+                    forecast,
                     plugin.plugin_name,
-                    service_environments=service_environments,
-                    date=date,
-                    forecast=forecast,
-                    type='costs',
-                    **plugin.get('plugin_kwargs', {})
-                )
+                    plugin.name,
+                ) as profile:
+                    plugin_report = plugin_runner.run(
+                        'scrooge_costs',
+                        plugin.plugin_name,
+                        service_environments=service_environments,
+                        date=date,
+                        forecast=forecast,
+                        type='costs',
+                        **plugin.get('plugin_kwargs', {})
+                    )
+                    if profile:
+                        profile.nodes_count = count_nodes(
+                            itertools.chain.from_iterable(
+                                plugin_report.values()
+                            )
+                        )
                 for service_id, service_usage in plugin_report.iteritems():
                     if service_id in data:
                         data[service_id].extend(service_usage)
-                plugin_queries_count = (
-                    len(connection.queries) - plugin_old_queries_count
-                )
-                if settings.DEBUG:
-                    logger.debug('Plugin SQL queries: {0}\n'.format(
-                        plugin_queries_count
-                    ))
             except KeyError:
                 logger.warning(
                     "Usage '{0}' has no usage plugin\n".format(plugin.name)
@@ -257,10 +748,6 @@ class Collector(object):
                     "Error while generating the report: {0}\n".format(e)
                 )
                 raise
-
-        queries_count = len(connection.queries) - old_queries_count
-        if settings.DEBUG:
-            logger.debug('Total SQL queries: {0}'.format(queries_count))
         return data
 
     @classmethod
@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+"""
+Distribution of costs between pricing objects (or service environments).
+
+`allocate` splits (Decimal) cost between weights, so that sum of parts is
+exactly equal to the cost (rounded to `PRICE_PLACES`). It's used by cost
+plugins, so sum of daily costs saved for pricing service (team etc.) is equal
+to its total cost.
+
+`distribute_costs` is vectorized (NumPy-backed) distribution of pricing
+service costs hierarchy between pricing objects. Cost of every node of
+pricing service costs hierarchy is distributed between pricing objects
+proportionally to their share in pricing service usages
+(weighted by percentage division of service usage types). Share of pricing
+object doesn't depend on hierarchy node, so shares (vector) are calculated
+once and multiplied by costs of all hierarchy nodes (flattened to vector) in
+single pass. Costs are then rounded to `PRICE_PLACES`, using largest remainder
+method per hierarchy node, so sum of distributed costs of every node is
+exactly equal to (rounded) distributed cost of this node.
+
+NumPy is optional dependency - use `is_available` to check if this engine
+could be used.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from decimal import Decimal as D, ROUND_FLOOR, ROUND_HALF_UP
+
+from ralph_scrooge.models.extra_cost import PRICE_PLACES
+from ralph_scrooge.utils.cost_tree import CostNode
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def is_available():
+    """
+    Returns True if NumPy is installed (and this engine could be used).
+    """
+    return numpy is not None
+
+
+def allocate(total, weights, places=PRICE_PLACES):
+    """
+    Splits total between weights (proportionally) using largest remainder
+    method - every part is rounded down to `places` decimal places and then
+    remaining units (10^-places) are given to the parts with largest
+    remainders. Sum of parts is always equal to total (rounded to `places`).
+
+    >>> allocate(D('100'), [1, 1, 1])
+    [Decimal('33.333334'), Decimal('33.333333'), Decimal('33.333333')]
+    >>> allocate(D('-10'), [1, 3])
+    [Decimal('-2.500000'), Decimal('-7.500000')]
+    >>> allocate(D('10'), [0, 0])
+    [Decimal('0.000000'), Decimal('0.000000')]
+    """
+    weights = [D(w) for w in weights]
+    total_weight = sum(weights)
+    if not total_weight:
+        return [D(0).scaleb(-places) for w in weights]
+    total_units = (D(total).scaleb(places)).to_integral_value(ROUND_HALF_UP)
+    units = [total_units * w / total_weight for w in weights]
+    rounded = [u.to_integral_value(ROUND_FLOOR) for u in units]
+    missing = int(total_units - sum(rounded))
+    by_remainder = sorted(
+        range(len(units)),
+        key=lambda i: units[i] - rounded[i],
+        reverse=True,
+    )
+    for i in by_remainder[:missing]:
+        rounded[i] += 1
+    return [D(int(r)).scaleb(-places) for r in rounded]
+
+
+def _flatten_hierarchy(hierarchy, first_depth_only=False):
+    """
+    Flattens costs hierarchy (dict with type id as key and tuple (cost,
+    children hierarchy) as value) to list of nodes. Every node is a tuple
+    (type id, cost, list of indexes of children nodes).
+    """
+    nodes = []
+
+    def flatten(subhierarchy):
+        indexes = []
+        for type_id, (cost, children) in subhierarchy.items():
+            index = len(nodes)
+            nodes.append((type_id, cost, []))
+            if children and not first_depth_only:
+                nodes[index][2].extend(flatten(children))
+            indexes.append(index)
+        return indexes
+
+    return nodes, flatten(hierarchy)
+
+
+def _round_costs(costs, places):
+    """
+    Rounds matrix of costs (pricing object x hierarchy node) to integer units
+    of 10^-places. Every column is rounded down and then remaining units (to
+    rounded sum of column) are given to the costs with largest remainders.
+    """
+    units = costs * 10 ** places
+    rounded = numpy.floor(units)
+    remainders = units - rounded
+    missing = numpy.rint(units.sum(axis=0)) - rounded.sum(axis=0)
+    # rank of remainder in column (0 for the largest one)
+    ranks = numpy.argsort(
+        numpy.argsort(-remainders, axis=0, kind='mergesort'),
+        axis=0,
+        kind='mergesort',
+    )
+    rounded += ranks < missing
+    return rounded.astype(numpy.int64)
+
+
+def distribute_costs(
+    hierarchy,
+    pricing_objects,
+    usages,
+    total_usages,
+    percentage,
+    first_depth_only=False,
+    places=PRICE_PLACES,
+):
+    """
+    Distributes costs hierarchy between pricing objects.
+
+    :param dict hierarchy: pricing service costs hierarchy (dict with type id
+        as key and tuple (cost, children hierarchy) as value)
+    :param list pricing_objects: list of pricing objects ids
+    :param list usages: list of usages (of every service usage type) of
+        every pricing object (matrix pricing object x service usage type)
+    :param list total_usages: total usage of every service usage type
+    :param list percentage: percent of every service usage type
+    :param bool first_depth_only: if True, children of first level of
+        hierarchy are not distributed
+    :returns: list of costs (list of CostNodes) of every pricing object
+    :rtype: list
+    """
+    nodes, roots = _flatten_hierarchy(hierarchy, first_depth_only)
+    if not pricing_objects or not nodes:
+        return [[] for po in pricing_objects]
+    usages = numpy.array(usages, dtype=numpy.float64)
+    total_usages = numpy.array(total_usages, dtype=numpy.float64)
+    percentage = numpy.array(percentage, dtype=numpy.float64)
+    # share of unit of usage in pricing service cost for every usage type
+    # (usage types without any usage are skipped)
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        weights = numpy.where(
+            total_usages != 0,
+            percentage / 100 / total_usages,
+            0,
+        )
+    shares = usages.dot(weights)
+    costs = numpy.array([float(cost) for _, cost, _ in nodes])
+    units = _round_costs(numpy.outer(shares, costs), places)
+    value_column = 0 if len(total_usages) == 1 else None
+
+    def build(po_index, indexes, depth=0):
+        result = []
+        for index in indexes:
+            type_id, _, children = nodes[index]
+            node = CostNode(
+                type_id=type_id,
+                pricing_object_id=pricing_objects[po_index],
+                cost=D(int(units[po_index, index])).scaleb(-places),
+            )
+            # add value if there is only one usage type defined for pricing
+            # service and depth is 0 (whole pricing service level)
+            if value_column is not None and depth == 0:
+                node.value = float(usages[po_index, value_column])
+            if children:
+                node.children = build(po_index, children, depth + 1)
+            result.append(node)
+        return result
+
+    return [build(i, roots) for i in range(len(pricing_objects))]
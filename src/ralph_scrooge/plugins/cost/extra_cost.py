@@ -13,6 +13,7 @@ from ralph_scrooge.plugins.base import register
 from ralph_scrooge.plugins.cost.base import (
     BaseCostPlugin,
 )
+from ralph_scrooge.utils.cost_tree import CostNode
 
 logger = logging.getLogger(__name__)
 
@@ -63,10 +64,8 @@ class ExtraCostPlugin(BaseCostPlugin):
         usages = defaultdict(list)
         for extra_cost in extra_costs:
             cost = extra_cost.forecast_cost if forecast else extra_cost.cost
-            usages[extra_cost.service_environment_id].append({
-                'cost': (cost / (
-                    (extra_cost.end - extra_cost.start).days + 1)
-                ),
-                'type': extra_cost_type,
-            })
+            usages[extra_cost.service_environment_id].append(CostNode(
+                type_id=extra_cost_type.id,
+                cost=cost / ((extra_cost.end - extra_cost.start).days + 1),
+            ))
         return usages
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+Cache of total usages in periods of usage prices.
+
+Price of usage type billed by cost (`by_cost`) is calculated from total usage
+in whole period of usage price (ex. month), which is the same for every day
+in this period. While `PeriodTotals` is active (ex. during collecting costs
+for many days), total usage is calculated once for usage price period,
+warehouse and exclusions and then reused for every other day in period.
+
+Cached totals of usage type are invalidated, when its costs inputs (usages or
+prices) inside period are changed (see `CostInputChange.mark`).
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from ralph_scrooge.models.cost import cost_input_changed
+from ralph_scrooge.plugins.cost.snapshot import get_id, get_ids
+
+
+def _get_ids(objects):
+    ids = get_ids(objects)
+    return frozenset(ids) if ids is not None else None
+
+
+def get_key(
+    usage_type,
+    start,
+    end,
+    warehouse=None,
+    service_environments=None,
+    excluded_services=None,
+    excluded_services_environments=None,
+):
+    """
+    Returns key of total usage of usage type between start and end.
+    """
+    return (
+        get_id(usage_type),
+        start,
+        end,
+        get_id(warehouse),
+        _get_ids(service_environments),
+        _get_ids(excluded_services),
+        _get_ids(excluded_services_environments),
+    )
+
+
+class PeriodTotals(object):
+    """
+    Process-wide cache of total usages in periods.
+    """
+    _active = None
+
+    def __init__(self):
+        self._totals = {}
+
+    def __enter__(self):
+        self.activate()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.deactivate()
+
+    @classmethod
+    def get_active(cls):
+        """
+        Returns active cache or None if there is no such cache.
+        """
+        return cls._active
+
+    def activate(self):
+        PeriodTotals._active = self
+
+    def deactivate(self):
+        if PeriodTotals._active is self:
+            PeriodTotals._active = None
+
+    def get(self, key):
+        """
+        Returns cached total usage or None if it wasn't calculated yet.
+        """
+        return self._totals.get(key)
+
+    def set(self, key, total):
+        self._totals[key] = total
+
+    def invalidate(self, type_ids=None, start=None, end=None):
+        """
+        Removes totals of usage types (all if type_ids is None) in periods
+        overlapping with range between start and end (None means no limit).
+        """
+        for key in list(self._totals):
+            type_id, key_start, key_end = key[:3]
+            if type_ids is not None and type_id not in type_ids:
+                continue
+            if (start and key_end < start) or (end and key_start > end):
+                continue
+            del self._totals[key]
+
+
+def invalidate_period_totals(sender, type_ids, start, end, **kwargs):
+    period_totals = PeriodTotals.get_active()
+    if period_totals:
+        period_totals.invalidate(type_ids, start, end)
+
+
+cost_input_changed.connect(invalidate_period_totals)
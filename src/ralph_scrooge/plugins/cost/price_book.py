@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""
+In-memory index of usage prices.
+
+Price book loads (in single query) all usage prices defined in some period of
+time and indexes them by usage type and warehouse. Periods of usage prices
+are sorted by start, so usage price for any (usage type, warehouse, date) is
+found using binary search, without querying database.
+
+Overlapping periods of usage prices (for the same usage type and warehouse)
+are detected (and logged) when price book is loaded, so lookup for date out of
+them is always resolved to single usage price.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import bisect
+import logging
+from collections import defaultdict
+
+from ralph_scrooge.models import UsagePrice
+
+logger = logging.getLogger(__name__)
+
+
+def get_id(obj):
+    """
+    Returns id of object (or object itself if it's already id).
+    """
+    return getattr(obj, 'id', obj)
+
+
+class UsagePricesIndex(object):
+    """
+    Interval index of usage prices (of single usage type and warehouse).
+    """
+    def __init__(self, usage_prices):
+        self.usage_prices = sorted(usage_prices, key=lambda up: up.start)
+        self._starts = [up.start for up in self.usage_prices]
+        # index of usage price with the latest end among usage prices
+        # starting not later than usage price with the same index
+        self._max_end_indexes = []
+        # periods covered by more than one usage price
+        self.overlaps = []
+        max_end_index = None
+        for index, usage_price in enumerate(self.usage_prices):
+            if max_end_index is not None:
+                max_end = self.usage_prices[max_end_index].end
+                if usage_price.start <= max_end:
+                    self.overlaps.append(
+                        (usage_price.start, min(usage_price.end, max_end))
+                    )
+                if usage_price.end > max_end:
+                    max_end_index = index
+            else:
+                max_end_index = index
+            self._max_end_indexes.append(max_end_index)
+
+    def is_overlapped(self, date):
+        return any(start <= date <= end for start, end in self.overlaps)
+
+    def get(self, date):
+        """
+        Returns list of usage prices defined for date (more than one only if
+        date is in overlapping periods).
+        """
+        if self.is_overlapped(date):
+            return self.get_between(date, date)
+        index = bisect.bisect_right(self._starts, date) - 1
+        if index >= 0:
+            usage_price = self.usage_prices[self._max_end_indexes[index]]
+            if usage_price.end >= date:
+                return [usage_price]
+        return []
+
+    def get_between(self, start, end):
+        """
+        Returns list of usage prices (sorted by start) defined for any day
+        between start and end.
+        """
+        return [
+            up for up in self.usage_prices[
+                :bisect.bisect_right(self._starts, end)
+            ] if up.end >= start
+        ]
+
+
+class PriceBook(object):
+    """
+    Usage prices (of all usage types) defined between start and end (all
+    usage prices if start and end are not passed).
+    """
+    def __init__(self, start=None, end=None, usage_prices=None):
+        if usage_prices is None:
+            usage_prices = UsagePrice.objects.select_related('type')
+            if end:
+                usage_prices = usage_prices.filter(start__lte=end)
+            if start:
+                usage_prices = usage_prices.filter(end__gte=start)
+        by_type = defaultdict(list)
+        by_warehouse = defaultdict(list)
+        for usage_price in usage_prices:
+            by_type[usage_price.type_id].append(usage_price)
+            by_warehouse[
+                (usage_price.type_id, usage_price.warehouse_id)
+            ].append(usage_price)
+        self._by_type = dict(
+            (type_id, UsagePricesIndex(ups))
+            for type_id, ups in by_type.items()
+        )
+        self._by_warehouse = dict(
+            (key, UsagePricesIndex(ups)) for key, ups in by_warehouse.items()
+        )
+        for (type_id, warehouse_id), index in self._by_warehouse.items():
+            for overlap_start, overlap_end in index.overlaps:
+                logger.warning(
+                    'Overlapping usage prices of usage type {} (warehouse: '
+                    '{}) between {} and {}'.format(
+                        type_id,
+                        warehouse_id,
+                        overlap_start,
+                        overlap_end,
+                    )
+                )
+
+    def _get_index(self, usage_type, warehouse=None):
+        """
+        Returns index of usage prices of usage type (in single warehouse if
+        warehouse is passed, otherwise in all warehouses).
+        """
+        if warehouse:
+            key = (get_id(usage_type), get_id(warehouse))
+            index = self._by_warehouse.get(key)
+        else:
+            index = self._by_type.get(get_id(usage_type))
+        return index or UsagePricesIndex([])
+
+    def get_usage_prices(self, usage_type, date, warehouse=None):
+        """
+        Returns list of usage prices of usage type (optionally in single
+        warehouse) defined for date. There should be exactly one such usage
+        price (if there is more, their periods are overlapping).
+        """
+        return self._get_index(usage_type, warehouse).get(date)
+
+    def get_usage_prices_between(
+        self,
+        usage_type,
+        start,
+        end,
+        warehouse=None,
+    ):
+        """
+        Returns list of usage prices of usage type (optionally in single
+        warehouse) defined for any day between start and end, sorted by
+        start.
+        """
+        return self._get_index(usage_type, warehouse).get_between(start, end)
@@ -11,7 +11,6 @@ from collections import defaultdict
 from decimal import Decimal as D
 
 from django.conf import settings
-from django.db.models import Sum
 
 from ralph.util import plugin as plugin_runner
 from ralph_scrooge.models import (
@@ -21,8 +20,12 @@ from ralph_scrooge.models import (
     UsageType,
 )
 from ralph_scrooge.plugins.base import register
+from ralph_scrooge.plugins.cost import distribution
+from ralph_scrooge.plugins.cost.distribution import allocate
 from ralph_scrooge.plugins.cost.base import BaseCostPlugin
+from ralph_scrooge.plugins.cost.snapshot import DailySnapshot, get_ids
 from ralph_scrooge.utils.common import memoize
+from ralph_scrooge.utils.cost_tree import CostNode
 
 
 logger = logging.getLogger(__name__)
@@ -59,14 +62,26 @@ class PricingServiceBasePlugin(BaseCostPlugin):
         with total cost details (hirearchy). (See `_get_pricing_service_costs`
         for sample).
 
+        If snapshot for date is active, total costs hierarchy is calculated
+        only once for pricing service, forecast and subset of service
+        environments (and cached in snapshot).
+
         :rtype: dict
         :returns: pricing service total costs hierarchy.
         """
         if for_all_service_environments:
             return self._costs(*args, **kwargs)
-        else:
-            service_costs = self.costs(*args, **kwargs)
-            return self._get_total_costs_from_costs(service_costs)
+        snapshot = DailySnapshot.get_active(kwargs.get('date'))
+        key = self._get_cache_key(**kwargs)
+        if snapshot:
+            cached_costs = snapshot.get_pricing_service_costs(key)
+            if cached_costs is not None:
+                return cached_costs
+        service_costs = self.costs(*args, **kwargs)
+        total_costs = self._get_total_costs_from_costs(service_costs)
+        if snapshot:
+            snapshot.set_pricing_service_costs(key, total_costs)
+        return total_costs
 
     def costs(
         self,
@@ -112,6 +127,29 @@ class PricingServiceBasePlugin(BaseCostPlugin):
         )
 
     # HELPERS
+    def _get_cache_key(
+        self,
+        pricing_service,
+        date,
+        forecast=False,
+        service_environments=None,
+        **kwargs
+    ):
+        """
+        Returns key of pricing service costs in snapshot cache. Key is
+        composed of plugin name, pricing service, date, forecast and subset
+        of service environments (None means all service environments).
+        """
+        if service_environments is not None:
+            service_environments = frozenset(get_ids(service_environments))
+        return (
+            self.func_name,
+            pricing_service.id,
+            date,
+            forecast,
+            service_environments,
+        )
+
     def _get_excluded_services(self, pricing_service):
         """
         Return all excluded services for pricing services (services, on which
@@ -149,39 +187,62 @@ class PricingServiceBasePlugin(BaseCostPlugin):
             add_costs(se_costs, result)
         return result
 
-    def _add_hierarchy_costs(self, po, po_usages, hierarchy, depth=0):
+    def _get_share(self, po_usages, total_usages, percentage):
         """
-        For every record in hierarchy, add record to result with cost
-        proportional to pricing object usage of pricing service resource.
+        Returns share of pricing object in pricing service costs (sum of its
+        usages shares in total usages, weighted by usage types percentage).
         """
-        subresult = []
-        for base_usage, (cost, children) in hierarchy.items():
-            base_usage_result = {
-                'type_id': base_usage,
-                'pricing_object_id': po,
-                'cost': D(0),
-            }
-            for usage, total, percent in po_usages:
-                if total != 0:
-                    base_usage_result['cost'] += (
-                        D(cost) * (D(usage) / D(total)) * (D(percent) / 100)
-                    )
-                else:
-                    base_usage_result['cost'] = D(0)
-            # add value if there is only one usage type defined for pricing
-            # service and depth is 0 (whole pricing service level)
-            if len(po_usages) == 1 and depth == 0:
-                base_usage_result['value'] = po_usages[0][0]
+        share = D(0)
+        for usage, total, percent in zip(po_usages, total_usages, percentage):
+            # usage types without any usage are skipped
+            if total != 0:
+                share += (D(usage) / D(total)) * (D(percent) / 100)
+        return share
 
+    def _add_hierarchy_costs(
+        self,
+        pricing_objects,
+        usages,
+        shares,
+        hierarchy,
+        depth=0,
+    ):
+        """
+        For every record in hierarchy, add record to result of every pricing
+        object with cost proportional to pricing object usage of pricing
+        service resource (its share). Cost of record is allocated between
+        pricing objects, so sum of their costs is exactly equal to distributed
+        cost of record.
+
+        :returns: list of costs (list of CostNodes) of every pricing object
+        """
+        result = [[] for po in pricing_objects]
+        total_share = sum(shares)
+        for base_usage, (cost, children) in hierarchy.items():
+            costs = allocate(D(cost) * total_share, shares)
+            children_costs = None
             if children and not settings.SAVE_ONLY_FIRST_DEPTH_COSTS:
-                base_usage_result['_children'] = self._add_hierarchy_costs(
-                    po,
-                    po_usages,
+                children_costs = self._add_hierarchy_costs(
+                    pricing_objects,
+                    usages,
+                    shares,
                     children,
                     depth+1,
                 )
-            subresult.append(base_usage_result)
-        return subresult
+            for i, po in enumerate(pricing_objects):
+                base_usage_result = CostNode(
+                    type_id=base_usage,
+                    pricing_object_id=po,
+                    cost=costs[i],
+                )
+                # add value if there is only one usage type defined for
+                # pricing service and depth is 0 (whole pricing service level)
+                if len(usages[i]) == 1 and depth == 0:
+                    base_usage_result.value = usages[i][0]
+                if children_costs is not None:
+                    base_usage_result.children = children_costs[i]
+                result[i].append(base_usage_result)
+        return result
 
     def _distribute_costs(
         self,
@@ -239,27 +300,30 @@ class PricingServiceBasePlugin(BaseCostPlugin):
                 ...
             }
         """
-        usages = defaultdict(list)
+        service_usage_types = list(service_usage_types)
+        usages = defaultdict(lambda: [0] * len(service_usage_types))
         total_usages = []
         percentage = []
         result = defaultdict(list)
         self.pricing_service = pricing_service
 
-        for service_usage_type in service_usage_types:
+        for i, service_usage_type in enumerate(service_usage_types):
             service_excluded = excluded_services.union(
                 service_usage_type.usage_type.excluded_services.all()
             )
-            usages_per_po = self._get_usages_per_pricing_object(
+            usages_per_po = defaultdict(int)
+            for usage in self._get_usages_per_pricing_object(
                 usage_type=service_usage_type.usage_type,
                 date=date,
                 service_environments=service_environments,
                 excluded_services=service_excluded,
-            ).values_list(
-                'daily_pricing_object__pricing_object',
-                'service_environment',
-            ).annotate(usage=Sum('value'))
-            for pricing_object, se, usage in usages_per_po:
-                usages[(pricing_object, se)].append(usage)
+            ):
+                usages_per_po[(
+                    usage.pricing_object_id,
+                    usage.service_environment_id,
+                )] += usage.value
+            for (pricing_object, se), usage in usages_per_po.items():
+                usages[(pricing_object, se)][i] = usage
 
             total_usages.append(self._get_total_usage(
                 usage_type=service_usage_type.usage_type,
@@ -267,14 +331,48 @@ class PricingServiceBasePlugin(BaseCostPlugin):
                 excluded_services=service_excluded,
             ))
             percentage.append(service_usage_type.percent)
-        # create hierarchy basing on usages
-        for (po, se), po_usages in usages.items():
-            po_usages_info = zip(po_usages, total_usages, percentage)
-            result[se].extend(
-                self._add_hierarchy_costs(po, po_usages_info, costs_hierarchy)
+        keys = usages.keys()
+        pricing_objects = [po for po, se in keys]
+        po_usages = [usages[key] for key in keys]
+        if self._use_numpy_engine():
+            po_costs = distribution.distribute_costs(
+                costs_hierarchy,
+                pricing_objects,
+                po_usages,
+                total_usages,
+                percentage,
+                first_depth_only=settings.SAVE_ONLY_FIRST_DEPTH_COSTS,
+            )
+        else:
+            # create hierarchy basing on usages
+            shares = [
+                self._get_share(u, total_usages, percentage)
+                for u in po_usages
+            ]
+            po_costs = self._add_hierarchy_costs(
+                pricing_objects,
+                po_usages,
+                shares,
+                costs_hierarchy,
             )
+        for (po, se), costs in zip(keys, po_costs):
+            result[se].extend(costs)
         return result
 
+    def _use_numpy_engine(self):
+        """
+        Returns True if costs should be distributed using NumPy engine (see
+        `COSTS_DISTRIBUTION_ENGINE` setting).
+        """
+        if settings.COSTS_DISTRIBUTION_ENGINE != 'numpy':
+            return False
+        if not distribution.is_available():
+            logger.warning(
+                'NumPy is not installed - using python costs distribution'
+            )
+            return False
+        return True
+
     @memoize(skip_first=True)
     def _costs(
         self,
@@ -286,13 +384,24 @@ class PricingServiceBasePlugin(BaseCostPlugin):
         """
         Calculate total cost for pricing service (which is total cost of all
         pricing object in services associated with this pricing service).
+
+        If snapshot for date is active, costs are calculated only once and
+        cached in snapshot.
         """
+        snapshot = DailySnapshot.get_active(date)
+        key = self._get_cache_key(pricing_service, date, forecast)
+        if snapshot:
+            cached_costs = snapshot.get_pricing_service_costs(key)
+            if cached_costs is not None:
+                return cached_costs
         costs = self._get_pricing_service_costs(
             date,
             pricing_service,
             forecast,
             service_environments=pricing_service.service_environments,
         )
+        if snapshot:
+            snapshot.set_pricing_service_costs(key, costs)
         return costs
 
     def _get_pricing_service_costs(
@@ -528,11 +637,17 @@ class PricingServiceBasePlugin(BaseCostPlugin):
         Calculates cost of dependent services used by pricing_service.
         """
         result = {}
-        exclude = [pricing_service]
-        dependent_services = pricing_service.get_dependent_services(
-            date,
-            exclude,
-        )
+        snapshot = DailySnapshot.get_active(date)
+        if snapshot:
+            dependent_services = snapshot.get_dependent_services(
+                pricing_service
+            )
+        else:
+            exclude = [pricing_service]
+            dependent_services = pricing_service.get_dependent_services(
+                date,
+                exclude,
+            )
         for dependent in dependent_services:
             try:
                 dependent_cost = plugin_runner.run(
@@ -632,6 +747,13 @@ class PricingServiceBasePlugin(BaseCostPlugin):
         Calculates total cost of diffs (between real and calculated costs) of
         selected pricing services.
 
+        Pricing services using universal plugin are skipped - their costs are
+        allocated exactly (see `_add_hierarchy_costs`), so there is no
+        difference between real and calculated costs. Real cost of other
+        pricing services is total cost of pricing service (`_costs`), which
+        is calculated once per day (and cached in snapshot), so plugin doesn't
+        have to be run again to calculate it.
+
         :param pricing_service: day for which calculate extra costss
         :returns: dict with difference between real and calculated by specific
             pricing service plugin, grouped by pricing service id (key is
@@ -640,27 +762,21 @@ class PricingServiceBasePlugin(BaseCostPlugin):
         """
         result = {}
         for ps in pricing_service.charged_by_diffs.all():
-            args = dict(
-                type='total_cost',
-                pricing_service=ps,
-                for_all_service_environments=True,
-                service_environments=None,
-                **kwargs
-            )
+            if ps.get_plugin_name() == 'pricing_service_plugin':
+                continue
             try:
                 # first run valid pricing service plugin to get "offical" costs
                 ps_cost = plugin_runner.run(
                     'scrooge_costs',
                     ps.get_plugin_name(),
-                    **args
-                )
-
-                # then call universal plugin to get real cost
-                ps_real_cost = plugin_runner.run(
-                    'scrooge_costs',
-                    'pricing_service_plugin',
-                    **args
+                    type='total_cost',
+                    pricing_service=ps,
+                    for_all_service_environments=True,
+                    service_environments=None,
+                    **kwargs
                 )
+                # then get real (total) cost of pricing service
+                ps_real_cost = self._costs(pricing_service=ps, **kwargs)
             except (KeyError, AttributeError):
                 logger.warning(
                     'Invalid call for {0} total cost diff'.format(
@@ -13,6 +13,7 @@ from ralph.util import plugin as plugin_runner
 from ralph_scrooge.plugins.base import register
 from ralph_scrooge.plugins.cost.collector import Collector
 from ralph_scrooge.plugins.cost.pricing_service import PricingServiceBasePlugin
+from ralph_scrooge.utils.cost_tree import CostNode
 
 logger = logging.getLogger(__name__)
 
@@ -69,18 +70,17 @@ class PricingServiceFixedPricePlugin(PricingServiceBasePlugin):
                     for cost in se_costs:
                         pricing_object_id = cost.get('pricing_object_id')
                         if pricing_object_id not in result_dict[se]:
-                            result_dict[se][pricing_object_id] = {
-                                'type_id': pricing_service.id,
-                                'pricing_object_id': pricing_object_id,
-                                'cost': D(0),
-                                '_children': [],
-                            }
-                        result_dict[se][pricing_object_id]['_children'].append(
-                            cost
-                        )
-                        result_dict[se][pricing_object_id]['cost'] += (
-                            cost['cost']
-                        )
+                            result_dict[se][pricing_object_id] = CostNode(
+                                type_id=pricing_service.id,
+                                pricing_object_id=pricing_object_id,
+                                cost=D(0),
+                                children=[],
+                            )
+                        pricing_object_cost = result_dict[se][
+                            pricing_object_id
+                        ]
+                        pricing_object_cost.children.append(cost)
+                        pricing_object_cost.cost += cost['cost']
             except (KeyError, AttributeError):
                 logger.warning(
                     'Invalid call for {0} total cost'.format(usage_type.name)
@@ -0,0 +1,317 @@
+# -*- coding: utf-8 -*-
+"""
+Snapshot of pricing inputs for single day.
+
+Snapshot loads (in few bulk queries) all daily usages, usage prices, team costs
+and daily pricing objects for a day (usage prices could be also taken from
+price book loaded once for many days - see `PriceBook`). While snapshot is
+active (see `DailySnapshot.activate`), cost plugins use it instead of querying
+database for every usage type, pricing service or team separately
+(aggregations are then done in Python).
+
+Snapshot is also a cache of pricing services costs hierarchies and teams
+shares calculated for a day (together with pricing services dependencies
+graph).
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import logging
+from collections import defaultdict, namedtuple
+
+from ralph_scrooge.models import (
+    DailyPricingObject,
+    DailyUsage,
+    PricingService,
+    TeamCost,
+    TeamServiceEnvironmentPercent,
+)
+from ralph_scrooge.plugins.cost.price_book import PriceBook, get_id
+
+logger = logging.getLogger(__name__)
+
+
+UsageRecord = namedtuple(
+    'UsageRecord',
+    [
+        'type_id',
+        'service_environment_id',
+        'service_id',
+        'pricing_object_id',
+        'warehouse_id',
+        'value',
+    ]
+)
+USAGE_RECORD_FIELDS = (
+    'type',
+    'service_environment',
+    'service_environment__service',
+    'daily_pricing_object__pricing_object',
+    'warehouse',
+    'value',
+)
+
+
+def get_ids(objects):
+    """
+    Returns set of ids of objects or None if objects are None.
+    """
+    if objects is None:
+        return None
+    return set(get_id(obj) for obj in objects)
+
+
+class DailySnapshot(object):
+    """
+    Date-scoped, in-memory snapshot of pricing inputs shared by all cost
+    plugins.
+    """
+    _active = {}
+
+    def __init__(self, date, price_book=None):
+        self.date = date
+        self._dependent_services = None
+        self._pricing_services_costs = {}
+        self._teams_shares = {}
+        self._load_usages()
+        self.price_book = price_book or PriceBook(start=date, end=date)
+        self._load_team_costs()
+        self._load_daily_pricing_objects()
+
+    def __enter__(self):
+        self.activate()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.deactivate()
+
+    @classmethod
+    def get_active(cls, date):
+        """
+        Returns active snapshot for date or None if there is no such snapshot.
+        """
+        return cls._active.get(date)
+
+    def activate(self):
+        DailySnapshot._active[self.date] = self
+
+    def deactivate(self):
+        if DailySnapshot._active.get(self.date) is self:
+            del DailySnapshot._active[self.date]
+
+    # LOADING
+    def _load_usages(self):
+        self._usages = defaultdict(list)
+        daily_usages = DailyUsage.objects.filter(
+            date=self.date,
+        ).values_list(*USAGE_RECORD_FIELDS)
+        for usage in map(UsageRecord._make, daily_usages):
+            self._usages[usage.type_id].append(usage)
+
+    def _load_team_costs(self):
+        self._team_costs = defaultdict(list)
+        self._team_costs_percentage = defaultdict(dict)
+        team_costs = TeamCost.objects.filter(
+            start__lte=self.date,
+            end__gte=self.date,
+        )
+        for team_cost in team_costs:
+            self._team_costs[team_cost.team_id].append(team_cost)
+        percentage = TeamServiceEnvironmentPercent.objects.filter(
+            team_cost__start__lte=self.date,
+            team_cost__end__gte=self.date,
+        ).values_list('team_cost', 'service_environment', 'percent')
+        for team_cost_id, service_environment_id, percent in percentage:
+            self._team_costs_percentage[team_cost_id][
+                service_environment_id
+            ] = percent
+
+    def _load_daily_pricing_objects(self):
+        self._pricing_objects_count = defaultdict(lambda: defaultdict(int))
+        daily_pricing_objects = DailyPricingObject.objects.filter(
+            date=self.date,
+        ).values_list('service_environment', 'pricing_object__type')
+        for service_environment_id, type_id in daily_pricing_objects:
+            self._pricing_objects_count[type_id][service_environment_id] += 1
+
+    # USAGES
+    def get_usages(
+        self,
+        usage_type,
+        date=None,
+        start=None,
+        end=None,
+        warehouse=None,
+        service_environments=None,
+        excluded_services=None,
+        excluded_services_environments=None,
+    ):
+        """
+        Returns list of usages (UsageRecord) of usage type. Params are
+        equivalent of `BaseCostPlugin._get_daily_usages_in_period` params.
+        """
+        usages = self._usages.get(get_id(usage_type), [])
+        if warehouse:
+            warehouse_id = get_id(warehouse)
+            usages = [u for u in usages if u.warehouse_id == warehouse_id]
+        if service_environments is not None:
+            service_environments_ids = get_ids(service_environments)
+            usages = [
+                u for u in usages
+                if u.service_environment_id in service_environments_ids
+            ]
+        if excluded_services:
+            excluded_services_ids = get_ids(excluded_services)
+            usages = [
+                u for u in usages if u.service_id not in excluded_services_ids
+            ]
+        if excluded_services_environments:
+            excluded_services_environments_ids = get_ids(
+                excluded_services_environments
+            )
+            usages = [
+                u for u in usages if u.service_environment_id not in
+                excluded_services_environments_ids
+            ]
+        return usages
+
+    def get_total_usage(self, *args, **kwargs):
+        """
+        Returns sum of usages of usage type (see `get_usages` for params).
+        """
+        return sum(u.value for u in self.get_usages(*args, **kwargs))
+
+    def get_usages_per_service_environment(self, *args, **kwargs):
+        """
+        Returns dict with sum of usages (of usage type) per service
+        environment (see `get_usages` for params).
+        """
+        result = defaultdict(int)
+        for usage in self.get_usages(*args, **kwargs):
+            result[usage.service_environment_id] += usage.value
+        return result
+
+    def get_usages_per_service(self, *args, **kwargs):
+        """
+        Returns dict with sum of usages (of usage type) per service (see
+        `get_usages` for params).
+        """
+        result = defaultdict(int)
+        for usage in self.get_usages(*args, **kwargs):
+            result[usage.service_id] += usage.value
+        return result
+
+    # PRICES
+    def get_usage_prices(self, usage_type, warehouse=None):
+        """
+        Returns list of usage prices of usage type defined for snapshot date
+        (optionally only for single warehouse).
+        """
+        return self.price_book.get_usage_prices(
+            usage_type,
+            self.date,
+            warehouse=warehouse,
+        )
+
+    # TEAMS
+    def get_team_costs(self, team):
+        """
+        Returns list of team costs of team defined for snapshot date.
+        """
+        return self._team_costs.get(get_id(team), [])
+
+    def get_teams_shares(self, key):
+        """
+        Returns cache of calculated teams shares (dict with team id as key) or
+        None if it wasn't created yet. Key should identify forecast and subset
+        of service environments.
+        """
+        return self._teams_shares.get(key)
+
+    def set_teams_shares(self, key, shares):
+        """
+        Saves cache of teams shares.
+        """
+        self._teams_shares[key] = shares
+
+    def get_team_cost_percentage(self, team_cost):
+        """
+        Returns percentage division of team cost between service environments
+        (dict with service environment id as key and percent as value).
+        """
+        return dict(self._team_costs_percentage.get(get_id(team_cost), {}))
+
+    # PRICING OBJECTS
+    def get_pricing_objects_count_per_service_environment(
+        self,
+        pricing_object_type,
+    ):
+        """
+        Returns count of daily pricing objects of given type per service
+        environment.
+        """
+        return dict(
+            self._pricing_objects_count.get(get_id(pricing_object_type), {})
+        )
+
+    # PRICING SERVICES
+    def get_dependent_services(self, pricing_service):
+        """
+        Returns list of pricing services, which resources are used by
+        pricing service (see `PricingService.get_dependent_services`).
+
+        Dependencies graph is built once (on first call) for all pricing
+        services.
+        """
+        if self._dependent_services is None:
+            self._dependent_services = {
+                ps.id: list(ps.get_dependent_services(self.date))
+                for ps in PricingService.objects.all()
+            }
+        return self._dependent_services.get(get_id(pricing_service), [])
+
+    def get_pricing_services_in_dependency_order(self):
+        """
+        Returns list of pricing services sorted topologically by dependencies -
+        every pricing service is placed after pricing services on which it
+        depends (cycles are broken at first repeated pricing service).
+        """
+        result = []
+        visited = set()
+
+        def visit(pricing_service, path):
+            if pricing_service.id in visited:
+                return
+            if pricing_service.id in path:
+                logger.warning(
+                    'Cycle in pricing services dependencies: {}'.format(
+                        pricing_service.name
+                    )
+                )
+                return
+            path.add(pricing_service.id)
+            for dependent in self.get_dependent_services(pricing_service):
+                visit(dependent, path)
+            path.remove(pricing_service.id)
+            visited.add(pricing_service.id)
+            result.append(pricing_service)
+
+        for pricing_service in PricingService.objects.order_by('id'):
+            visit(pricing_service, set())
+        return result
+
+    def get_pricing_service_costs(self, key):
+        """
+        Returns cached costs hierarchy of pricing service or None if costs
+        were not calculated yet. Key should identify plugin, pricing service,
+        forecast and subset of service environments.
+        """
+        return self._pricing_services_costs.get(key)
+
+    def set_pricing_service_costs(self, key, costs):
+        """
+        Saves costs hierarchy of pricing service in cache.
+        """
+        self._pricing_services_costs[key] = costs
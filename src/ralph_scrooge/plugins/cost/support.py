@@ -11,6 +11,7 @@ from collections import defaultdict, namedtuple
 from ralph_scrooge.models import ExtraCostType, SupportCost
 from ralph_scrooge.plugins.base import register
 from ralph_scrooge.plugins.cost.base import BaseCostPlugin
+from ralph_scrooge.utils.cost_tree import CostNode
 
 logger = logging.getLogger(__name__)
 
@@ -80,11 +81,9 @@ class SupportPlugin(BaseCostPlugin):
         )
         for support in map(SupportRecord._make, list(supports)):
             cost = support.forecast_cost if forecast else support.cost
-            usages[support.service_environment_id].append({
-                'cost': (cost / (
-                    (support.end - support.start).days + 1)
-                ),
-                'type': support_type,
-                'pricing_object_id': support.pricing_object_id
-            })
+            usages[support.service_environment_id].append(CostNode(
+                type_id=support_type.id,
+                cost=cost / ((support.end - support.start).days + 1),
+                pricing_object_id=support.pricing_object_id,
+            ))
         return usages
@@ -43,12 +43,20 @@ parts of cost for other teams.
 * Average
 This model is using other teams and use average of percent of other teams costs
 distribution between service environments.
+
+For every team, shares of service environments in team cost are calculated
+first (see `_get_team_shares`) and then daily cost of team is distributed
+according to them. Shares don't depend on team cost, so distributed and
+average teams are using shares of other teams directly. While snapshot for
+date is active (as while collecting costs), shares of every team are
+calculated only once for all teams.
 """
 from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
 
+import itertools
 import logging
 from collections import defaultdict
 from decimal import Decimal as D
@@ -72,48 +80,52 @@ from ralph_scrooge.plugins.cost.base import (
     NoPriceCostError,
     MultiplePriceCostError,
 )
+from ralph_scrooge.plugins.cost.distribution import allocate
+from ralph_scrooge.plugins.cost.snapshot import (
+    DailySnapshot,
+    get_id,
+    get_ids,
+)
+from ralph_scrooge.utils.cost_tree import CostNode
 
 logger = logging.getLogger(__name__)
 PERCENT_PRECISION = 4
+TEAM_BILLING_TYPES = (
+    TeamBillingType.time,
+    TeamBillingType.distribute,
+    TeamBillingType.assets_cores,
+    TeamBillingType.assets,
+    TeamBillingType.average,
+)
 
 
 @register(chain='scrooge_costs')
 class TeamPlugin(BaseCostPlugin):
-    def costs(self, team, **kwargs):
+    def costs(
+        self,
+        team,
+        date,
+        service_environments,
+        forecast=False,
+        **kwargs
+    ):
         """
         Calculates teams costs.
         """
         logger.info("Calculating team costs: {0}".format(team.name))
-        return self._get_team_cost_per_service_environment(team, **kwargs)
-
-    def _get_team_cost_per_service_environment(self, team, *args, **kwargs):
-        """
-        Call proper function to calculate team cost, based on team billing type
-        """
-        functions = {
-            TeamBillingType.time: (
-                self._get_team_time_cost_per_service_environment
-            ),
-            TeamBillingType.distribute: (
-                self._get_team_distributed_cost_per_service_environment
-            ),
-            TeamBillingType.assets_cores: (
-                self._get_team_assets_cores_cost_per_service_environment
-            ),
-            TeamBillingType.assets: (
-                self._get_team_assets_cost_per_service_environment
-            ),
-            TeamBillingType.average: (
-                self._get_team_average_cost_per_service_environment
-            ),
-        }
-        func = functions.get(team.billing_type)
-        if func:
-            return func(team=team, *args, **kwargs)
-        logger.warning('No handle method for billing type {0}'.format(
-            team.billing_type
-        ))
-        return {}
+        if team.billing_type not in TEAM_BILLING_TYPES:
+            logger.warning('No handle method for billing type {0}'.format(
+                team.billing_type
+            ))
+            return {}
+        daily_cost, shares = self._get_team_shares(
+            team,
+            date,
+            service_environments,
+            forecast,
+            self._get_teams_shares_cache(date, service_environments, forecast),
+        )
+        return self._get_costs_from_shares(team, daily_cost, shares)
 
     @memoize(skip_first=True)
     def _get_teams(self):
@@ -150,17 +162,85 @@ class TeamPlugin(BaseCostPlugin):
 
         :rtype: dict (key: team id, value: members count)
         """
-        team_costs = TeamCost.objects.filter(
-            start__lte=date,
-            end__gte=date,
-            team__in=teams,
-        )
+        snapshot = DailySnapshot.get_active(date)
+        if snapshot:
+            team_costs = itertools.chain.from_iterable(
+                snapshot.get_team_costs(team) for team in teams
+            )
+        else:
+            team_costs = TeamCost.objects.filter(
+                start__lte=date,
+                end__gte=date,
+                team__in=teams,
+            )
         result = {}
         for team_cost in team_costs:
-            result[team_cost.team.id] = team_cost.members_count
+            result[team_cost.team_id] = team_cost.members_count
         return result
 
     @memoize(skip_first=True)
+    def _get_assets_counts(self, date):
+        """
+        Returns count of assets per service environment for date (calculated
+        once for date in single grouped query or taken from snapshot).
+
+        :rtype: dict (key: service_environment, value: assets count)
+        """
+        snapshot = DailySnapshot.get_active(date)
+        if snapshot:
+            counts = (
+                snapshot.get_pricing_objects_count_per_service_environment(
+                    PRICING_OBJECT_TYPES.ASSET
+                )
+            )
+        else:
+            counts = DailyPricingObject.objects.filter(
+                date=date,
+                pricing_object__type=PRICING_OBJECT_TYPES.ASSET,
+            ).values('service_environment').annotate(count=Count('id'))
+            counts = dict([
+                (dc['service_environment'], dc['count']) for dc in counts
+            ])
+        counts.pop(None, None)
+        return counts
+
+    @memoize(skip_first=True)
+    def _get_cores_counts(self, date):
+        """
+        Returns count of cores per service environment for date (calculated
+        once for date in single grouped query or taken from snapshot).
+
+        :rtype: dict (key: service_environment, value: cores count)
+        """
+        snapshot = DailySnapshot.get_active(date)
+        if snapshot:
+            counts = dict(snapshot.get_usages_per_service_environment(
+                self._get_cores_usage_type(),
+            ))
+        else:
+            counts = DailyUsage.objects.filter(
+                type=self._get_cores_usage_type(),
+                date=date,
+            ).values('service_environment').annotate(count=Sum('value'))
+            counts = dict([
+                (cc['service_environment'], cc['count']) for cc in counts
+            ])
+        counts.pop(None, None)
+        return counts
+
+    def _get_count_by_service_environment(self, counts, service_environments):
+        service_environments_ids = get_ids(service_environments)
+        return dict([
+            (se, count) for se, count in counts.items()
+            if se in service_environments_ids
+        ])
+
+    def _get_total_count(self, counts, excluded_service_environments):
+        excluded_ids = get_ids(excluded_service_environments) or set()
+        return sum(counts.values()) - sum(
+            counts.get(se, 0) for se in excluded_ids
+        )
+
     def _get_assets_count_by_service_environment(
         self,
         date,
@@ -173,20 +253,11 @@ class TeamPlugin(BaseCostPlugin):
 
         :rtype: dict (key: service_environment, value: assets count)
         """
-        assets_query = DailyPricingObject.objects.filter(
-            date=date,
-            service_environment__in=service_environments,
-            pricing_object__type=PRICING_OBJECT_TYPES.ASSET,
-        )
-        count = assets_query.values('service_environment').annotate(
-            count=Count('id')
+        return self._get_count_by_service_environment(
+            self._get_assets_counts(date),
+            service_environments,
         )
-        result = dict([
-            (dc['service_environment'], dc['count']) for dc in count
-        ])
-        return result
 
-    @memoize(skip_first=True)
     def _get_total_assets_count(
         self,
         date,
@@ -198,16 +269,12 @@ class TeamPlugin(BaseCostPlugin):
 
         :rtype: int
         """
-        assets_query = DailyPricingObject.objects.filter(
-            date=date,
-            pricing_object__type=PRICING_OBJECT_TYPES.ASSET,
-        ).exclude(
-            service_environment__isnull=True
-        ).exclude(
-            service_environment__in=excluded_service_environments,
+        return self._get_total_count(
+            self._get_assets_counts(date),
+            excluded_service_environments,
         )
-        return assets_query.aggregate(count=Count('id')).get('count', 0)
 
+    @memoize(skip_first=True)
     def _get_cores_usage_type(self):
         """
         Physical CPU cores usage type definition
@@ -216,7 +283,6 @@ class TeamPlugin(BaseCostPlugin):
             symbol="physical_cpu_cores",
         )[0]
 
-    @memoize(skip_first=True)
     def _get_cores_count_by_service_environment(
         self,
         date,
@@ -229,20 +295,11 @@ class TeamPlugin(BaseCostPlugin):
 
         :rtype: dict (key: service_environment, value: cores count)
         """
-        cores_query = DailyUsage.objects.filter(
-            type=self._get_cores_usage_type(),
-            date=date,
-            service_environment__in=service_environments
-        )
-        count = cores_query.values('service_environment').annotate(
-            count=Sum('value')
+        return self._get_count_by_service_environment(
+            self._get_cores_counts(date),
+            service_environments,
         )
-        result = dict([
-            (cc['service_environment'], cc['count']) for cc in count
-        ])
-        return result
 
-    @memoize(skip_first=True)
     def _get_total_cores_count(
         self,
         date,
@@ -254,146 +311,215 @@ class TeamPlugin(BaseCostPlugin):
 
         :rtype: int
         """
-        cores_query = DailyUsage.objects.filter(
-            type=self._get_cores_usage_type(),
-            date=date,
-        ).exclude(
-            service_environment__isnull=True
-        ).exclude(
-            service_environment__in=excluded_service_environments,
+        return self._get_total_count(
+            self._get_cores_counts(date),
+            excluded_service_environments,
         )
-        return cores_query.aggregate(
-            cores_count=Sum('value')
-        ).get('cores_count', 0)
-
-    def _get_team_daily_cost(self, team, date, forecast, daily_cost=None):
-        try:
-            team_cost = team.teamcost_set.get(start__lte=date, end__gte=date)
-        except TeamCost.DoesNotExist:
-            raise NoPriceCostError()
-        except TeamCost.MultipleObjectsReturned:
-            raise MultiplePriceCostError()
-
-        # calculate daily cost if not provided
+
+    def _get_team_daily_cost(self, team, date, forecast):
+        snapshot = DailySnapshot.get_active(date)
+        if snapshot:
+            team_costs = snapshot.get_team_costs(team)
+            if not team_costs:
+                raise NoPriceCostError()
+            if len(team_costs) > 1:
+                raise MultiplePriceCostError()
+            team_cost = team_costs[0]
+        else:
+            try:
+                team_cost = team.teamcost_set.get(
+                    start__lte=date,
+                    end__gte=date,
+                )
+            except TeamCost.DoesNotExist:
+                raise NoPriceCostError()
+            except TeamCost.MultipleObjectsReturned:
+                raise MultiplePriceCostError()
+
         team_cost_days = (team_cost.end - team_cost.start).days + 1
-        if not daily_cost:
-            cost = team_cost.forecast_cost if forecast else team_cost.cost
-            daily_cost = cost / team_cost_days
+        cost = team_cost.forecast_cost if forecast else team_cost.cost
+        daily_cost = cost / team_cost_days
 
         return team_cost_days, daily_cost, team_cost
 
+    @memoize(skip_first=True)
+    def _get_teams_excluded_service_environments(self):
+        """
+        Returns service environments of services excluded from every team
+        (fetched in single query for all teams).
+
+        :rtype: dict (key: team id, value: set of service environments ids)
+        """
+        result = defaultdict(set)
+        excluded = ServiceEnvironment.objects.filter(
+            service__excluded_teams__isnull=False,
+        ).values_list('service__excluded_teams', 'id')
+        for team_id, service_environment_id in excluded:
+            result[team_id].add(service_environment_id)
+        return dict(result)
+
+    def _get_excluded_service_environments(self, team):
+        """
+        Returns set of ids of service environments excluded from team.
+        """
+        return self._get_teams_excluded_service_environments().get(
+            team.id,
+            set(),
+        )
+
     def _exclude_service_environments(self, team, service_environments):
-        if team.excluded_services.count():
-            service_environments = list(set(service_environments) - set(
-                ServiceEnvironment.objects.filter(
-                    service__in=team.excluded_services.all()
+        excluded_ids = self._get_excluded_service_environments(team)
+        return [
+            se for se in service_environments
+            if get_id(se) not in excluded_ids
+        ]
+
+    def _get_teams_shares_cache(self, date, service_environments, forecast):
+        """
+        Returns dict in which calculated shares of teams are stored (for
+        date, forecast and service environments). If snapshot for date is
+        active, cache is kept in snapshot, so shares of every team are
+        calculated only once for all teams (including distributed and average
+        teams, which are using shares of other teams).
+        """
+        snapshot = DailySnapshot.get_active(date)
+        if not snapshot:
+            return {}
+        key = (forecast, frozenset(get_ids(service_environments)))
+        cache = snapshot.get_teams_shares(key)
+        if cache is None:
+            cache = {}
+            snapshot.set_teams_shares(key, cache)
+        return cache
+
+    def _get_team_shares(
+        self,
+        team,
+        date,
+        service_environments,
+        forecast,
+        cache,
+    ):
+        """
+        Returns tuple (daily cost of team, shares of service environments in
+        team cost). Result (or error raised during calculation) is saved in
+        cache.
+
+        :param dict cache: calculated shares of teams (see
+            `_get_teams_shares_cache`)
+        :rtype: tuple (Decimal, dict (key: service environment id, value:
+            share))
+        """
+        if team.id not in cache:
+            try:
+                cache[team.id] = self._calculate_team_shares(
+                    team,
+                    date,
+                    service_environments,
+                    forecast,
+                    cache,
                 )
-            ))
-        return service_environments
+            except (NoPriceCostError, MultiplePriceCostError) as e:
+                cache[team.id] = e
+        result = cache[team.id]
+        if isinstance(result, Exception):
+            raise result
+        return result
 
-    def _get_team_time_cost_per_service_environment(
+    def _calculate_team_shares(
         self,
         team,
         date,
         service_environments,
-        forecast=False,
-        daily_cost=None,
-        **kwargs
+        forecast,
+        cache,
     ):
         """
-        Calculates cost of teams, that are billed by spent time for each
-        service environment. If daily_cost is passed, it's used instead of
-        calculated daily cost from total cost.
-
-        Main idea:
-        for every period in which cost is defined for team
-            for every not-overlaping daterange of percent per team
-                calculate cost of team time per service environment in this
-                period of time
-
-        Notice that:
-        * total cost is treated as sum of equal daily cost (assumed, that in
-            period of time daily cost is the same)
-        * assumed, that in period of time percent of time spent to service
-            environment is equal for each day
+        Call proper function to calculate team shares, based on team billing
+        type.
         """
-
-        result = defaultdict(list)
-        service_environments_ids = set([v.id for v in service_environments])
-
+        functions = {
+            TeamBillingType.time: self._get_team_time_shares,
+            TeamBillingType.distribute: self._get_team_distributed_shares,
+            TeamBillingType.assets_cores: self._get_team_assets_cores_shares,
+            TeamBillingType.assets: self._get_team_assets_shares,
+            TeamBillingType.average: self._get_team_average_shares,
+        }
         team_cost_days, daily_cost, team_cost = self._get_team_daily_cost(
             team,
             date,
             forecast,
-            daily_cost,
         )
+        shares = functions[team.billing_type](
+            team=team,
+            team_cost=team_cost,
+            date=date,
+            service_environments=service_environments,
+            forecast=forecast,
+            cache=cache,
+        )
+        return daily_cost, shares
 
-        percentage = dict(team_cost.percentage.values_list(
-            'service_environment__id',
-            'percent',
-        ))
-        for service_environment, percent in percentage.items():
-            if service_environment in service_environments_ids:
-                result[service_environment].append({
-                    'cost': D(daily_cost) * D(percent) / 100,
-                    'type': team,
-                    'percent': D(percent) / 100,
-                })
+    def _get_team_time_shares(
+        self,
+        team_cost,
+        date,
+        service_environments,
+        **kwargs
+    ):
+        """
+        Calculates shares of service environments in cost of team, that is
+        billed by spent time for each service environment.
 
-        return result
+        Notice that:
+        * assumed, that in period of time percent of time spent to service
+            environment is equal for each day
+        """
+        service_environments_ids = get_ids(service_environments)
+        snapshot = DailySnapshot.get_active(date)
+        if snapshot:
+            percentage = snapshot.get_team_cost_percentage(team_cost)
+        else:
+            percentage = dict(team_cost.percentage.values_list(
+                'service_environment__id',
+                'percent',
+            ))
+        return dict([
+            (se, D(percent) / 100) for se, percent in percentage.items()
+            if se in service_environments_ids
+        ])
 
-    def _get_team_func_cost_per_service_environment(
+    def _get_team_func_shares(
         self,
         team,
         date,
         service_environments,
-        forecast=False,
-        daily_cost=None,
         funcs=None,
         **kwargs
     ):
         """
-        Calculates cost of used resources (i.e. assets, cores) for each
-        service environment in period of time. If daily_cost is passed, it's
-        used instead of calculated daily cost from total cost.
-
-        Main idea:
-        for every period in which cost is defined for team:
-            calculate daily cost
-            for every resource:
-                get total count of resource usage per service_environment
-                calculate service_environment cost based od cost in period of
-                 time andresource usage
+        Calculates shares of service environments in cost of used resources
+        (i.e. assets, cores) for each service environment.
 
-        Passed functions (funcs) should be 3-elements tuple:
+        Passed functions (funcs) should be 2-elements tuple:
         (
             resource_usage_per_service_environment_function,
             resource_total_usage_function,
-            result_dict_key (to store usages of service_environment)
         ).
 
         Notice that:
         * if there is more than one funcs (resources), that total cost is
             distributed in equal parts to all resources (1/n)
         """
-
-        result = defaultdict(list)
         funcs = funcs or []
         service_environments = self._exclude_service_environments(
             team,
             service_environments
         )
-        excluded_service_environments = ServiceEnvironment.objects.filter(
-            service__in=team.excluded_services.all(),
-        )
-
-        team_cost_days, daily_cost, team_cost = self._get_team_daily_cost(
-            team,
-            date,
-            forecast,
-            daily_cost,
+        excluded_service_environments = (
+            self._get_excluded_service_environments(team)
         )
-        service_environments_costs = defaultdict(D)
+        shares = defaultdict(D)
         for count_func, total_count_func in funcs:
             count_per_service_environment = count_func(
                 date,
@@ -403,33 +529,18 @@ class TeamPlugin(BaseCostPlugin):
                 date,
                 excluded_service_environments=excluded_service_environments,
             )
-            # if there is more than one resource, calculate 1/n of total
-            # cost
-            cost_part = D(daily_cost) / len(funcs)
             for se, count in count_per_service_environment.items():
-                percent = D(count) / D(total) if total else D(0)
-                service_environments_costs[se] += D(cost_part * percent)
+                if total:
+                    shares[se] += D(count) / D(total) / len(funcs)
+                else:
+                    shares[se] += D(0)
+        return dict(shares)
 
-        for service_environment, cost in service_environments_costs.items():
-            result[service_environment].append({
-                'cost': cost,
-                'type': team,
-                'percent': D(cost) / D(daily_cost),
-            })
-
-        return result
-
-    def _get_team_assets_cores_cost_per_service_environment(
-        self,
-        team,
-        *args,
-        **kwargs
-    ):
+    def _get_team_assets_cores_shares(self, *args, **kwargs):
         """
-        Calculates costs of assets and cores usage per service_environment.
+        Calculates shares of service environments in assets and cores usage.
         """
-        return self._get_team_func_cost_per_service_environment(
-            team=team,
+        return self._get_team_func_shares(
             funcs=(
                 (
                     self._get_assets_count_by_service_environment,
@@ -444,17 +555,11 @@ class TeamPlugin(BaseCostPlugin):
             **kwargs
         )
 
-    def _get_team_assets_cost_per_service_environment(
-        self,
-        team,
-        *args,
-        **kwargs
-    ):
+    def _get_team_assets_shares(self, *args, **kwargs):
         """
-        Calculates costs of assets usage per service_environment.
+        Calculates shares of service environments in assets usage.
         """
-        return self._get_team_func_cost_per_service_environment(
-            team=team,
+        return self._get_team_func_shares(
             funcs=(
                 (
                     self._get_assets_count_by_service_environment,
@@ -465,125 +570,88 @@ class TeamPlugin(BaseCostPlugin):
             **kwargs
         )
 
-    def _get_team_distributed_cost_per_service_environment(
+    def _get_team_distributed_shares(
         self,
-        team,
         date,
         service_environments,
-        forecast=False,
+        forecast,
+        cache,
         **kwargs
     ):
         """
-        Calculates cost of team, which cost is based on service_environment
-        cost for other teams (proprotionally to members count of other teams).
-
-        Main idea:
-        for every period on which cost is defined for team
-            for every period of not-distributed teams members count in main
-            period
-                for every not-distributed team
-                    get team members count in period and it's % among all teams
-                    calculate % of distributed team total cost (daily)
-                    calculate cost for this team for all service_environments,
-                    proportionally to team cost (usage)
+        Calculates shares of service environments in cost of team, which cost
+        is based on service_environment cost for other teams (proprotionally
+        to members count of other teams).
 
-        Not distributed team cost is calculated using functions defined for
-        such calculations. First of all, daily cost of distributed team is
-        calculated. Then, based on not distributed team members count, daily
-        cost of that team is calculated (distributed_team_daily_cost *
-        not_distributed_team_members_count / total_members). Then such daily
-        cost is passed to function for not distributed team and used to
-        calculate (part of) cost of distributed team.
+        Share of service environment is sum of its shares in not-distributed
+        teams, weighted by proportion of team members count to total members
+        count of all not-distributed teams.
         """
-
-        result = defaultdict(list)
         teams = self._get_teams_not_distributes_to_others()
         teams_by_id = dict([(t.id, t) for t in teams])
-
-        team_cost_days, daily_cost, team_cost = self._get_team_daily_cost(
-            team,
-            date,
-            forecast,
-        )
         teams_members = self._get_teams_members_count(date, teams)
         total_members = sum(teams_members.values())
 
-        service_environments_costs = defaultdict(D)
-
+        shares = defaultdict(D)
         for team_id, members_count in teams_members.items():
-            dependent_team = teams_by_id[team_id]
-            daily_team_cost = float(daily_cost) * members_count / total_members
-            for sei in self._get_team_cost_per_service_environment(
-                team=dependent_team,
-                date=date,
-                service_environments=service_environments,
-                daily_cost=daily_team_cost,
-                forecast=forecast,
-            ).items():
-                service_environments_costs[sei[0]] += sum(
-                    s['cost'] for s in sei[1]
-                )
-
-        for service_environment, cost in service_environments_costs.items():
-            se_info = {
-                'type': team,
-                'cost': cost,
-                'percent': cost / daily_cost
-            }
-            result[service_environment].append(se_info)
-
-        return result
-
-    def _get_team_average_cost_per_service_environment(
+            dependent_team_shares = self._get_team_shares(
+                teams_by_id[team_id],
+                date,
+                service_environments,
+                forecast,
+                cache,
+            )[1]
+            if total_members:
+                weight = D(members_count) / D(total_members)
+            else:
+                weight = D(0)
+            for se, share in dependent_team_shares.items():
+                shares[se] += share * weight
+        return dict(shares)
+
+    def _get_team_average_shares(
         self,
-        team,
         date,
         service_environments,
-        forecast=False,
+        forecast,
+        cache,
         **kwargs
     ):
         """
-        Calculates team cost according to average of percents of other teams
-        costs per service_environments.
-
-        For every dependent team (every other, that has billing type different
-        than AVERAGE), in period of time for which cost is defined for current
-        team, there are costs and percentage division calculated for such a
-        dependent team. Calculated percentage division is then added to service
-        environment 'counter' and at the end, total cost of current team is
-        distributed according to service_environments 'counters' (of percent).
+        Calculates shares of service environments in team cost according to
+        average of shares of other teams (every other, that has billing type
+        different than AVERAGE).
         """
-        result = defaultdict(list)
         teams = self._get_teams_not_average()
-        team_cost_days, daily_cost, team_cost = self._get_team_daily_cost(
-            team,
-            date,
-            forecast,
-        )
-
-        # calculate costs and percent of other teams per
-        # service_environment
-        service_environment_percent = defaultdict(D)
-        total_percent = len(teams)
-
+        teams_count = len(teams)
+        shares = defaultdict(D)
         for dependent_team in teams:
-            seis = self._get_team_cost_per_service_environment(
-                team=dependent_team,
-                date=date,
-                service_environments=service_environments,
-                forecast=forecast,
-            )
-            for sei in seis.items():
-                se = sei[0]
-                percent = sei[1][0]['percent']
-                service_environment_percent[se] += percent
-        # distribute cost of current team according to calculated percent
-        for se, percent in service_environment_percent.iteritems():
-            percent_scaled = percent / total_percent
-            result[se].append({
-                'cost': daily_cost * percent_scaled,
-                'percent': percent_scaled,
-                'type': team,
-            })
+            dependent_team_shares = self._get_team_shares(
+                dependent_team,
+                date,
+                service_environments,
+                forecast,
+                cache,
+            )[1]
+            for se, share in dependent_team_shares.items():
+                shares[se] += share / teams_count
+        return dict(shares)
 
+    def _get_costs_from_shares(self, team, daily_cost, shares):
+        """
+        Distributes daily cost of team between service environments according
+        to their shares.
+        """
+        result = defaultdict(list)
+        shares = shares.items()
+        costs = allocate(
+            D(daily_cost) * sum(share for se, share in shares),
+            [share for se, share in shares],
+        )
+        for (service_environment, share), cost in zip(shares, costs):
+            result[service_environment].append(CostNode(
+                type_id=team.id,
+                cost=cost,
+                percent=share,
+            ))
         return result
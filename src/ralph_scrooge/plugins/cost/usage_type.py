@@ -16,7 +16,10 @@ from ralph_scrooge.plugins.cost.base import (
     NoPriceCostError,
     MultiplePriceCostError,
 )
+from ralph_scrooge.plugins.cost.distribution import allocate
+from ralph_scrooge.plugins.cost.snapshot import DailySnapshot
 from ralph_scrooge.utils.common import memoize
+from ralph_scrooge.utils.cost_tree import CostNode
 
 
 logger = logging.getLogger(__name__)
@@ -43,18 +46,30 @@ class UsageTypeBasePlugin(BaseCostPlugin):
         :param Warehouse warehouse: warehouse to check
         :returns tuple: total usage for usage price period, price per unit
         """
-        usage_price = usage_type.usageprice_set.filter(
-            end__gte=date,
-            start__lte=date,
-        )
-        if usage_type.by_warehouse and warehouse:
-            usage_price = usage_price.filter(warehouse=warehouse)
-        try:
-            usage_price = usage_price.get()
-        except UsagePrice.DoesNotExist:
-            raise NoPriceCostError()
-        except UsagePrice.MultipleObjectsReturned:
-            raise MultiplePriceCostError()
+        snapshot = DailySnapshot.get_active(date)
+        if snapshot:
+            usage_prices = snapshot.get_usage_prices(
+                usage_type,
+                warehouse=warehouse if usage_type.by_warehouse else None,
+            )
+            if not usage_prices:
+                raise NoPriceCostError()
+            if len(usage_prices) > 1:
+                raise MultiplePriceCostError()
+            usage_price = usage_prices[0]
+        else:
+            usage_price = usage_type.usageprice_set.filter(
+                end__gte=date,
+                start__lte=date,
+            )
+            if usage_type.by_warehouse and warehouse:
+                usage_price = usage_price.filter(warehouse=warehouse)
+            try:
+                usage_price = usage_price.get()
+            except UsagePrice.DoesNotExist:
+                raise NoPriceCostError()
+            except UsagePrice.MultipleObjectsReturned:
+                raise MultiplePriceCostError()
 
         if usage_type.by_cost:
             price = self._get_price_from_cost(
@@ -98,26 +113,28 @@ class UsageTypeBasePlugin(BaseCostPlugin):
                 warehouse=warehouse,
                 excluded_services_environments=excluded_services_envs,
             )
-            usages = self._get_usages_per_pricing_object(
+            usages = list(self._get_usages_per_pricing_object(
                 date=date,
                 usage_type=usage_type,
                 service_environments=service_environments,
                 warehouse=warehouse,
                 excluded_services_environments=excluded_services_envs,
+            ))
+            # total cost of usages is allocated between pricing objects, so
+            # sum of their costs is exactly equal to total cost
+            costs = allocate(
+                sum(D(v.value) for v in usages) * price_per_unit,
+                [v.value for v in usages],
             )
-            for v in usages:
+            for v, cost in zip(usages, costs):
                 service_environment = v.service_environment_id
-                pricing_object_cost = {
-                    'cost': D(v.value) * price_per_unit,
-                    'value': v.value,
-                    'pricing_object_id': (
-                        v.daily_pricing_object.pricing_object_id
-                    ),
-                    'type_id': usage_type.id,
-                }
-                if warehouse:
-                    pricing_object_cost['warehouse'] = warehouse
-                result[service_environment].append(pricing_object_cost)
+                result[service_environment].append(CostNode(
+                    type_id=usage_type.id,
+                    cost=cost,
+                    value=v.value,
+                    pricing_object_id=v.pricing_object_id,
+                    warehouse_id=warehouse.id if warehouse else None,
+                ))
 
         return result
 
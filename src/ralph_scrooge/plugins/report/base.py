@@ -8,11 +8,13 @@ from __future__ import unicode_literals
 import logging
 from collections import OrderedDict, defaultdict
 
-from django.db.models import Sum
 from django.utils.translation import ugettext_lazy as _
 
-from ralph_scrooge.models import DailyCost
 from ralph_scrooge.plugins.base import BasePlugin
+from ralph_scrooge.plugins.report.report_data import (
+    ReportData,
+    get_total_costs,
+)
 
 
 logger = logging.getLogger(__name__)
@@ -66,31 +68,50 @@ class BaseReportPlugin(BasePlugin):
         """
         logger.debug("Get {} usages".format(base_usage))
 
-        daily_costs = DailyCost.objects.filter(
-            date__gte=start,
-            date__lte=end,
-            service_environment__in=service_environments,
-            type=base_usage,
-            forecast=forecast,
-        ).values(
-            'service_environment__id'
-        ).annotate(
-            total_cost=Sum('cost'),
-            total_value=Sum('value'),
-        )
-
         usages = defaultdict(lambda: defaultdict(list))
-        for daily_cost in daily_costs:
+        for se_id, (cost, value) in self._get_total_costs(
+            start,
+            end,
+            base_usage,
+            service_environments,
+            forecast,
+        ).items():
             if self.base_usage_cost_symbol:
-                usages[daily_cost['service_environment__id']][
+                usages[se_id][
                     self.base_usage_cost_symbol.format(base_usage.id)
-                ] = daily_cost['total_cost']
+                ] = cost
             if self.base_usage_count_symbol:
-                usages[daily_cost['service_environment__id']][
+                usages[se_id][
                     self.base_usage_count_symbol.format(base_usage.id)
-                ] = daily_cost['total_value']
+                ] = value
         return usages
 
+    def _get_total_costs(
+        self,
+        start,
+        end,
+        base_usage,
+        service_environments,
+        forecast,
+    ):
+        """
+        Returns total cost and value of base usage per service environment
+        between start and end (taken from active report data, if there is
+        one for this period).
+
+        :returns dict: (cost, value) per service environment id
+        """
+        report_data = ReportData.get_active(start, end, forecast)
+        if report_data:
+            return report_data.get_costs(base_usage)
+        return get_total_costs(
+            start,
+            end,
+            forecast,
+            service_environments,
+            base_usage,
+        ).get(base_usage.id, {})
+
     def schema(self, base_usage, *args, **kwargs):
         schema = OrderedDict()
         if self.base_usage_cost_symbol:
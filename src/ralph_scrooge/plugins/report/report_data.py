@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+"""
+Costs data shared by all report plugins.
+
+Report data loads (in single query grouped by service environment and type)
+total costs and values of every type (usage type, pricing service, team,
+extra cost etc.) in period of report. While report data is active (see
+`ReportData.activate`), report plugins only pick totals of their type from it,
+instead of querying daily costs for every column of report separately.
+
+Totals of whole months are taken from monthly rollup of costs (if it was
+already calculated for month), totals of remaining days are summed from daily
+costs.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import logging
+import operator
+from collections import defaultdict
+
+from django.db.models import Q, Sum
+
+from ralph_scrooge.models import DailyCost, MonthlyCost
+
+logger = logging.getLogger(__name__)
+
+
+def get_id(obj):
+    """
+    Returns id of object (or object itself if it's already id).
+    """
+    return getattr(obj, 'id', obj)
+
+
+def get_total_costs(
+    start,
+    end,
+    forecast=False,
+    service_environments=None,
+    base_usage=None,
+):
+    """
+    Returns total cost and value of every type (or only base usage if it's
+    passed) per service environment between start and end.
+
+    :returns dict: (key: type id, value: dict (key: service environment id,
+        value: tuple (cost, value)))
+    """
+    months, periods = MonthlyCost.split_period(start, end)
+    rolled_up_months = set()
+    if months:
+        rolled_up_months = set(MonthlyCost.objects.filter(
+            month__in=[month_start for month_start, month_end in months],
+            forecast=forecast,
+        ).values_list('month', flat=True).distinct())
+    periods.extend([
+        (month_start, month_end) for month_start, month_end in months
+        if month_start not in rolled_up_months
+    ])
+    filters = {'forecast': forecast}
+    if service_environments is not None:
+        filters['service_environment__in'] = service_environments
+    if base_usage is not None:
+        filters['type'] = base_usage
+    querysets = []
+    if rolled_up_months:
+        querysets.append(MonthlyCost.objects.filter(
+            month__in=rolled_up_months,
+            **filters
+        ))
+    if periods:
+        querysets.append(DailyCost.objects.filter(
+            reduce(operator.or_, [
+                Q(date__gte=period_start, date__lte=period_end)
+                for period_start, period_end in periods
+            ]),
+            **filters
+        ))
+
+    totals = defaultdict(dict)
+    for queryset in querysets:
+        for row in queryset.values('service_environment', 'type').annotate(
+            total_cost=Sum('cost'),
+            total_value=Sum('value'),
+        ):
+            type_totals = totals[row['type']]
+            se_id = row['service_environment']
+            if se_id in type_totals:
+                cost, value = type_totals[se_id]
+                type_totals[se_id] = (
+                    cost + row['total_cost'],
+                    value + row['total_value'],
+                )
+            else:
+                type_totals[se_id] = (row['total_cost'], row['total_value'])
+    return dict(totals)
+
+
+class ReportData(object):
+    """
+    Costs of all types in period of report, shared by all report plugins.
+    """
+    _active = {}
+
+    def __init__(self, start, end, forecast=False, service_environments=None):
+        self.start = start
+        self.end = end
+        self.forecast = forecast
+        logger.debug('Loading report data from {} to {}'.format(start, end))
+        self._totals = get_total_costs(
+            start,
+            end,
+            forecast,
+            service_environments,
+        )
+
+    def __enter__(self):
+        self.activate()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.deactivate()
+
+    @property
+    def key(self):
+        return (self.start, self.end, self.forecast)
+
+    @classmethod
+    def get_active(cls, start, end, forecast=False):
+        """
+        Returns active report data for period (and forecast) or None if there
+        is no such data.
+        """
+        return cls._active.get((start, end, forecast))
+
+    def activate(self):
+        ReportData._active[self.key] = self
+
+    def deactivate(self):
+        if ReportData._active.get(self.key) is self:
+            del ReportData._active[self.key]
+
+    def get_costs(self, base_usage):
+        """
+        Returns total cost and value of base usage per service environment.
+
+        :returns dict: (key: service environment id, value: tuple (cost,
+            value))
+        """
+        return self._totals.get(get_id(base_usage), {})
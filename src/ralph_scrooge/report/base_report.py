@@ -5,12 +5,21 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
 
+import glob
 import logging
+import os
+import tempfile
+import time
 
+from bob.csvutil import UnicodeWriter
 from django.conf import settings
+from django.core.cache import get_cache
+from django.core.cache.backends.dummy import DummyCache
+from django.core.exceptions import ImproperlyConfigured
 
 from ralph_scrooge.utils.common import get_cache_name, get_queue_name
-from ralph_scrooge.utils.worker_job import WorkerJob
+from ralph_scrooge.utils.result_store import ResultStore
+from ralph_scrooge.utils.worker_job import _get_cache_key, WorkerJob
 
 logger = logging.getLogger(__name__)
 
@@ -48,13 +57,100 @@ class BaseReport(WorkerJob):
         self.header = result
 
     @classmethod
-    def run(cls, **kwargs):
+    def run(cls, export=False, **kwargs):
         header = cls.get_header(**kwargs)
+        if export:
+            yield 100, (header, cls.export_csv(**kwargs))
+            return
         for progress, data in cls.get_data(**kwargs):
             yield progress, (header, data)
         if progress < 100:
             yield 100, (header, data)
 
+    @classmethod
+    def get_rows(cls, **kwargs):
+        """
+        Yields rows of report data one by one. Override this method to
+        produce rows without building whole report data in memory.
+        """
+        data = []
+        for progress, data in cls.get_data(**kwargs):
+            pass
+        for row in data:
+            yield row
+
+    @classmethod
+    def get_export_dir(cls):
+        """
+        Returns directory in which CSV exports are saved. Exports are written
+        on worker and read by web server, so directory (shared between them)
+        has to be configured, unless reports are run in place (dummy cache).
+        """
+        if settings.REPORTS_EXPORT_DIR:
+            return settings.REPORTS_EXPORT_DIR
+        if isinstance(get_cache(cls.cache_name), DummyCache):
+            return tempfile.gettempdir()
+        raise ImproperlyConfigured(
+            'REPORTS_EXPORT_DIR has to be set to directory shared between '
+            'workers and web servers to export reports'
+        )
+
+    @classmethod
+    def _remove_expired_exports(cls, export_dir):
+        """
+        Removes exports of report, which are older than cached result of
+        export (they are not referenced anymore).
+        """
+        expire_time = time.time() - cls.cache_final_result_timeout
+        for path in glob.glob(os.path.join(
+            export_dir,
+            '{}-*.csv'.format(cls.cache_section),
+        )):
+            try:
+                if os.path.getmtime(path) < expire_time:
+                    os.remove(path)
+            except OSError:
+                # removed in the meantime (ex. by another worker)
+                pass
+
+    @classmethod
+    def export_csv(cls, **kwargs):
+        """
+        Writes rows of report data to CSV file (every row as soon as it's
+        produced) and returns path of this file. Only path is cached as a
+        result of export, so whole report is never kept in cache. Expired
+        exports of report are removed before.
+        """
+        export_dir = cls.get_export_dir()
+        cls._remove_expired_exports(export_dir)
+        fd, path = tempfile.mkstemp(
+            prefix='{}-'.format(cls.cache_section),
+            suffix='.csv',
+            dir=export_dir,
+        )
+        with os.fdopen(fd, 'wb') as export_file:
+            writer = UnicodeWriter(export_file)
+            for row in cls.get_rows(**kwargs):
+                writer.writerow(row)
+        return path
+
+    def _clear_cache(self, **kwargs):
+        """
+        Clears cached result of report (removing file of export too).
+        """
+        if kwargs.get('export'):
+            cache = get_cache(self.cache_name)
+            cached = cache.get(_get_cache_key(self.cache_section, **kwargs))
+            result = None
+            if cached is not None and cached[2] is not None:
+                result = ResultStore(cache).load(cached[2])
+            if result:
+                try:
+                    os.remove(result[1])
+                except OSError:
+                    pass
+        super(BaseReport, self)._clear_cache(**kwargs)
+
     @staticmethod
     def get_data(**kwargs):
         """
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+"""
+Pivot of daily usages into rows of services usages report.
+
+Report contains row for every service environment and column for every
+(day, usage type) pair. Instead of looking up (and formatting) every cell of
+report separately, matrix of usages is filled in single step from (sparse)
+usages returned by report plugins and then whole columns of usage type are
+formatted at once (divided by `10 ^ divide_by` and rounded to `rounding`
+places, exactly as Python `round`). Cells without usages are 0 and cells with
+None usage are left as None.
+
+When NumPy is installed, matrix is a NumPy array and columns are divided in
+vectorized way (and only distinct non-zero values are rounded), otherwise
+rows are built in pure Python (from default, already formatted, row).
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from collections import defaultdict
+
+from dateutil import rrule
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def is_available():
+    """
+    Returns True if NumPy is installed (and vectorized pivot could be used).
+    """
+    return numpy is not None
+
+
+def get_columns(start, end, usage_types):
+    """
+    Returns list of columns (day, usage type) of report.
+    """
+    return [
+        (day.date(), usage_type)
+        for day in rrule.rrule(rrule.DAILY, dtstart=start, until=end)
+        for usage_type in usage_types
+    ]
+
+
+def _get_cells(columns, data, service_environments):
+    """
+    Yields (row index, column index, value) for every usage in data (value
+    could be None).
+    """
+    se_indexes = dict(
+        (se.id, index) for index, se in enumerate(service_environments)
+    )
+    for column_index, (day, usage_type) in enumerate(columns):
+        for se_id, value in data.get(day, {}).get(usage_type.id, {}).items():
+            row_index = se_indexes.get(se_id)
+            if row_index is not None:
+                yield row_index, column_index, value
+
+
+def _format_value(value, usage_type):
+    if value is None:
+        return None
+    if usage_type.divide_by:
+        value = value / float(10 ** usage_type.divide_by)
+    return round(value, usage_type.rounding)
+
+
+def pivot_python(columns, data, service_environments):
+    """
+    Returns rows (one per service environment) of formatted usages in every
+    column (0 when there are no usages, None when usage is None).
+    """
+    default_row = [
+        _format_value(0, usage_type) for day, usage_type in columns
+    ]
+    rows = [list(default_row) for se in service_environments]
+    for row_index, column_index, value in _get_cells(
+        columns,
+        data,
+        service_environments,
+    ):
+        rows[row_index][column_index] = _format_value(
+            value,
+            columns[column_index][1],
+        )
+    return rows
+
+
+def _round(values, places):
+    """
+    Rounds values exactly as Python `round` (half away from zero, but using
+    exact binary value of float, ex. 2.675 is rounded to 2.67). Python
+    `round` is called only once for every distinct non-zero value.
+    """
+    nonzero = values.nonzero()
+    distinct, inverse = numpy.unique(values[nonzero], return_inverse=True)
+    rounded = numpy.array([
+        round(value, places) for value in distinct.tolist()
+    ])
+    values[nonzero] = rounded[inverse]
+    return values
+
+
+def pivot_numpy(columns, data, service_environments):
+    """
+    Vectorized version of `pivot_python`.
+    """
+    if not service_environments:
+        return []
+    matrix = numpy.zeros((len(service_environments), len(columns)))
+    # index of row of service environment (by its id, -1 if there is no row)
+    se_ids = numpy.array([se.id for se in service_environments])
+    rows_by_se_id = numpy.full(se_ids.max() + 1, -1, dtype=int)
+    rows_by_se_id[se_ids] = numpy.arange(len(service_environments))
+    # cells with None usages (set in rows after formatting)
+    none_cells = []
+    for column_index, (day, usage_type) in enumerate(columns):
+        usages = {}
+        for se_id, value in data.get(day, {}).get(usage_type.id, {}).items():
+            if se_id >= len(rows_by_se_id):
+                continue
+            if value is None:
+                if rows_by_se_id[se_id] >= 0:
+                    none_cells.append((rows_by_se_id[se_id], column_index))
+            else:
+                usages[se_id] = value
+        if not usages:
+            continue
+        rows_indexes = rows_by_se_id[
+            numpy.fromiter(usages.keys(), dtype=int, count=len(usages))
+        ]
+        values = numpy.fromiter(
+            usages.values(),
+            dtype=float,
+            count=len(usages),
+        )
+        mask = rows_indexes >= 0
+        matrix[rows_indexes[mask], column_index] = values[mask]
+    # format all columns of the same usage type at once
+    usage_types = {}
+    usage_types_columns = defaultdict(list)
+    for column_index, (day, usage_type) in enumerate(columns):
+        usage_types[usage_type.id] = usage_type
+        usage_types_columns[usage_type.id].append(column_index)
+    for usage_type_id, columns_indexes in usage_types_columns.items():
+        usage_type = usage_types[usage_type_id]
+        usages = matrix[:, columns_indexes]
+        if usage_type.divide_by:
+            usages /= float(10 ** usage_type.divide_by)
+        matrix[:, columns_indexes] = _round(usages, usage_type.rounding)
+    rows = matrix.tolist()
+    for row_index, column_index in none_cells:
+        rows[row_index][column_index] = None
+    return rows
+
+
+def pivot(columns, data, service_environments):
+    """
+    Returns rows (one per service environment) of formatted usages in every
+    column (using NumPy if it's installed).
+    """
+    service_environments = list(service_environments)
+    if is_available():
+        return pivot_numpy(columns, data, service_environments)
+    return pivot_python(columns, data, service_environments)
@@ -9,6 +9,7 @@ import logging
 
 
 from ralph.util import plugin as plugin_runner
+from ralph_scrooge.plugins.report.report_data import ReportData
 from ralph_scrooge.report.base_plugin_report import BasePluginReport
 from ralph_scrooge.utils.common import memoize, AttributeDict
 
@@ -78,35 +79,37 @@ class ServicesCostsReport(BasePluginReport):
         """
         logger.debug("Getting report date")
         data = {se.id: {} for se in service_environments}
-        for i, plugin in enumerate(cls.get_plugins()):
-            try:
-                logger.info('Calling plugin {} with base usage {}'.format(
-                    plugin.plugin_name,
-                    plugin.get('plugin_kwargs', {}).get('base_usage', '-'),
-                ))
-                plugin_report = plugin_runner.run(
-                    'scrooge_reports',
-                    plugin.plugin_name,
-                    service_environments=service_environments,
-                    start=start,
-                    end=end,
-                    forecast=forecast,
-                    type='costs',
-                    **plugin.get('plugin_kwargs', {})
-                )
-                for service_id, service_usage in plugin_report.iteritems():
-                    if service_id in data:
-                        data[service_id].update(service_usage)
-
-            except KeyError:
-                logger.warning(
-                    "Usage '{0}' has no usage plugin".format(plugin.name)
-                )
-            except Exception as e:
-                logger.exception(
-                    "Error while generating the report: {0}".format(e)
-                )
-                raise
+        # costs of all plugins (columns) are fetched at once and shared
+        with ReportData(start, end, forecast, service_environments):
+            for i, plugin in enumerate(cls.get_plugins()):
+                try:
+                    logger.info('Calling plugin {} with base usage {}'.format(
+                        plugin.plugin_name,
+                        plugin.get('plugin_kwargs', {}).get('base_usage', '-'),
+                    ))
+                    plugin_report = plugin_runner.run(
+                        'scrooge_reports',
+                        plugin.plugin_name,
+                        service_environments=service_environments,
+                        start=start,
+                        end=end,
+                        forecast=forecast,
+                        type='costs',
+                        **plugin.get('plugin_kwargs', {})
+                    )
+                    for service_id, service_usage in plugin_report.iteritems():
+                        if service_id in data:
+                            data[service_id].update(service_usage)
+
+                except KeyError:
+                    logger.warning(
+                        "Usage '{0}' has no usage plugin".format(plugin.name)
+                    )
+                except Exception as e:
+                    logger.exception(
+                        "Error while generating the report: {0}".format(e)
+                    )
+                    raise
         return data
 
     @classmethod
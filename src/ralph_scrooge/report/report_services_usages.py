@@ -7,11 +7,12 @@ from __future__ import unicode_literals
 
 import logging
 from dateutil import rrule
-from decimal import Decimal as D
 
 from django.utils.translation import ugettext_lazy as _
 
 from ralph.util import plugin as plugin_runner
+from ralph_scrooge.models import ServiceEnvironment
+from ralph_scrooge.report import pivot, usages_cache
 from ralph_scrooge.report.base_plugin_report import BasePluginReport
 
 
@@ -25,21 +26,6 @@ class ServicesUsagesReport(BasePluginReport):
     """
     cache_section = 'services-usages-report'
 
-    @classmethod
-    def _prepare_field(cls, value, usage_type):
-        """
-        Prepare single field for one row for single column. For example,
-        here is a place for format field as currency or set default value.
-        """
-        if not isinstance(value, (int, D, float, long)):
-            return value
-
-        if usage_type.divide_by:
-            value = value / float(10 ** usage_type.divide_by)
-
-        value = round(value, usage_type.rounding)
-        return value
-
     @classmethod
     def _prepare_final_report(
         cls,
@@ -78,26 +64,37 @@ class ServicesUsagesReport(BasePluginReport):
         :rtype list:
         """
         logger.debug("Preparing final report")
-        final_data = []
-        for se in service_environments:
+        return list(cls._iter_final_report(
+            start,
+            end,
+            usage_types,
+            data,
+            service_environments,
+        ))
+
+    @classmethod
+    def _iter_final_report(
+        cls,
+        start,
+        end,
+        usage_types,
+        data,
+        service_environments
+    ):
+        """
+        Yields rows of final report (see `_prepare_final_report`) one by one.
+        Usages of all service environments are pivoted (and formatted) at
+        once (see `pivot`).
+        """
+        service_environments = list(service_environments)
+        rows = pivot.pivot(
+            pivot.get_columns(start, end, usage_types),
+            data,
+            service_environments,
+        )
+        for se, row in zip(service_environments, rows):
             # TODO: add historical information (name between start and end)
-            se_data = [se.service.name, se.environment.name]
-            for day in rrule.rrule(rrule.DAILY, dtstart=start, until=end):
-                date = day.date()
-                for usage_type in usage_types:
-                    try:
-                        value = cls._prepare_field(
-                            data[date][usage_type.id][se.id],
-                            usage_type
-                        )
-                    except KeyError:
-                        value = cls._prepare_field(
-                            0,
-                            usage_type
-                        )
-                    se_data.append(value)
-            final_data.append(se_data)
-        return final_data
+            yield [se.service.name, se.environment.name] + row
 
     @classmethod
     def _get_report_data(cls, start, end, usage_types, service_environments):
@@ -131,16 +128,13 @@ class ServicesUsagesReport(BasePluginReport):
         for usage_type in usage_types:
             plugin_name = usage_type.get_plugin_name()
             try:
-                plugin_report = plugin_runner.run(
-                    'scrooge_reports',
-                    plugin_name,
-                    type='usages',
-                    start=start,
-                    end=end,
-                    usage_type=usage_type,
-                    service_environments=service_environments,
+                usages = cls._get_usage_type_usages(
+                    start,
+                    end,
+                    usage_type,
+                    service_environments,
                 )
-                for day, day_usages in plugin_report.iteritems():
+                for day, day_usages in usages.iteritems():
                     data[day][usage_type.id] = day_usages
             except KeyError:
                 logger.warning(
@@ -153,6 +147,56 @@ class ServicesUsagesReport(BasePluginReport):
                 raise
         return data
 
+    @classmethod
+    def _get_usage_type_usages(
+        cls,
+        start,
+        end,
+        usage_type,
+        service_environments,
+    ):
+        """
+        Returns daily usages of usage type (per service environment) between
+        start and end. Usages of days already cached are taken from cache,
+        only missing days are fetched using usage type plugin (see
+        `usages_cache`).
+
+        Usages of all service environments are cached (so cached days could
+        be used by reports of any service environments) and filtered by
+        service environments when returned.
+        """
+        days = [
+            day.date()
+            for day in rrule.rrule(rrule.DAILY, dtstart=start, until=end)
+        ]
+        usages = usages_cache.get_days(usage_type, days)
+        missing_days = [day for day in days if day not in usages]
+        for period_start, period_end in usages_cache.get_periods(
+            missing_days
+        ):
+            plugin_report = plugin_runner.run(
+                'scrooge_reports',
+                usage_type.get_plugin_name(),
+                type='usages',
+                start=period_start,
+                end=period_end,
+                usage_type=usage_type,
+                service_environments=ServiceEnvironment.objects.all(),
+            )
+            period_usages = dict(
+                (day, plugin_report.get(day, {}))
+                for day in missing_days if period_start <= day <= period_end
+            )
+            usages_cache.set_days(usage_type, period_usages)
+            usages.update(period_usages)
+        service_environments_ids = set(se.id for se in service_environments)
+        return dict(
+            (day, dict(
+                (se_id, value) for se_id, value in day_usages.iteritems()
+                if se_id in service_environments_ids
+            )) for day, day_usages in usages.iteritems()
+        )
+
     @classmethod
     def get_data(
         cls,
@@ -194,6 +238,27 @@ class ServicesUsagesReport(BasePluginReport):
             service_environments
         )
 
+    @classmethod
+    def get_rows(cls, start, end, usage_types, is_active=False, **kwargs):
+        """
+        Yields rows of report one by one (used in CSV export, when rows are
+        written to file as soon as they are produced).
+        """
+        service_environments = cls._get_services_environments(is_active)
+        data = cls._get_report_data(
+            start,
+            end,
+            usage_types,
+            service_environments,
+        )
+        return cls._iter_final_report(
+            start,
+            end,
+            usage_types,
+            data,
+            service_environments,
+        )
+
     @classmethod
     def get_header(cls, start, end, usage_types, **kwargs):
         """
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""
+Cache of daily usages used in services usages report.
+
+Usages of usage type in single day (per service environment) are cached
+separately, so report for any period is assembled from cached days and only
+days missing in cache are fetched from database (ex. when period of report is
+moved by one day, only this day is fetched). Days from today on are never
+cached (their usages could be still collected).
+
+Usages of all service environments are cached (regardless of service
+environments of report), so cached days could be shared by every report -
+usages have to be filtered by service environments when they are read.
+
+Cached days of usage type are invalidated when its usages are changed inside
+them (see `CostInputChange.mark`). When usages are changed in unbounded
+period, version of usage type is changed (which invalidates all its cached
+days). Version is a timestamp of change, so it's never reused, even when
+previous version expired in cache.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import datetime
+import time
+import urllib
+
+from django.conf import settings
+from django.core.cache import get_cache
+
+from ralph_scrooge.models.cost import cost_input_changed
+from ralph_scrooge.utils.common import get_cache_name
+
+CACHE_SECTION = 'services-usages-report-day'
+
+
+def _get_cache():
+    return get_cache(get_cache_name('scrooge_report'))
+
+
+def _get_version_key(type_id):
+    return b'{}-version?usage_type={}'.format(CACHE_SECTION, type_id)
+
+
+def _get_version(cache, type_id):
+    return cache.get(_get_version_key(type_id)) or 0
+
+
+def _get_key(type_id, version, day):
+    return b'{}?{}'.format(CACHE_SECTION, urllib.urlencode(dict(
+        usage_type=type_id,
+        version=version,
+        day=day,
+    )))
+
+
+def get_periods(days):
+    """
+    Groups days into periods of consecutive days.
+
+    :returns list: list of tuples (start, end)
+    """
+    periods = []
+    for day in sorted(days):
+        if periods and periods[-1][1] + datetime.timedelta(days=1) == day:
+            periods[-1] = (periods[-1][0], day)
+        else:
+            periods.append((day, day))
+    return periods
+
+
+def get_days(usage_type, days):
+    """
+    Returns cached usages of usage type in days.
+
+    :returns dict: usages per service environment (all service environments)
+        for every cached day
+    """
+    cache = _get_cache()
+    version = _get_version(cache, usage_type.id)
+    keys = dict((_get_key(usage_type.id, version, day), day) for day in days)
+    return dict(
+        (keys[key], usages)
+        for key, usages in cache.get_many(keys.keys()).iteritems()
+    )
+
+
+def set_days(usage_type, days_usages):
+    """
+    Saves usages of usage type (per service environment - usages of all
+    service environments should be passed) in cache for every day before
+    today.
+    """
+    cache = _get_cache()
+    version = _get_version(cache, usage_type.id)
+    today = datetime.date.today()
+    cache.set_many(dict(
+        (_get_key(usage_type.id, version, day), dict(usages))
+        for day, usages in days_usages.iteritems() if day < today
+    ), timeout=settings.REPORTS_USAGES_CACHE_TIMEOUT)
+
+
+def invalidate(type_ids, start=None, end=None):
+    """
+    Removes cached usages of usage types between start and end.
+    """
+    cache = _get_cache()
+    today = datetime.date.today()
+    for type_id in type_ids:
+        if start is None or end is None:
+            cache.set(
+                _get_version_key(type_id),
+                int(time.time() * 1000),
+                timeout=settings.REPORTS_USAGES_CACHE_TIMEOUT,
+            )
+            continue
+        version = _get_version(cache, type_id)
+        day = start
+        keys = []
+        while day <= min(end, today):
+            keys.append(_get_key(type_id, version, day))
+            day += datetime.timedelta(days=1)
+        cache.delete_many(keys)
+
+
+def invalidate_usages_cache(sender, type_ids, start, end, **kwargs):
+    invalidate(type_ids, start, end)
+
+
+cost_input_changed.connect(invalidate_usages_cache)
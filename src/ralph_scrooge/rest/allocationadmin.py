@@ -15,10 +15,10 @@ from ralph_scrooge.rest.common import get_dates
 from ralph_scrooge.models import (
     UsageType,
     Warehouse,
-    UsagePrice,
     TeamCost,
     Team,
 )
+from ralph_scrooge.plugins.cost.price_book import PriceBook
 
 
 class AllocationAdminContent(APIView):
@@ -43,8 +43,30 @@ class AllocationAdminContent(APIView):
             })
         return rows
 
+    def _get_usage_price_cost(
+        self,
+        price_book,
+        usage_type,
+        start,
+        end,
+        warehouse=None,
+    ):
+        """
+        Returns cost of usage type defined exactly between start and end
+        (or 0 if there is no such cost).
+        """
+        for usage_price in price_book.get_usage_prices(
+            usage_type,
+            start,
+            warehouse=warehouse,
+        ):
+            if usage_price.start == start and usage_price.end == end:
+                return usage_price.cost
+        return D(0)
+
     def _get_base_usages(self, start, end):
         rows = []
+        price_book = PriceBook(start, end)
         warehouses = Warehouse.objects.filter(
             show_in_report=True,
         )
@@ -53,14 +75,12 @@ class AllocationAdminContent(APIView):
             is_manually_type=True,
         ):
             if not usage_type.by_warehouse:
-                try:
-                    cost = UsagePrice.objects.get(
-                        type=usage_type,
-                        start=start,
-                        end=end,
-                    ).cost
-                except UsagePrice.DoesNotExist:
-                    cost = D(0)
+                cost = self._get_usage_price_cost(
+                    price_book,
+                    usage_type,
+                    start,
+                    end,
+                )
                 rows.append({
                     'type': {
                         'id': usage_type.id,
@@ -70,15 +90,13 @@ class AllocationAdminContent(APIView):
                 })
             else:
                 for warehouse in warehouses:
-                    try:
-                        cost = UsagePrice.objects.get(
-                            type=usage_type,
-                            start=start,
-                            end=end,
-                            warehouse=warehouse,
-                        ).cost
-                    except UsagePrice.DoesNotExist:
-                        cost = D(0)
+                    cost = self._get_usage_price_cost(
+                        price_book,
+                        usage_type,
+                        start,
+                        end,
+                        warehouse=warehouse,
+                    )
                     rows.append({
                         'type': {
                             'id': usage_type.id,
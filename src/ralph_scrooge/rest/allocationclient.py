@@ -19,6 +19,7 @@ from django.db.transaction import commit_on_success
 
 from ralph_scrooge.rest.common import get_dates
 from ralph_scrooge.models import (
+    CostInputChange,
     DailyUsage,
     ExtraCost,
     ExtraCostType,
@@ -229,6 +230,11 @@ class AllocationClientService(APIView):
                         value=row['value'],
                         type=service_usage_type.usage_type,
                     )
+            CostInputChange.mark_usages(
+                [service_usage_type.usage_type],
+                first_day,
+                last_day,
+            )
         if kwargs.get('allocate_type') == 'serviceextracost':
             service_environment = ServiceEnvironment.objects.get(
                 service__id=service,
@@ -5,6 +5,7 @@ SSH_NFSEN_CREDENTIALS = {}
 NFSEN_CHANNELS = []
 NFSEN_CLASS_ADDRESS = []
 NFSEN_FILES_PATH = ''
+NFSEN_WORKERS = 4
 
 # Virtual Usages plugin default config
 VIRTUAL_SERVICES = {}
@@ -37,6 +38,18 @@ COLLECT_PLUGINS = set([
     'warehouse',
 ])
 
+# Number of processes used to run independent collect plugins concurrently
+# (in scrooge_sync)
+COLLECT_PLUGINS_WORKERS = 1
+
+# Number of assets synchronized (by asset plugin) in single batch (0 means
+# that every asset is synchronized separately)
+ASSETS_SYNC_BATCH_SIZE = 0
+
+# Number of virtual devices synchronized (by virtual plugin) in single batch
+# (0 means that every virtual device is synchronized separately)
+VIRTUAL_SYNC_BATCH_SIZE = 0
+
 UNKNOWN_SERVICES_ENVIRONMENTS = {
     'tenant': {},
     'netflow': (None, None),
@@ -46,6 +59,32 @@ ADDITIONAL_PRICING_OBJECT_TYPES = {}
 
 SAVE_ONLY_FIRST_DEPTH_COSTS = True
 
+# Number of processes used to calculate costs for multiple days at once
+COSTS_COLLECTOR_WORKERS = 1
+
+# Number of daily costs saved in database in single query
+COSTS_SAVE_BATCH_SIZE = 5000
+
+# Engine used to distribute pricing services costs ('python' or 'numpy')
+COSTS_DISTRIBUTION_ENGINE = 'python'
+
+# Save profile (time, SQL queries, rows and cost nodes count) of every cost
+# plugin call in costs collecting
+COSTS_PROFILING = True
+
+# Directory (shared between workers and web servers) in which CSV exports of
+# reports are saved - required to export reports on workers
+REPORTS_EXPORT_DIR = None
+
+# Time (in seconds) for which daily usages of usage types are cached (for
+# services usages report)
+REPORTS_USAGES_CACHE_TIMEOUT = 60 * 60 * 24 * 7
+
+# Max number of cached results of single memoized function (LRU) and time
+# (in seconds) after which cached result expires
+MEMOIZE_MAX_SIZE = 10000
+MEMOIZE_TIMEOUT = 300
+
 TESTING = 'test' in sys.argv
 
 COMPONENTS_TABLE_SCHEMA = {
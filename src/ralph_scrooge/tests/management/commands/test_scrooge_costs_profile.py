@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from datetime import date
+
+from django.test import TestCase
+
+from ralph_scrooge.management.commands.scrooge_costs_profile import Command
+from ralph_scrooge.models import CostPluginProfile
+
+
+class TestScroogeCostsProfile(TestCase):
+    def setUp(self):
+        for day, name, wall_time, queries_count in [
+            (date(2014, 11, 10), 'Usage 1', 1.5, 100),
+            (date(2014, 11, 11), 'Usage 1', 2.5, 100),
+            (date(2014, 11, 11), 'Usage 2', 3.0, 10),
+            (date(2014, 11, 11), 'Service 1', 0.5, 1000),
+            # out of range
+            (date(2014, 11, 12), 'Usage 2', 30.0, 10),
+        ]:
+            CostPluginProfile.objects.create(
+                date=day,
+                plugin_name='plugin',
+                name=name,
+                wall_time=wall_time,
+                db_time=wall_time / 2,
+                queries_count=queries_count,
+                rows_count=queries_count * 2,
+                nodes_count=10,
+            )
+        self.options = {
+            'start': '2014-11-10',
+            'end': '2014-11-11',
+            'forecast': False,
+            'order_by': 'wall_time',
+            'limit': 20,
+        }
+
+    def test_get_data(self):
+        self.assertEquals(Command().get_data(**self.options), [
+            ['plugin', 'Usage 1', False, 2, '4.000', '2.000', 200, 400, 20],
+            ['plugin', 'Usage 2', False, 1, '3.000', '1.500', 10, 20, 10],
+            [
+                'plugin', 'Service 1', False, 1, '0.500', '0.250', 1000, 2000,
+                10,
+            ],
+        ])
+
+    def test_get_data_order_by_and_limit(self):
+        self.options.update(order_by='queries_count', limit=2)
+        self.assertEquals(
+            [row[1] for row in Command().get_data(**self.options)],
+            ['Service 1', 'Usage 1'],
+        )
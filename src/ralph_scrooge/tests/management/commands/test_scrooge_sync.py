@@ -6,6 +6,8 @@ from __future__ import print_function
 from __future__ import unicode_literals
 
 import datetime
+from multiprocessing.pool import ThreadPool
+
 from mock import call, patch
 
 from django.core.management import call_command
@@ -86,6 +88,37 @@ class TestScroogeSync(TestCase):
             ('warehouse', True),
         ]))
 
+    @override_settings(COLLECT_PLUGINS=COLLECT_PLUGINS)
+    @patch('ralph_scrooge.management.commands.scrooge_sync.connection')
+    @patch(
+        'ralph_scrooge.management.commands.scrooge_sync.multiprocessing.Pool',
+        ThreadPool,
+    )
+    @patch('ralph_scrooge.management.commands.scrooge_sync._run_plugin')
+    def test_run_plugins_parallel(self, run_plugin_mock, connection_mock):
+        def side_effect(name, today):
+            if name == 'business_line':
+                raise scrooge_sync.PluginError()
+        run_plugin_mock.side_effect = side_effect
+        today = datetime.date.today()
+        result = [r for r in scrooge_sync.run_plugins(
+            today,
+            COLLECT_PLUGINS + ['abc', 'def'],
+            workers=2,
+        )]
+        run_plugin_mock.assert_has_calls(
+            [
+                call('business_line', today),
+                call('warehouse', today),
+            ],
+            any_order=True
+        )
+        self.assertEquals(run_plugin_mock.call_count, 2)
+        self.assertEquals(set(result), set([
+            ('business_line', False),
+            ('warehouse', True),
+        ]))
+
     @override_settings(COLLECT_PLUGINS=COLLECT_PLUGINS)
     @patch('ralph_scrooge.management.commands.scrooge_sync.run_plugins')
     def test_command(self, run_plugins_mock):
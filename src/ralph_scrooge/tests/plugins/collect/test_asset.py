@@ -6,8 +6,10 @@ from __future__ import print_function
 from __future__ import unicode_literals
 
 import datetime
+from decimal import Decimal as D
 
 from django.test import TestCase
+from django.test.utils import override_settings
 
 from ralph_scrooge.models import (
     AssetInfo,
@@ -248,3 +250,119 @@ class TestAssetPlugin(TestCase):
             asset.asset(today=self.date),
             (True, u'0 new, 0 updated, 1 total')
         )
+
+    def _get_usages(self):
+        return {
+            'depreciation': UsageTypeFactory.create(),
+            'assets_count': UsageTypeFactory.create(),
+            'cores_count': UsageTypeFactory.create(),
+            'power_consumption': UsageTypeFactory.create(),
+            'collocation': UsageTypeFactory.create(),
+        }
+
+    def test_update_assets_batch(self):
+        self.data.update(is_depreciated=False, depreciation_rate=10, price=365)
+        data2 = self.data.copy()
+        data2.update(asset_id=2, sn='SN2', barcode='B2', device_id=2)
+        usages = self._get_usages()
+        self.assertEqual(
+            asset.update_assets_batch(
+                [self.data, data2],
+                self.date,
+                usages,
+                asset.get_lookups(),
+            ),
+            (2, 0),
+        )
+        self.assertEqual(AssetInfo.objects.count(), 2)
+        self.assertEqual(DailyAssetInfo.objects.count(), 2)
+        self.assertEqual(DailyUsage.objects.count(), 10)
+        daily_asset_info = DailyAssetInfo.objects.get(asset_info__asset_id=1)
+        self.assertEqual(daily_asset_info.daily_cost, D('0.1'))
+        self.assertEqual(
+            DailyUsage.objects.get(
+                type=usages['cores_count'],
+                daily_pricing_object=daily_asset_info,
+            ).value,
+            4,
+        )
+        self.assertEqual(
+            DailyUsage.objects.get(
+                type=usages['depreciation'],
+                daily_pricing_object=daily_asset_info,
+            ).value,
+            0.1,
+        )
+
+    def test_update_assets_batch_update(self):
+        usages = self._get_usages()
+        lookups = asset.get_lookups()
+        asset.update_assets_batch([self.data], self.date, usages, lookups)
+        self.data['cores_count'] = 8
+        self.assertEqual(
+            asset.update_assets_batch(
+                [self.data],
+                self.date,
+                usages,
+                lookups,
+            ),
+            (0, 1),
+        )
+        self.assertEqual(DailyAssetInfo.objects.count(), 1)
+        self.assertEqual(DailyUsage.objects.count(), 5)
+        self.assertEqual(
+            DailyUsage.objects.get(type=usages['cores_count']).value,
+            8,
+        )
+
+    def test_update_assets_batch_duplicates(self):
+        AssetInfoFactory(
+            asset_id=3,
+            sn=self.data['sn'],
+            barcode='B3',
+            device_id=3,
+            warehouse=self.warehouse,
+        )
+        data2 = self.data.copy()
+        data2.update(asset_id=2, sn='SN2', barcode='B2')
+        asset.update_assets_batch(
+            [self.data, data2],
+            self.date,
+            self._get_usages(),
+            asset.get_lookups(),
+        )
+        asset1 = AssetInfo.objects.get(asset_id=1)
+        asset2 = AssetInfo.objects.get(asset_id=2)
+        self.assertEqual(asset1.sn, self.data['sn'])
+        self.assertIsNone(AssetInfo.objects.get(asset_id=3).sn)
+        # device id of the later asset in batch wins
+        self.assertIsNone(asset1.device_id)
+        self.assertEqual(asset2.device_id, data2['device_id'])
+
+    def test_update_assets_batch_when_service_does_not_exist(self):
+        self.data['service_id'] = ServiceFactory.build().ci_id
+        self.assertEqual(
+            asset.update_assets_batch(
+                [self.data],
+                self.date,
+                self._get_usages(),
+                asset.get_lookups(),
+            ),
+            (0, 0),
+        )
+        self.assertEqual(AssetInfo.objects.count(), 0)
+
+    @override_settings(ASSETS_SYNC_BATCH_SIZE=1)
+    def test_assets_in_batches(self):
+        data2 = self.data.copy()
+        data2.update(asset_id=2, sn='SN2', barcode='B2', device_id=2)
+        asset.get_assets = lambda x: [self.data, data2]
+        self.assertEqual(
+            asset.asset(today=self.date),
+            (True, u'2 new, 0 updated, 2 total')
+        )
+        self.assertEqual(
+            asset.asset(today=self.date),
+            (True, u'0 new, 2 updated, 2 total')
+        )
+        self.assertEqual(DailyUsage.objects.count(), 10)
@@ -6,7 +6,7 @@ from __future__ import print_function
 from __future__ import unicode_literals
 
 from datetime import date
-from mock import MagicMock, patch
+from mock import patch
 
 from django.test import TestCase
 from django.conf import settings
@@ -25,22 +25,40 @@ from ralph_scrooge.tests.utils.factory import (
 )
 
 
+class ChannelFileMock(object):
+    """
+    Local fake of paramiko channel file emitting canned output.
+    """
+    def __init__(self, content):
+        self.content = content
+
+    def read(self):
+        return self.content
+
+    def readlines(self):
+        return list(self.content)
+
+    def __iter__(self):
+        return iter(self.content)
+
+
 class SshClientMock():
     def __init__(self, stdin='', stdout='', stderr=''):
         self.stdin = stdin
         self.stdout = stdout
         self.stderr = stderr
+        self.closed = False
 
     def exec_command(self, command):
         return (
-            MagicMock(read=MagicMock(return_value=self.stdin)),
-            MagicMock(
-                read=MagicMock(return_value=self.stdout),
-                readlines=MagicMock(return_value=self.stdout),
-            ),
-            MagicMock(read=MagicMock(return_value=self.stderr)),
+            ChannelFileMock(self.stdin),
+            ChannelFileMock(self.stdout),
+            ChannelFileMock(self.stderr),
         )
 
+    def close(self):
+        self.closed = True
+
 
 def get_ssh_client_mock(address, login, password):
     return SshClientMock(
@@ -83,17 +101,50 @@ class TestNetwork(TestCase):
 
     def test_execute_nfdump(self):
         self.assertEqual(
-            netflow.execute_nfdump(
+            list(netflow.execute_nfdump(
                 SshClientMock(stdout=['0', '1', '2', '3', '4', '5', '6']),
                 'test-channel',
                 '2014-10-01',
                 ['file1', 'file2'],
                 'srcip',
                 settings.NFSEN_CLASS_ADDRESS,
-            ),
+            )),
             [u'1', u'2'],
         )
 
+    def test_execute_nfdump_is_streamed(self):
+        read = []
+
+        def stdout():
+            for row in ['0', '1', '2', '3', '4', '5', '6']:
+                read.append(row)
+                yield row
+
+        rows = netflow.execute_nfdump(
+            SshClientMock(stdout=stdout()),
+            'test-channel',
+            '2014-10-01',
+            ['file1', 'file2'],
+            'srcip',
+            settings.NFSEN_CLASS_ADDRESS,
+        )
+        self.assertEqual(next(rows), '1')
+        # only summary rows are buffered
+        self.assertEqual(read, ['0', '1', '2', '3', '4', '5'])
+
+    def test_execute_nfdump_when_output_is_empty(self):
+        self.assertEqual(
+            list(netflow.execute_nfdump(
+                SshClientMock(stdout=[]),
+                'test-channel',
+                '2014-10-01',
+                ['file1', 'file2'],
+                'srcip',
+                settings.NFSEN_CLASS_ADDRESS,
+            )),
+            [],
+        )
+
     @override_settings(NFSEN_CLASS_ADDRESS=['10.10.10.10'])
     def test_extract_ip_and_bytes_when_input_output_is_srcip(self):
         self.assertEqual(
@@ -236,6 +287,35 @@ class TestNetwork(TestCase):
             {('20.20.20.20', '443'): 30, ('10.10.10.10', '80'): 30},
         )
 
+    @override_settings(
+        NFSEN_CHANNELS=['channel1', 'channel2'],
+        SSH_NFSEN_CREDENTIALS={
+            'address1': {'login': 'login', 'password': 'password'},
+            'address2': {'login': 'login', 'password': 'password'},
+        },
+        NFSEN_CLASS_ADDRESS=['10.10.10.10', '20.20.20.20'],
+        NFSEN_WORKERS=4,
+    )
+    def test_get_network_usages_concurrently(self):
+        ssh_clients = []
+
+        def get_ssh_client(address, login, password):
+            ssh_clients.append(get_ssh_client_mock(address, login, password))
+            return ssh_clients[-1]
+
+        with patch.object(netflow, 'get_ssh_client', get_ssh_client):
+            self.assertEqual(
+                netflow.get_network_usages(
+                    '2014-10-01',
+                    settings.NFSEN_CLASS_ADDRESS
+                ),
+                # 2 servers x 2 channels
+                {('20.20.20.20', '443'): 120, ('10.10.10.10', '80'): 120},
+            )
+        # single connection per server, closed after collecting usages
+        self.assertEqual(len(ssh_clients), 2)
+        self.assertTrue(all(client.closed for client in ssh_clients))
+
     def test_get_usages_type(self):
         self.assertEqual(netflow.get_usage_type(), UsageType.objects.get())
 
@@ -327,3 +327,130 @@ class TestVirtualPlugin(TestCase):
             virtual.virtual(today=self.today),
             (True, 'Virtual: None new, 1 updated, 1 total'),
         )
+
+    def _get_virtual_data(self, device_id, hypervisor_id=None, **kwargs):
+        data = AttributeDict(
+            device_id=device_id,
+            name='vm{}'.format(device_id),
+            service_id=self.service_environment.service.ci_id,
+            environment_id=self.service_environment.environment.ci_id,
+            hypervisor_id=hypervisor_id,
+            virtual_disk=100,
+            virtual_memory=200,
+            virtual_cores=2,
+            model_id=1,
+            model_name='sample model',
+        )
+        data.update(kwargs)
+        return data
+
+    def test_update_batch(self):
+        hypervisor = DailyAssetInfoFactory(date=self.today)
+        usages = virtual.get_or_create_usages(self.usage_names)
+        virtuals = [
+            self._get_virtual_data(1, hypervisor.asset_info.device_id),
+            self._get_virtual_data(2),
+            self._get_virtual_data(3, service_id=None),
+        ]
+        self.assertEqual(
+            virtual.update_batch(
+                'virtual_group',
+                virtuals,
+                usages,
+                self.today,
+                virtual.get_lookups(self.today),
+            ),
+            2,
+        )
+        for data in virtuals[:2]:
+            self._compare_daily_virtual_info(
+                models.DailyVirtualInfo.objects.get(
+                    virtual_info__device_id=data['device_id'],
+                ),
+                data,
+                self.service_environment,
+                'virtual_group',
+            )
+        self.assertEqual(
+            models.DailyVirtualInfo.objects.get(
+                virtual_info__device_id=1,
+            ).hypervisor,
+            hypervisor,
+        )
+        self.assertEqual(models.PricingObjectModel.objects.count(), 1)
+        self.assertEqual(models.DailyUsage.objects.count(), 6)
+        self.assertEqual(
+            models.DailyUsage.objects.get(
+                type=usages['virtual_memory'],
+                daily_pricing_object__dailyvirtualinfo__virtual_info__device_id=2,  # noqa
+            ).value,
+            200,
+        )
+
+    def test_update_batch_update(self):
+        usages = virtual.get_or_create_usages(self.usage_names)
+        lookups = virtual.get_lookups(self.today)
+        virtual.update_batch(
+            'virtual_group',
+            [self._get_virtual_data(1)],
+            usages,
+            self.today,
+            lookups,
+        )
+        data = self._get_virtual_data(
+            1,
+            name='new_name',
+            virtual_cores=4,
+            model_name='new model',
+        )
+        virtual.update_batch(
+            'virtual_group',
+            [data],
+            usages,
+            self.today,
+            lookups,
+        )
+        self._compare_daily_virtual_info(
+            models.DailyVirtualInfo.objects.get(),
+            data,
+            self.service_environment,
+            'virtual_group',
+        )
+        self.assertEqual(models.DailyUsage.objects.count(), 3)
+        self.assertEqual(
+            models.DailyUsage.objects.get(type=usages['virtual_cores']).value,
+            4,
+        )
+
+    @override_settings(
+        VIRTUAL_SERVICES={'example_group': ['service1', 'service2']},
+        VIRTUAL_SYNC_BATCH_SIZE=2,
+    )
+    def test_virtual_in_batches(self):
+        virtuals = {
+            'service1': [self._get_virtual_data(1), self._get_virtual_data(2)],
+            'service2': [self._get_virtual_data(None)],
+        }
+        with patch.object(
+            api_scrooge,
+            'get_virtual_usages',
+            lambda service_uid: virtuals[service_uid],
+        ):
+            with patch.object(
+                models.CostInputChange,
+                'mark_usages',
+            ) as mark_usages_mock:
+                self.assertEqual(
+                    virtual.virtual(today=self.today),
+                    (True, 'Virtual: None new, 2 updated, 3 total'),
+                )
+        self.assertEqual(models.DailyVirtualInfo.objects.count(), 2)
+        self.assertEqual(models.DailyUsage.objects.count(), 6)
+        # usages changes (including by cost usage types) are marked once
+        usages = virtual.get_or_create_usages(
+            virtual.get_usage_names('example_group'),
+        )
+        self.assertEqual(mark_usages_mock.call_count, 1)
+        usage_types, start, end = mark_usages_mock.call_args[0]
+        self.assertEqual(set(usage_types), set(usages.values()))
+        self.assertEqual((start, end), (self.today, self.today))
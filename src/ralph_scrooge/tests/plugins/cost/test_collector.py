@@ -7,15 +7,23 @@ from __future__ import unicode_literals
 
 from datetime import date, timedelta
 from dateutil import rrule
+from decimal import Decimal as D
 import mock
 
 from django.test import TestCase
+from django.test.utils import override_settings
 
-from ralph_scrooge.plugins.cost.collector import Collector
+from ralph_scrooge import models
+from ralph_scrooge.plugins.cost.collector import Collector, _process_day
 from ralph_scrooge.tests.utils.factory import (
     CostDateStatusFactory,
+    PricingServiceFactory,
     ServiceEnvironmentFactory,
+    ServiceUsageTypesFactory,
+    TeamFactory,
+    UsageTypeFactory,
 )
+from ralph_scrooge.utils.common import AttributeDict
 
 
 class TestCollector(TestCase):
@@ -87,8 +95,388 @@ class TestCollector(TestCase):
                 day,
                 service_environments=self.service_environments,
                 forecast=True,
+                price_book=mock.ANY,
+                refresh_monthly=False,
                 a=1,
             ))
         process_mock.assert_has_calls(calls)
 
+    @mock.patch('ralph_scrooge.plugins.cost.collector.MonthlyCost.refresh')
+    @mock.patch('ralph_scrooge.plugins.cost.collector.Collector.process')
+    @mock.patch('ralph_scrooge.plugins.cost.collector.Collector._get_dates')
+    def test_process_period_refreshes_months_once(
+        self,
+        get_dates_mock,
+        process_mock,
+        refresh_mock,
+    ):
+        get_dates_mock.return_value = self._dates_between(
+            date(2013, 9, 29),
+            date(2013, 10, 2),
+        )
+        # costs of the last day are not calculated
+        process_mock.side_effect = [None, None, None, Exception()]
+        list(self.collector.process_period(
+            self.start,
+            self.end,
+            True,
+            False,
+        ))
+        self.assertEquals(refresh_mock.call_args_list, [
+            mock.call(date(2013, 9, 1), date(2013, 9, 1), True),
+            mock.call(date(2013, 10, 1), date(2013, 10, 1), True),
+        ])
+
+    @mock.patch('ralph_scrooge.plugins.cost.collector.connection')
+    @mock.patch('ralph_scrooge.plugins.cost.collector.multiprocessing.Pool')
+    @mock.patch('ralph_scrooge.plugins.cost.collector.Collector._get_dates')
+    def test_process_period_parallel(
+        self,
+        get_dates_mock,
+        pool_mock,
+        connection_mock
+    ):
+        get_dates_mock.return_value = self.dates1
+        imap_mock = pool_mock.return_value.imap_unordered
+        imap_mock.side_effect = lambda func, params: (
+            (p[0], p[0] != self.dates1[0]) for p in params
+        )
+        result = dict(self.collector.process_period(
+            self.start,
+            self.end,
+            True,
+            False,
+            workers=4,
+            a=1
+        ))
+        self.assertEquals(pool_mock.call_args[1]['processes'], 4)
+        self.assertEquals(
+            list(imap_mock.call_args[0][1]),
+            [
+                (day, True, {'a': 1, 'refresh_monthly': False})
+                for day in self.dates1
+            ],
+        )
+        self.assertFalse(result.pop(self.dates1[0]))
+        self.assertTrue(all(result.values()))
+        self.assertEquals(len(result), len(self.dates1) - 1)
+        pool_mock.return_value.join.assert_called_once_with()
+
+    @mock.patch('ralph_scrooge.plugins.cost.collector.Collector.process')
+    def test_process_day(self, process_mock):
+        process_mock.side_effect = [None, Exception()]
+        self.assertEquals(
+            _process_day((self.today, False, {'a': 1})),
+            (self.today, True),
+        )
+        process_mock.assert_called_with(self.today, forecast=False, a=1)
+        self.assertEquals(
+            _process_day((self.today, False, {})),
+            (self.today, False),
+        )
+
+    @mock.patch('ralph_scrooge.plugins.cost.collector.plugin_runner.run')
+    def test_calculate_pricing_services_costs(self, run_mock):
+        ps1, ps2 = PricingServiceFactory.create_batch(2)
+        snapshot = mock.Mock()
+        snapshot.get_pricing_services_in_dependency_order.return_value = [
+            ps2,
+            ps1,
+        ]
+        run_mock.side_effect = [KeyError(), {}]
+        self.collector._calculate_pricing_services_costs(
+            self.today,
+            False,
+            snapshot,
+        )
+        run_mock.assert_has_calls([
+            mock.call(
+                'scrooge_costs',
+                ps.get_plugin_name(),
+                type='total_cost',
+                pricing_service=ps,
+                date=self.today,
+                forecast=False,
+                for_all_service_environments=True,
+                service_environments=None,
+            ) for ps in (ps2, ps1)
+        ])
+
+    def test_get_dates_incremental(self):
+        for day in self.dates1:
+            CostDateStatusFactory(date=day, calculated=True)
+        models.CostInputChange.objects.create(
+            date=self.dates1[3],
+            type=UsageTypeFactory(),
+        )
+        dates = self.collector._get_dates(
+            self.start,
+            self.end,
+            False,
+            False,
+            True,
+        )
+        self.assertEquals(dates, [self.dates1[3]] + self.dates2)
+
+    def test_get_dates_incremental_skip_accepted(self):
+        for day in self.dates1:
+            CostDateStatusFactory(
+                date=day,
+                calculated=True,
+                accepted=day == self.dates1[3],
+            )
+        for day in self.dates1[3:5]:
+            models.CostInputChange.objects.create(
+                date=day,
+                type=UsageTypeFactory(),
+            )
+        dates = self.collector._get_dates(
+            self.start,
+            self.end,
+            False,
+            False,
+            True,
+        )
+        self.assertEquals(dates, [self.dates1[4]] + self.dates2)
+
+    def test_delete_daily_costs_types(self):
+        ps1, ps2 = PricingServiceFactory.create_batch(2)
+        for ps in (ps1, ps2):
+            models.DailyCost.build_tree(
+                [{
+                    'type': ps,
+                    'cost': D(10),
+                    '_children': [{'type': ps2, 'cost': D(5)}],
+                }],
+                date=self.today,
+                service_environment=self.service_environments[0],
+                forecast=False,
+            )
+        self.collector._delete_daily_costs(
+            self.today,
+            False,
+            types=[ps1.id],
+        )
+        self.assertEquals(
+            set(models.DailyCost.objects_tree.values_list('path', flat=True)),
+            set([str(ps2.id), '{0}/{0}'.format(ps2.id)]),
+        )
+
+    def test_get_affected_types(self):
+        ps1, ps2, ps3 = PricingServiceFactory.create_batch(3)
+        service_usage_type = UsageTypeFactory(usage_type='SU')
+        ServiceUsageTypesFactory(
+            usage_type=service_usage_type,
+            pricing_service=ps1,
+        )
+        team = TeamFactory()
+
+        # ps2 is using resources of ps1
+        def get_dependent_services(pricing_service, date, exclude=None):
+            return [ps1] if pricing_service == ps2 else []
+
+        with mock.patch.object(
+            models.PricingService,
+            'get_dependent_services',
+            get_dependent_services,
+        ):
+            self.assertEquals(
+                self.collector._get_affected_types(
+                    self.today,
+                    set([service_usage_type.id]),
+                ),
+                set([service_usage_type.id, ps1.id, ps2.id]),
+            )
+            self.assertEquals(
+                self.collector._get_affected_types(
+                    self.today,
+                    set([team.id]),
+                ),
+                set([team.id, ps1.id, ps2.id, ps3.id]),
+            )
+
+    def test_get_affected_types_teams(self):
+        ps = PricingServiceFactory()
+        assets_count = UsageTypeFactory(symbol='assets_count')
+        cores_count = UsageTypeFactory(symbol='physical_cpu_cores')
+        time_team = TeamFactory()
+        assets_team = TeamFactory(billing_type=models.TeamBillingType.assets)
+        assets_cores_team = TeamFactory(
+            billing_type=models.TeamBillingType.assets_cores,
+        )
+        distribute_team = TeamFactory(
+            billing_type=models.TeamBillingType.distribute,
+        )
+        average_team = TeamFactory(billing_type=models.TeamBillingType.average)
+        self.assertEquals(
+            self.collector._get_affected_types(
+                self.today,
+                set([cores_count.id]),
+            ),
+            set([
+                cores_count.id,
+                assets_cores_team.id,
+                distribute_team.id,
+                average_team.id,
+                ps.id,
+            ]),
+        )
+        self.assertEquals(
+            self.collector._get_affected_types(
+                self.today,
+                set([assets_count.id]),
+            ),
+            set([
+                assets_count.id,
+                assets_team.id,
+                assets_cores_team.id,
+                distribute_team.id,
+                average_team.id,
+                ps.id,
+            ]),
+        )
+        self.assertEquals(
+            self.collector._get_affected_types(
+                self.today,
+                set([time_team.id]),
+            ),
+            set([time_team.id, distribute_team.id, average_team.id, ps.id]),
+        )
+
+    @mock.patch('ralph_scrooge.plugins.cost.collector.Collector._save_costs')
+    @mock.patch('ralph_scrooge.plugins.cost.collector.Collector._collect_costs')  # noqa
+    @mock.patch('ralph_scrooge.plugins.cost.collector.Collector.get_plugins')
+    def test_process_incremental(
+        self,
+        get_plugins_mock,
+        collect_costs_mock,
+        save_costs_mock,
+    ):
+        team1, team2 = TeamFactory.create_batch(2)
+        plugins = [
+            AttributeDict(
+                name=team.name,
+                plugin_name='team_plugin',
+                plugin_kwargs={'team': team},
+            ) for team in (team1, team2)
+        ]
+        get_plugins_mock.return_value = plugins
+        collect_costs_mock.return_value = {}
+        CostDateStatusFactory(date=self.today, calculated=True)
+        models.CostInputChange.objects.create(date=self.today, type=team2)
+        self.collector.process(
+            self.today,
+            service_environments=self.service_environments,
+            incremental=True,
+        )
+        collect_costs_mock.assert_called_once_with(
+            self.today,
+            self.service_environments,
+            False,
+            [plugins[1]],
+        )
+        self.assertFalse(models.CostInputChange.objects.exists())
+
+    @mock.patch('ralph_scrooge.plugins.cost.collector.Collector._collect_costs')  # noqa
+    def test_process_deletes_monthly_costs(self, collect_costs_mock):
+        collect_costs_mock.return_value = {}
+        for forecast in (False, True):
+            models.MonthlyCost.objects.create(
+                month=self.today.replace(day=1),
+                service_environment=self.service_environments[0],
+                type=TeamFactory(),
+                forecast=forecast,
+                cost=10,
+            )
+        self.collector.process(
+            self.today,
+            service_environments=self.service_environments,
+            plugins=[],
+            refresh_monthly=False,
+        )
+        # rollup of month is deleted until it's refreshed (reports are using
+        # daily costs)
+        self.assertEquals(
+            list(models.MonthlyCost.objects.values_list(
+                'forecast',
+                flat=True,
+            )),
+            [True],
+        )
+
+    @override_settings(COSTS_SAVE_BATCH_SIZE=2)
+    @mock.patch('ralph_scrooge.plugins.cost.collector.DailyCost.objects.bulk_create')  # noqa
+    def test_save_costs_in_batches(self, bulk_create_mock):
+        ps1, ps2 = PricingServiceFactory.create_batch(2)
+        costs = {
+            self.service_environments[0].id: [
+                {
+                    'type': ps1,
+                    'cost': D(10),
+                    '_children': [{'type': ps2, 'cost': D(5)}],
+                },
+            ],
+            self.service_environments[1].id: [
+                {'type': ps2, 'cost': D(20)},
+            ],
+        }
+        self.collector._save_costs(self.today, costs, False)
+        batches = [c[0][0] for c in bulk_create_mock.call_args_list]
+        self.assertEquals([len(batch) for batch in batches], [2, 1])
+        self.assertEquals(
+            sorted(dc.path for batch in batches for dc in batch),
+            sorted([
+                str(ps1.id),
+                '{}/{}'.format(ps1.id, ps2.id),
+                str(ps2.id),
+            ]),
+        )
+        self.assertTrue(
+            models.CostDateStatus.objects.get(date=self.today).calculated
+        )
+
     # TODO: add more unit tests
+
+    @override_settings(COSTS_PROFILING=True)
+    @mock.patch('ralph_scrooge.plugins.cost.collector.plugin_runner.run')
+    def test_collect_plugins_costs_profiled(self, run_mock):
+        team = TeamFactory()
+        se = self.service_environments[0]
+
+        def run(*args, **kwargs):
+            # single query in plugin
+            list(models.ServiceEnvironment.objects.all())
+            return {se.id: [{'type': team, 'cost': D(10), '_children': [
+                {'type': team, 'cost': D(10)},
+            ]}]}
+        run_mock.side_effect = run
+        self.collector._profiles = []
+        self.collector._collect_plugins_costs(
+            self.today,
+            self.service_environments,
+            False,
+            [AttributeDict(name=team.name, plugin_name='team_plugin')],
+        )
+        self.collector._save_profiles(self.today, False)
+        profile = models.CostPluginProfile.objects.get()
+        self.assertEquals(profile.date, self.today)
+        self.assertEquals(profile.name, team.name)
+        self.assertEquals(profile.plugin_name, 'team_plugin')
+        self.assertFalse(profile.total_cost)
+        self.assertEquals(profile.queries_count, 1)
+        self.assertEquals(profile.rows_count, 2)
+        self.assertEquals(profile.nodes_count, 2)
+
+    @override_settings(COSTS_PROFILING=False)
+    @mock.patch('ralph_scrooge.plugins.cost.collector.plugin_runner.run')
+    def test_collect_plugins_costs_profiling_disabled(self, run_mock):
+        team = TeamFactory()
+        run_mock.return_value = {}
+        self.collector._profiles = []
+        self.collector._collect_plugins_costs(
+            self.today,
+            self.service_environments,
+            False,
+            [AttributeDict(name=team.name, plugin_name='team_plugin')],
+        )
+        self.assertEquals(self.collector._profiles, [])
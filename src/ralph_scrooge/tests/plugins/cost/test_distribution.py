@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from decimal import Decimal as D
+from unittest import skipUnless
+
+from django.test import TestCase
+
+from ralph_scrooge.plugins.cost import distribution
+
+
+class TestAllocate(TestCase):
+    def test_allocate_sum_equal_to_total(self):
+        for total, weights in [
+            (D('100'), [1, 1, 1]),
+            (D('99.999999'), range(1, 8)),
+            (D('-0.000005'), [1, 1]),
+            (D('1234.5678901'), [0.1, 0.2, 0.3]),
+        ]:
+            costs = distribution.allocate(total, weights)
+            self.assertEquals(sum(costs), total.quantize(D('0.000001')))
+            self.assertEquals(len(costs), len(weights))
+
+    def test_allocate_largest_remainder(self):
+        self.assertEquals(
+            distribution.allocate(D('0.00001'), [1, 2, 3]),
+            [D('0.000002'), D('0.000003'), D('0.000005')],
+        )
+
+    def test_allocate_zero_weights(self):
+        self.assertEquals(distribution.allocate(D('10'), [0, 0]), [0, 0])
+
+    def test_allocate_places(self):
+        self.assertEquals(
+            distribution.allocate(D('1'), [1, 1, 1], places=2),
+            [D('0.34'), D('0.33'), D('0.33')],
+        )
+
+
+@skipUnless(distribution.is_available(), 'NumPy is not installed')
+class TestDistribution(TestCase):
+    def setUp(self):
+        self.hierarchy = {
+            1: (D('100'), {
+                2: (D('70'), {}),
+                3: (D('30'), {}),
+            }),
+            4: (D('-10'), {}),
+        }
+
+    def _get_costs(self, po_costs, type_id):
+        return [
+            [c for c in costs if c.type_id == type_id][0].cost
+            for costs in po_costs
+        ]
+
+    def test_distribute_costs(self):
+        po_costs = distribution.distribute_costs(
+            self.hierarchy,
+            pricing_objects=[11, 12],
+            usages=[[10, 0], [30, 40]],
+            total_usages=[40, 40],
+            percentage=[50, 50],
+        )
+        self.assertEquals(self._get_costs(po_costs, 1), [D('12.5'), D('87.5')])
+        self.assertEquals(
+            self._get_costs(po_costs, 4),
+            [D('-1.25'), D('-8.75')],
+        )
+        self.assertEquals(
+            [c['pricing_object_id'] for costs in po_costs for c in costs],
+            [11, 11, 12, 12],
+        )
+        children = [c for c in po_costs[1] if c.type_id == 1][0].children
+        self.assertEquals(
+            sorted((c.type_id, c.cost) for c in children),
+            [(2, D('61.25')), (3, D('26.25'))],
+        )
+
+    def test_distributed_costs_sum_up_to_total(self):
+        po_costs = distribution.distribute_costs(
+            {1: (D('100'), {})},
+            pricing_objects=[11, 12, 13],
+            usages=[[1], [1], [1]],
+            total_usages=[3],
+            percentage=[100],
+        )
+        costs = self._get_costs(po_costs, 1)
+        self.assertEquals(sum(costs), D('100'))
+        self.assertEquals(
+            sorted(costs),
+            [D('33.333333'), D('33.333333'), D('33.333334')],
+        )
+        # value is set only for first depth when there is single usage type
+        self.assertEquals(po_costs[0][0].value, 1)
+
+    def test_usage_type_without_usages_skipped(self):
+        po_costs = distribution.distribute_costs(
+            {1: (D('100'), {})},
+            pricing_objects=[11, 12],
+            usages=[[1, 0], [3, 0]],
+            total_usages=[4, 0],
+            percentage=[50, 50],
+        )
+        self.assertEquals(self._get_costs(po_costs, 1), [D('12.5'), D('37.5')])
+
+    def test_first_depth_only(self):
+        po_costs = distribution.distribute_costs(
+            self.hierarchy,
+            pricing_objects=[11],
+            usages=[[10]],
+            total_usages=[10],
+            percentage=[100],
+            first_depth_only=True,
+        )
+        self.assertTrue(all(c.children is None for c in po_costs[0]))
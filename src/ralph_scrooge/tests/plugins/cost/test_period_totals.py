@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from datetime import date
+from decimal import Decimal as D
+
+from django.test import TestCase
+
+from ralph_scrooge.models import CostInputChange
+from ralph_scrooge.plugins.cost.period_totals import PeriodTotals, get_key
+from ralph_scrooge.plugins.cost.usage_type import UsageTypePlugin
+from ralph_scrooge.tests.utils.factory import (
+    DailyUsageFactory,
+    UsagePriceFactory,
+    UsageTypeFactory,
+)
+
+
+class TestPeriodTotals(TestCase):
+    def setUp(self):
+        self.usage_type = UsageTypeFactory(by_cost=True)
+        self.usage_price = UsagePriceFactory(
+            type=self.usage_type,
+            start=date(2014, 10, 1),
+            end=date(2014, 10, 31),
+            cost=1000,
+        )
+        for day in (1, 10, 20):
+            DailyUsageFactory(
+                type=self.usage_type,
+                date=date(2014, 10, day),
+                value=50,
+            )
+
+    def _get_price(self):
+        return UsageTypePlugin._get_price_from_cost(
+            self.usage_price,
+            False,
+        )
+
+    def test_total_calculated_once(self):
+        with PeriodTotals():
+            self.assertEquals(self._get_price(), D(1000) / 150)
+            with self.assertNumQueries(0):
+                self.assertEquals(self._get_price(), D(1000) / 150)
+
+    def test_not_cached_when_not_active(self):
+        self.assertEquals(self._get_price(), D(1000) / 150)
+        with self.assertNumQueries(1):
+            self.assertEquals(self._get_price(), D(1000) / 150)
+
+    def test_invalidated_when_usages_changed(self):
+        with PeriodTotals():
+            self.assertEquals(self._get_price(), D(1000) / 150)
+            DailyUsageFactory(
+                type=self.usage_type,
+                date=date(2014, 10, 5),
+                value=50,
+            )
+            CostInputChange.mark_usages(
+                [self.usage_type],
+                date(2014, 10, 5),
+                date(2014, 10, 5),
+            )
+            self.assertEquals(self._get_price(), D(1000) / 200)
+
+    def test_invalidate(self):
+        period_totals = PeriodTotals()
+        key1 = get_key(1, date(2014, 10, 1), date(2014, 10, 31))
+        key2 = get_key(1, date(2014, 11, 1), date(2014, 11, 30))
+        key3 = get_key(2, date(2014, 10, 1), date(2014, 10, 31))
+        for key in (key1, key2, key3):
+            period_totals.set(key, 10)
+        period_totals.invalidate(set([1]), date(2014, 10, 31), None)
+        self.assertIsNone(period_totals.get(key1))
+        self.assertIsNone(period_totals.get(key2))
+        self.assertEquals(period_totals.get(key3), 10)
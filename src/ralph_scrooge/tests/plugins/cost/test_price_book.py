@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from datetime import date
+
+from django.test import TestCase
+
+from ralph_scrooge.plugins.cost.price_book import PriceBook
+from ralph_scrooge.tests.utils.factory import (
+    UsagePriceFactory,
+    UsageTypeFactory,
+    WarehouseFactory,
+)
+
+
+class TestPriceBook(TestCase):
+    def setUp(self):
+        self.usage_type = UsageTypeFactory()
+        self.warehouse1, self.warehouse2 = WarehouseFactory.create_batch(2)
+        self.usage_price1 = UsagePriceFactory(
+            type=self.usage_type,
+            start=date(2014, 10, 1),
+            end=date(2014, 10, 31),
+            warehouse=self.warehouse1,
+        )
+        self.usage_price2 = UsagePriceFactory(
+            type=self.usage_type,
+            start=date(2014, 11, 1),
+            end=date(2014, 11, 30),
+            warehouse=self.warehouse1,
+        )
+        self.usage_price3 = UsagePriceFactory(
+            type=self.usage_type,
+            start=date(2014, 10, 10),
+            end=date(2014, 10, 20),
+            warehouse=self.warehouse2,
+        )
+
+    def test_get_usage_prices(self):
+        price_book = PriceBook()
+        for day, warehouse, usage_prices in [
+            (date(2014, 9, 30), None, []),
+            (date(2014, 10, 1), None, [self.usage_price1]),
+            (date(2014, 10, 25), self.warehouse1, [self.usage_price1]),
+            (date(2014, 11, 15), self.warehouse1, [self.usage_price2]),
+            (date(2014, 11, 15), self.warehouse2, []),
+            (date(2014, 12, 1), None, []),
+        ]:
+            self.assertEquals(
+                price_book.get_usage_prices(
+                    self.usage_type,
+                    day,
+                    warehouse=warehouse,
+                ),
+                usage_prices,
+            )
+
+    def test_get_usage_prices_overlapping(self):
+        price_book = PriceBook()
+        # usage prices overlapping only if warehouse is not specified
+        self.assertEquals(
+            price_book.get_usage_prices(self.usage_type, date(2014, 10, 15)),
+            [self.usage_price1, self.usage_price3],
+        )
+        self.assertEquals(
+            price_book.get_usage_prices(
+                self.usage_type,
+                date(2014, 10, 15),
+                warehouse=self.warehouse2,
+            ),
+            [self.usage_price3],
+        )
+        self.assertEquals(
+            price_book.get_usage_prices(self.usage_type, date(2014, 10, 25)),
+            [self.usage_price1],
+        )
+
+    def test_get_usage_prices_between(self):
+        price_book = PriceBook()
+        self.assertEquals(
+            price_book.get_usage_prices_between(
+                self.usage_type,
+                date(2014, 10, 25),
+                date(2014, 11, 2),
+                warehouse=self.warehouse1,
+            ),
+            [self.usage_price1, self.usage_price2],
+        )
+
+    def test_load_only_period(self):
+        with self.assertNumQueries(1):
+            price_book = PriceBook(date(2014, 11, 1), date(2014, 11, 30))
+            self.assertEquals(
+                price_book.get_usage_prices(
+                    self.usage_type,
+                    date(2014, 10, 15),
+                ),
+                [],
+            )
+            self.assertEquals(
+                price_book.get_usage_prices(
+                    self.usage_type,
+                    date(2014, 11, 15),
+                ),
+                [self.usage_price2],
+            )
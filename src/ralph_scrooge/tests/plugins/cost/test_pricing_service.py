@@ -7,16 +7,19 @@ from __future__ import unicode_literals
 from datetime import date
 from dateutil import rrule
 from decimal import Decimal as D
+from unittest import skipUnless
 import mock
 
 from django.test import TestCase
 from django.test.utils import override_settings
 
 from ralph_scrooge import models
+from ralph_scrooge.plugins.cost import distribution
 from ralph_scrooge.plugins.cost.pricing_service import PricingServicePlugin
 from ralph_scrooge.plugins.cost.pricing_service_fixed_price import (
     PricingServiceFixedPricePlugin
 )
+from ralph_scrooge.plugins.cost.snapshot import DailySnapshot
 from ralph_scrooge.tests import ScroogeTestCase
 from ralph_scrooge.tests.plugins.cost.sample.pricing_service_costs import (
     PRICING_SERVICE_COSTS,
@@ -630,6 +633,27 @@ class TestPricingServicePlugin(TestCase):
 
         self.assertItemsEqual(costs, result)
 
+    @skipUnless(distribution.is_available(), 'NumPy is not installed')
+    def test_costs_numpy_engine(self):
+        kwargs = dict(
+            type='costs',
+            date=self.today,
+            pricing_service=self.pricing_service1,
+            service_environments=self.service_environments,
+            forecast=True,
+        )
+
+        def sort_costs(costs):
+            return {
+                se: sorted(se_costs, key=lambda c: c['pricing_object_id'])
+                for se, se_costs in costs.items()
+            }
+
+        costs = PricingServicePlugin(**kwargs)
+        with override_settings(COSTS_DISTRIBUTION_ENGINE='numpy'):
+            numpy_costs = PricingServicePlugin(**kwargs)
+        self.assertEquals(sort_costs(numpy_costs), sort_costs(costs))
+
     def test_total_costs(self):
         costs = PricingServicePlugin(
             type='total_cost',
@@ -671,6 +695,28 @@ class TestPricingServicePlugin(TestCase):
             ]
         })
 
+    def test_total_costs_cached_in_snapshot(self):
+        kwargs = dict(
+            type='total_cost',
+            date=self.today,
+            pricing_service=self.pricing_service1,
+            service_environments=self.service_environments,
+            forecast=True,
+        )
+        with DailySnapshot(self.today):
+            costs = PricingServicePlugin(**kwargs)
+            with self.assertNumQueries(0):
+                self.assertEquals(PricingServicePlugin(**kwargs), costs)
+            with self.assertNumQueries(0):
+                PricingServicePlugin(
+                    for_all_service_environments=True,
+                    **kwargs
+                )
+        self.assertItemsEqual(
+            costs,
+            {self.pricing_service1.id: (D('1010'), {})}
+        )
+
 
 class TestPricingServiceDependency(TestCase):
     """
@@ -964,7 +1010,7 @@ class TestPricingServiceDiffCharging(TestCase):
         self.pricing_service3.charge_diff_to_real_costs = self.pricing_service1
         self.pricing_service3.save()
 
-    @mock.patch('ralph_scrooge.plugins.cost.pricing_service.PricingServiceBasePlugin.total_cost')  # noqa
+    @mock.patch('ralph_scrooge.plugins.cost.pricing_service.PricingServiceBasePlugin._costs')  # noqa
     @mock.patch('ralph_scrooge.plugins.cost.pricing_service_fixed_price.PricingServiceFixedPricePlugin.total_cost')  # noqa
     def test_get_service_charging_by_diffs(self, fixed_total_mock, total_mock):
         def total_cost(pricing_service, *args, **kwargs):
@@ -992,7 +1038,14 @@ class TestPricingServiceDiffCharging(TestCase):
             self.pricing_service2.id: (-900, {}),
             self.pricing_service3.id: (900, {}),
         })
-        calls = [
+        total_mock.assert_has_calls([
+            mock.call(
+                date=self.today,
+                pricing_service=x,
+                forecast=False,
+            ) for x in (self.pricing_service2, self.pricing_service3)
+        ], any_order=True)
+        fixed_total_mock.assert_has_calls([
             mock.call(
                 date=self.today,
                 pricing_service=x,
@@ -1000,11 +1053,22 @@ class TestPricingServiceDiffCharging(TestCase):
                 service_environments=None,
                 forecast=False,
             ) for x in (self.pricing_service2, self.pricing_service3)
-        ]
-        total_mock.assert_has_calls(calls, any_order=True)
-        fixed_total_mock.assert_has_calls(calls, any_order=True)
+        ], any_order=True)
+
+    @mock.patch('ralph_scrooge.plugins.cost.pricing_service.PricingServiceBasePlugin._costs')  # noqa
+    def test_get_service_charging_by_diffs_universal_plugin(self, costs_mock):
+        pricing_service4 = PricingServiceFactory()
+        pricing_service4.charge_diff_to_real_costs = self.pricing_service3
+        pricing_service4.save()
+        result = PricingServicePlugin._get_service_charging_by_diffs(
+            pricing_service=self.pricing_service3,
+            date=self.today,
+            forecast=False,
+        )
+        self.assertEquals(result, {})
+        self.assertFalse(costs_mock.called)
 
-    @mock.patch('ralph_scrooge.plugins.cost.pricing_service.PricingServiceBasePlugin.total_cost')  # noqa
+    @mock.patch('ralph_scrooge.plugins.cost.pricing_service.PricingServiceBasePlugin._costs')  # noqa
     @mock.patch('ralph_scrooge.plugins.cost.pricing_service_fixed_price.PricingServiceFixedPricePlugin.total_cost')  # noqa
     def test_get_service_charging_by_diffs_error(
         self,
@@ -1032,7 +1096,7 @@ class TestPricingServiceDiffCharging(TestCase):
             self.pricing_service2.id: (0, {}),
         })
 
-    @mock.patch('ralph_scrooge.plugins.cost.pricing_service.PricingServiceBasePlugin.total_cost')  # noqa
+    @mock.patch('ralph_scrooge.plugins.cost.pricing_service.PricingServiceBasePlugin._costs')  # noqa
     @mock.patch('ralph_scrooge.plugins.cost.pricing_service_fixed_price.PricingServiceFixedPricePlugin.total_cost')  # noqa
     def test_get_pricing_service_costs(self, fixed_total_mock, total_mock):
         def total_cost(pricing_service, *args, **kwargs):
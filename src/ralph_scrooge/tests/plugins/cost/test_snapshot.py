@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from datetime import date
+import mock
+
+from django.test import TestCase
+
+from ralph_scrooge import models
+from ralph_scrooge.plugins.cost.snapshot import DailySnapshot
+from ralph_scrooge.plugins.cost.team import TeamPlugin
+from ralph_scrooge.plugins.cost.usage_type import UsageTypePlugin
+from ralph_scrooge.tests.utils.factory import (
+    DailyPricingObjectFactory,
+    DailyUsageFactory,
+    PricingServiceFactory,
+    ServiceEnvironmentFactory,
+    TeamCostFactory,
+    TeamFactory,
+    UsagePriceFactory,
+    UsageTypeFactory,
+    WarehouseFactory,
+)
+
+
+class TestDailySnapshot(TestCase):
+    def setUp(self):
+        self.today = date(2014, 10, 10)
+        self.usage_type = UsageTypeFactory(usage_type='BU')
+        self.warehouse1 = WarehouseFactory()
+        self.warehouse2 = WarehouseFactory()
+        self.se1, self.se2, self.se3 = ServiceEnvironmentFactory.create_batch(
+            3
+        )
+        for se, warehouse, value in [
+            (self.se1, self.warehouse1, 10),
+            (self.se1, self.warehouse2, 20),
+            (self.se2, self.warehouse1, 30),
+            (self.se3, self.warehouse2, 40),
+        ]:
+            DailyUsageFactory(
+                date=self.today,
+                type=self.usage_type,
+                service_environment=se,
+                daily_pricing_object=DailyPricingObjectFactory(
+                    date=self.today,
+                    service_environment=se,
+                ),
+                warehouse=warehouse,
+                value=value,
+            )
+        # usage from another day should not be loaded
+        DailyUsageFactory(date=date(2014, 10, 11), type=self.usage_type)
+        UsagePriceFactory(
+            type=self.usage_type,
+            start=date(2014, 10, 1),
+            end=date(2014, 10, 31),
+            price=10,
+        )
+        self.team = TeamFactory(billing_type=models.TeamBillingType.time)
+        self.team_cost = TeamCostFactory(
+            team=self.team,
+            start=date(2014, 10, 1),
+            end=date(2014, 10, 10),
+            cost=100,
+        )
+        for se, percent in [(self.se1, 60), (self.se2, 40)]:
+            models.TeamServiceEnvironmentPercent.objects.create(
+                team_cost=self.team_cost,
+                service_environment=se,
+                percent=percent,
+            )
+
+    def test_get_active(self):
+        self.assertIsNone(DailySnapshot.get_active(self.today))
+        with DailySnapshot(self.today) as snapshot:
+            self.assertEquals(DailySnapshot.get_active(self.today), snapshot)
+        self.assertIsNone(DailySnapshot.get_active(self.today))
+
+    def test_get_usages(self):
+        snapshot = DailySnapshot(self.today)
+        self.assertEquals(
+            sorted(u.value for u in snapshot.get_usages(self.usage_type)),
+            [10, 20, 30, 40],
+        )
+        self.assertEquals(
+            snapshot.get_total_usage(
+                self.usage_type,
+                warehouse=self.warehouse1,
+            ),
+            40,
+        )
+        self.assertEquals(
+            snapshot.get_total_usage(
+                self.usage_type,
+                service_environments=[self.se1, self.se3],
+            ),
+            70,
+        )
+        self.assertEquals(
+            snapshot.get_total_usage(
+                self.usage_type,
+                excluded_services=[self.se1.service],
+                excluded_services_environments=[self.se2],
+            ),
+            40,
+        )
+
+    def test_get_usages_per_service_environment(self):
+        snapshot = DailySnapshot(self.today)
+        self.assertEquals(
+            snapshot.get_usages_per_service_environment(self.usage_type),
+            {self.se1.id: 30, self.se2.id: 30, self.se3.id: 40},
+        )
+
+    def test_total_usage_equal_to_database(self):
+        plugin = UsageTypePlugin
+        kwargs = dict(
+            usage_type=self.usage_type,
+            date=self.today,
+            excluded_services=[self.se2.service],
+        )
+        total = plugin._get_total_usage(**kwargs)
+        with DailySnapshot(self.today):
+            self.assertEquals(plugin._get_total_usage(**kwargs), total)
+
+    def test_usage_type_costs_equal_to_database(self):
+        kwargs = dict(
+            date=self.today,
+            usage_type=self.usage_type,
+            service_environments=models.ServiceEnvironment.objects.all(),
+        )
+        costs = UsageTypePlugin.costs(**kwargs)
+        with DailySnapshot(self.today):
+            snapshot_costs = UsageTypePlugin.costs(**kwargs)
+        self.assertEquals(
+            {k: sorted(v) for k, v in costs.items()},
+            {k: sorted(v) for k, v in snapshot_costs.items()},
+        )
+
+    def test_team_costs_equal_to_database(self):
+        kwargs = dict(
+            date=self.today,
+            team=self.team,
+            service_environments=[self.se1, self.se2, self.se3],
+        )
+        costs = TeamPlugin.costs(**kwargs)
+        with DailySnapshot(self.today):
+            self.assertEquals(TeamPlugin.costs(**kwargs), costs)
+
+    def test_get_pricing_services_in_dependency_order(self):
+        ps1, ps2, ps3, ps4 = PricingServiceFactory.create_batch(4)
+        dependencies = {
+            ps1.id: [ps2, ps3],
+            ps2.id: [ps4],
+            ps3.id: [ps2],
+        }
+
+        def get_dependent_services(pricing_service, date, exclude=None):
+            return dependencies.get(pricing_service.id, [])
+
+        with mock.patch.object(
+            models.PricingService,
+            'get_dependent_services',
+            get_dependent_services,
+        ):
+            snapshot = DailySnapshot(self.today)
+            self.assertEquals(
+                snapshot.get_pricing_services_in_dependency_order(),
+                [ps4, ps2, ps3, ps1],
+            )
+            self.assertEquals(
+                snapshot.get_dependent_services(ps3),
+                [ps2],
+            )
+
+    def test_pricing_service_costs_cache(self):
+        snapshot = DailySnapshot(self.today)
+        key = ('pricing_service_plugin', 1, self.today, False, None)
+        self.assertIsNone(snapshot.get_pricing_service_costs(key))
+        snapshot.set_pricing_service_costs(key, {1: (10, {})})
+        self.assertEquals(
+            snapshot.get_pricing_service_costs(key),
+            {1: (10, {})},
+        )
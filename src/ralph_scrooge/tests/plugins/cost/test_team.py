@@ -11,15 +11,19 @@ from decimal import Decimal as D
 from django.test import TestCase
 
 from ralph_scrooge import models
+from ralph_scrooge.plugins.cost.snapshot import DailySnapshot
 from ralph_scrooge.plugins.cost.team import TeamPlugin
 from ralph_scrooge.plugins.cost.base import (
     NoPriceCostError,
     MultiplePriceCostError,
 )
 from ralph_scrooge.tests.utils.factory import (
+    DailyPricingObjectFactory,
+    DailyUsageFactory,
     ServiceEnvironmentFactory,
     TeamCostFactory,
     TeamFactory,
+    UsageTypeFactory,
 )
 
 
@@ -700,3 +704,116 @@ class TestTeamPlugin(TestCase):
             )
 
     # TODO: test other methods
+
+    # =========================================================================
+    # ALL TEAMS
+    # =========================================================================
+    def _get_teams_costs_separately(self, forecast=False):
+        result = {}
+        for team in self.teams:
+            result[team.id] = TeamPlugin.costs(
+                date=self.today,
+                service_environments=self.service_environments_subset,
+                team=team,
+                forecast=forecast,
+            )
+        return result
+
+    def test_teams_shares_calculated_once_with_snapshot(self):
+        with mock.patch.object(
+            TeamPlugin,
+            '_get_team_time_shares',
+            wraps=TeamPlugin._get_team_time_shares,
+        ) as time_shares_mock:
+            costs = self._get_teams_costs_separately()
+            # time, distributed and average team
+            self.assertEquals(time_shares_mock.call_count, 3)
+            time_shares_mock.reset_mock()
+            with DailySnapshot(self.today):
+                snapshot_costs = self._get_teams_costs_separately()
+            self.assertEquals(time_shares_mock.call_count, 1)
+        self.assertEquals(snapshot_costs, costs)
+
+    # =========================================================================
+    # ASSETS & CORES COUNTS
+    # =========================================================================
+    def _create_assets_and_cores(self):
+        cores_usage_type = UsageTypeFactory(symbol='physical_cpu_cores')
+        for se, assets_count in [
+            (self.service_environment1, 2),
+            (self.service_environment2, 3),
+            (self.service_environment3, 5),
+        ]:
+            for i in range(assets_count):
+                DailyUsageFactory(
+                    date=self.today,
+                    type=cores_usage_type,
+                    service_environment=se,
+                    daily_pricing_object=DailyPricingObjectFactory(
+                        date=self.today,
+                        service_environment=se,
+                    ),
+                    value=4,
+                )
+        self.team_assets.excluded_services.add(
+            self.service_environment3.service
+        )
+
+    def test_assets_and_cores_count(self):
+        self._create_assets_and_cores()
+        self.assertEquals(
+            TeamPlugin._get_assets_count_by_service_environment(
+                self.today,
+                self.service_environments_subset,
+            ),
+            {
+                self.service_environment1.id: 2,
+                self.service_environment2.id: 3,
+            }
+        )
+        self.assertEquals(
+            TeamPlugin._get_total_assets_count(self.today, set()),
+            10,
+        )
+        self.assertEquals(
+            TeamPlugin._get_cores_count_by_service_environment(
+                self.today,
+                [self.service_environment3],
+            ),
+            {self.service_environment3.id: 20},
+        )
+        self.assertEquals(
+            TeamPlugin._get_total_cores_count(
+                self.today,
+                TeamPlugin._get_excluded_service_environments(
+                    self.team_assets
+                ),
+            ),
+            20,
+        )
+
+    def test_team_assets_costs_with_excluded_services(self):
+        self._create_assets_and_cores()
+        costs = TeamPlugin.costs(
+            date=self.today,
+            service_environments=self.service_environments,
+            team=self.team_assets,
+            forecast=False,
+        )
+        # service environment 3 is excluded from total count
+        self.assertEquals(costs, {
+            self.service_environment1.id: [
+                {
+                    'cost': D('12'),  # 2 / 5 * 30
+                    'type': self.team_assets,
+                    'percent': D(2) / D(5),
+                }
+            ],
+            self.service_environment2.id: [
+                {
+                    'cost': D('18'),  # 3 / 5 * 30
+                    'type': self.team_assets,
+                    'percent': D(3) / D(5),
+                }
+            ]
+        })
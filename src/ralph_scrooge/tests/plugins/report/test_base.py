@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from datetime import date
+
+from django.test import TestCase
+
+from ralph_scrooge.models import MonthlyCost, ServiceEnvironment
+from ralph_scrooge.plugins.report.base import BaseReportPlugin
+from ralph_scrooge.plugins.report.report_data import ReportData
+from ralph_scrooge.tests.utils.factory import (
+    BaseUsageFactory,
+    DailyCostFactory,
+    ServiceEnvironmentFactory,
+)
+
+
+class SampleReportPlugin(BaseReportPlugin):
+    base_usage_cost_symbol = 'bu_{}_cost'
+    base_usage_count_symbol = 'bu_{}_count'
+
+
+class TestBaseReportPlugin(TestCase):
+    def setUp(self):
+        self.plugin = SampleReportPlugin()
+        self.base_usage = BaseUsageFactory()
+        self.se1, self.se2 = ServiceEnvironmentFactory.create_batch(2)
+        self.service_environments = ServiceEnvironment.objects.all()
+        for day in (
+            date(2014, 9, 30),
+            date(2014, 10, 1),
+            date(2014, 10, 15),
+            date(2014, 11, 1),
+            date(2014, 11, 2),
+        ):
+            for se, cost in ((self.se1, 10), (self.se2, 20)):
+                DailyCostFactory(
+                    date=day,
+                    service_environment=se,
+                    type=self.base_usage,
+                    cost=cost,
+                    value=1,
+                )
+        self.cost_key = 'bu_{}_cost'.format(self.base_usage.id)
+        self.count_key = 'bu_{}_count'.format(self.base_usage.id)
+
+    def _get_costs(self):
+        costs = self.plugin.costs(
+            start=date(2014, 9, 30),
+            end=date(2014, 11, 1),
+            base_usage=self.base_usage,
+            service_environments=self.service_environments,
+        )
+        return dict(
+            (se_id, (se_costs[self.cost_key], se_costs[self.count_key]))
+            for se_id, se_costs in costs.items()
+        )
+
+    def test_costs_without_monthly_costs(self):
+        self.assertEquals(self._get_costs(), {
+            self.se1.id: (40, 4),
+            self.se2.id: (80, 4),
+        })
+
+    def test_costs_with_monthly_costs(self):
+        MonthlyCost.refresh(date(2014, 9, 1), date(2014, 11, 30), False)
+        # change rollup of october to check that it is used in report
+        MonthlyCost.objects.filter(
+            month=date(2014, 10, 1),
+            service_environment=self.se1,
+        ).update(cost=100)
+        self.assertEquals(self._get_costs(), {
+            self.se1.id: (120, 4),
+            self.se2.id: (80, 4),
+        })
+
+    def test_costs_with_report_data(self):
+        other_base_usage = BaseUsageFactory()
+        DailyCostFactory(
+            date=date(2014, 10, 1),
+            service_environment=self.se1,
+            type=other_base_usage,
+            cost=5,
+            value=1,
+        )
+        # check of monthly rollup of october and sum of daily costs
+        with self.assertNumQueries(2):
+            report_data = ReportData(
+                date(2014, 9, 30),
+                date(2014, 11, 1),
+                service_environments=self.service_environments,
+            )
+        self.assertEquals(report_data.get_costs(other_base_usage), {
+            self.se1.id: (5, 1),
+        })
+        with report_data:
+            with self.assertNumQueries(0):
+                self.assertEquals(self._get_costs(), {
+                    self.se1.id: (40, 4),
+                    self.se2.id: (80, 4),
+                })
+        self.assertIsNone(
+            ReportData.get_active(date(2014, 9, 30), date(2014, 11, 1))
+        )
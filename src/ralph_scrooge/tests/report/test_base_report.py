@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import os
+import shutil
+import tempfile
+import time
+
+import mock
+from django.core.cache import get_cache
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase
+from django.test.utils import override_settings
+
+from ralph_scrooge.report import base_report
+from ralph_scrooge.report.base_report import BaseReport
+from ralph_scrooge.utils.result_store import ResultStore
+from ralph_scrooge.utils.worker_job import _get_cache_key
+
+
+class SampleReport(BaseReport):
+    cache_section = 'sample-report'
+
+    @classmethod
+    def get_header(cls, **kwargs):
+        return [['Name', 'Value']]
+
+    @classmethod
+    def get_data(cls, rows_count, **kwargs):
+        yield 50, []
+        yield 100, [['row{}'.format(i), i] for i in range(rows_count)]
+
+
+class TestBaseReport(TestCase):
+    def setUp(self):
+        self.export_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.export_dir)
+        settings_override = override_settings(
+            REPORTS_EXPORT_DIR=self.export_dir,
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_run(self):
+        self.assertEquals(list(SampleReport.run(rows_count=2)), [
+            (50, ([['Name', 'Value']], [])),
+            (100, ([['Name', 'Value']], [['row0', 0], ['row1', 1]])),
+        ])
+
+    def test_run_export(self):
+        result = list(SampleReport.run(export=True, rows_count=2))
+        self.assertEquals(len(result), 1)
+        progress, (header, path) = result[0]
+        self.assertEquals(progress, 100)
+        self.assertEquals(header, [['Name', 'Value']])
+        self.assertEquals(os.path.dirname(path), self.export_dir)
+        with open(path, 'rb') as export_file:
+            self.assertEquals(
+                export_file.read().splitlines(),
+                [b'row0,0', b'row1,1'],
+            )
+
+    @override_settings(REPORTS_EXPORT_DIR=None)
+    def test_export_dir_required_with_workers(self):
+        with mock.patch.object(
+            base_report,
+            'get_cache',
+            return_value=get_cache('locmem://'),
+        ):
+            self.assertRaises(
+                ImproperlyConfigured,
+                SampleReport.get_export_dir,
+            )
+
+    def test_expired_exports_removed(self):
+        expired_path = SampleReport.export_csv(rows_count=1)
+        expired_time = (
+            time.time() - SampleReport.cache_final_result_timeout - 1
+        )
+        os.utime(expired_path, (expired_time, expired_time))
+        recent_path = SampleReport.export_csv(rows_count=1)
+        path = SampleReport.export_csv(rows_count=1)
+        self.assertEquals(
+            sorted(os.listdir(self.export_dir)),
+            sorted([os.path.basename(p) for p in (recent_path, path)]),
+        )
+
+    def test_export_removed_with_cache(self):
+        cache = get_cache('locmem://')
+        cache.clear()
+        path = SampleReport.export_csv(rows_count=1)
+        key = _get_cache_key(
+            SampleReport.cache_section,
+            export=True,
+            rows_count=1,
+        )
+        handle = ResultStore(cache).save(key, ([], path))
+        cache.set(key, (100, None, handle))
+        with mock.patch.object(base_report, 'get_cache', return_value=cache):
+            with mock.patch(
+                'ralph_scrooge.utils.worker_job.get_cache',
+                return_value=cache,
+            ):
+                SampleReport()._clear_cache(export=True, rows_count=1)
+        self.assertFalse(os.path.exists(path))
+        self.assertIsNone(cache.get(key))
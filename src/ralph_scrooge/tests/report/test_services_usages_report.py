@@ -0,0 +1,249 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from datetime import date
+from unittest import skipUnless
+
+import mock
+from django.core.cache import get_cache
+
+from ralph_scrooge.models import CostInputChange, ServiceEnvironment
+from ralph_scrooge.report import pivot, usages_cache
+from ralph_scrooge.report.report_services_usages import ServicesUsagesReport
+from ralph_scrooge.tests import ScroogeTestCase
+from ralph_scrooge.tests.utils.factory import (
+    DailyUsageFactory,
+    ServiceEnvironmentFactory,
+    UsageTypeFactory,
+)
+
+
+class TestServicesUsagesReport(ScroogeTestCase):
+    def setUp(self):
+        self.cache = get_cache('locmem://')
+        self.cache.clear()
+        patcher = mock.patch.object(
+            usages_cache,
+            '_get_cache',
+            return_value=self.cache,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.usage_type = UsageTypeFactory()
+        self.se1, self.se2 = ServiceEnvironmentFactory.create_batch(2)
+        self.service_environments = ServiceEnvironment.objects.all()
+        for day in (1, 2, 3, 4):
+            DailyUsageFactory(
+                type=self.usage_type,
+                service_environment=self.se1,
+                date=date(2014, 10, day),
+                value=day,
+            )
+
+    def _get_usages(self, start, end):
+        return ServicesUsagesReport._get_usage_type_usages(
+            start,
+            end,
+            self.usage_type,
+            self.service_environments,
+        )
+
+    def test_get_periods(self):
+        self.assertEquals(usages_cache.get_periods([
+            date(2014, 10, 5),
+            date(2014, 10, 1),
+            date(2014, 10, 2),
+            date(2014, 10, 3),
+        ]), [
+            (date(2014, 10, 1), date(2014, 10, 3)),
+            (date(2014, 10, 5), date(2014, 10, 5)),
+        ])
+
+    def test_usages_fetched_only_for_missing_days(self):
+        self._get_usages(date(2014, 10, 1), date(2014, 10, 2))
+        with mock.patch(
+            'ralph_scrooge.report.report_services_usages.plugin_runner.run'
+        ) as run_mock:
+            run_mock.return_value = {date(2014, 10, 3): {self.se1.id: 3}}
+            usages = self._get_usages(date(2014, 10, 2), date(2014, 10, 3))
+        run_mock.assert_called_once_with(
+            'scrooge_reports',
+            self.usage_type.get_plugin_name(),
+            type='usages',
+            start=date(2014, 10, 3),
+            end=date(2014, 10, 3),
+            usage_type=self.usage_type,
+            service_environments=mock.ANY,
+        )
+        self.assertEquals(
+            set(run_mock.call_args[1]['service_environments']),
+            set(self.service_environments),
+        )
+        self.assertEquals(usages, {
+            date(2014, 10, 2): {self.se1.id: 2},
+            date(2014, 10, 3): {self.se1.id: 3},
+        })
+
+    def test_cached_days_invalidated_when_usages_changed(self):
+        self._get_usages(date(2014, 10, 1), date(2014, 10, 4))
+        DailyUsageFactory(
+            type=self.usage_type,
+            service_environment=self.se2,
+            date=date(2014, 10, 2),
+            value=10,
+        )
+        CostInputChange.mark_usages(
+            [self.usage_type],
+            date(2014, 10, 2),
+            date(2014, 10, 2),
+        )
+        self.assertEquals(
+            sorted(usages_cache.get_days(self.usage_type, [
+                date(2014, 10, day) for day in (1, 2, 3, 4)
+            ])),
+            [date(2014, 10, 1), date(2014, 10, 3), date(2014, 10, 4)],
+        )
+        self.assertEquals(
+            self._get_usages(date(2014, 10, 2), date(2014, 10, 2)),
+            {date(2014, 10, 2): {self.se1.id: 2, self.se2.id: 10}},
+        )
+
+    def test_cached_days_shared_by_service_environments(self):
+        DailyUsageFactory(
+            type=self.usage_type,
+            service_environment=self.se2,
+            date=date(2014, 10, 1),
+            value=10,
+        )
+        self.assertEquals(
+            ServicesUsagesReport._get_usage_type_usages(
+                date(2014, 10, 1),
+                date(2014, 10, 1),
+                self.usage_type,
+                [self.se1],
+            ),
+            {date(2014, 10, 1): {self.se1.id: 1}},
+        )
+        # usages of other service environments are taken from cache
+        with self.assertNumQueries(0):
+            self.assertEquals(
+                ServicesUsagesReport._get_usage_type_usages(
+                    date(2014, 10, 1),
+                    date(2014, 10, 1),
+                    self.usage_type,
+                    [self.se1, self.se2],
+                ),
+                {date(2014, 10, 1): {self.se1.id: 1, self.se2.id: 10}},
+            )
+
+    def test_invalidate_unbounded_period(self):
+        self._get_usages(date(2014, 10, 1), date(2014, 10, 4))
+        usages_cache.invalidate([self.usage_type.id])
+        self.assertEquals(usages_cache.get_days(self.usage_type, [
+            date(2014, 10, 1),
+        ]), {})
+
+
+class TestPivot(ScroogeTestCase):
+    def setUp(self):
+        self.ut1 = UsageTypeFactory(divide_by=2, rounding=1)
+        self.ut2 = UsageTypeFactory(divide_by=0, rounding=0)
+        self.se1, self.se2 = ServiceEnvironmentFactory.create_batch(2)
+        self.service_environments = [self.se1, self.se2]
+        self.columns = pivot.get_columns(
+            date(2014, 10, 1),
+            date(2014, 10, 2),
+            [self.ut1, self.ut2],
+        )
+        self.data = {
+            date(2014, 10, 1): {
+                self.ut1.id: {self.se1.id: 1234.0, self.se2.id: 5},
+                self.ut2.id: {self.se2.id: 2.5},
+            },
+            date(2014, 10, 2): {
+                # usages of service environment not included in report
+                self.ut1.id: {self.se2.id + 1: 100},
+            },
+        }
+        self.expected = [
+            [12.3, 0.0, 0.0, 0.0],
+            [0.1, 3.0, 0.0, 0.0],
+        ]
+
+    def test_get_columns(self):
+        self.assertEquals(self.columns, [
+            (date(2014, 10, 1), self.ut1),
+            (date(2014, 10, 1), self.ut2),
+            (date(2014, 10, 2), self.ut1),
+            (date(2014, 10, 2), self.ut2),
+        ])
+
+    def test_pivot_python(self):
+        self.assertEquals(
+            pivot.pivot_python(
+                self.columns,
+                self.data,
+                self.service_environments,
+            ),
+            self.expected,
+        )
+
+    @skipUnless(pivot.is_available(), 'NumPy is not installed')
+    def test_pivot_numpy(self):
+        self.assertEquals(
+            pivot.pivot_numpy(
+                self.columns,
+                self.data,
+                self.service_environments,
+            ),
+            self.expected,
+        )
+
+    def _test_pivot_rounding(self, pivot_func):
+        usage_type = UsageTypeFactory(divide_by=0, rounding=2)
+        columns = pivot.get_columns(
+            date(2014, 10, 1),
+            date(2014, 10, 3),
+            [usage_type],
+        )
+        day_usages = [
+            {self.se1.id: 2.675, self.se2.id: 0.125},
+            {self.se1.id: -2.675, self.se2.id: -0.125},
+            {self.se1.id: None, self.se2.id: 2.675},
+        ]
+        data = dict(
+            (date(2014, 10, day), {usage_type.id: usages})
+            for day, usages in enumerate(day_usages, start=1)
+        )
+        # the same as Python 2 `round`
+        self.assertEquals(
+            pivot_func(columns, data, self.service_environments),
+            [
+                [2.67, -2.67, None],
+                [0.13, -0.13, 2.67],
+            ],
+        )
+
+    def test_pivot_python_rounding(self):
+        self._test_pivot_rounding(pivot.pivot_python)
+
+    @skipUnless(pivot.is_available(), 'NumPy is not installed')
+    def test_pivot_numpy_rounding(self):
+        self._test_pivot_rounding(pivot.pivot_numpy)
+
+    def test_final_report(self):
+        rows = ServicesUsagesReport._prepare_final_report(
+            date(2014, 10, 1),
+            date(2014, 10, 2),
+            [self.ut1, self.ut2],
+            self.data,
+            self.service_environments,
+        )
+        self.assertEquals(rows, [
+            [se.service.name, se.environment.name] + row
+            for se, row in zip(self.service_environments, self.expected)
+        ])
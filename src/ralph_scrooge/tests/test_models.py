@@ -13,7 +13,12 @@ from ralph_scrooge import models
 from ralph_scrooge.tests import ScroogeTestCase
 from ralph_scrooge.tests.models import History, HistoricalHistory
 from ralph_scrooge.tests.utils.factory import (
+    BaseUsageFactory,
+    CostDateStatusFactory,
+    DailyCostFactory,
     DailyPricingObjectFactory,
+    DailyUsageFactory,
+    DynamicExtraCostDivisionFactory,
     DynamicExtraCostFactory,
     ExtraCostFactory,
     ExtraCostTypeFactory,
@@ -21,6 +26,8 @@ from ralph_scrooge.tests.utils.factory import (
     PricingServiceFactory,
     ServiceEnvironmentFactory,
     SupportCostFactory,
+    TeamCostFactory,
+    UsagePriceFactory,
     UsageTypeFactory,
     WarehouseFactory,
 )
@@ -312,3 +319,227 @@ class TestModelRepr(ScroogeTestCase):
             support_cost.start,
             support_cost.end,
         ))
+
+
+class TestCostInputChange(ScroogeTestCase):
+    def setUp(self):
+        self.usage_type = UsageTypeFactory()
+        self.date1 = datetime.date(2014, 10, 10)
+        self.date2 = datetime.date(2014, 10, 11)
+        self.date3 = datetime.date(2014, 10, 12)
+        CostDateStatusFactory(date=self.date1, calculated=True)
+        CostDateStatusFactory(
+            date=self.date2,
+            calculated=True,
+            forecast_calculated=True,
+        )
+
+    def _get_changes(self):
+        return set(models.CostInputChange.objects.values_list(
+            'date',
+            'type',
+            'forecast',
+        ))
+
+    def test_mark(self):
+        models.CostInputChange.mark([self.usage_type], self.date1, self.date3)
+        # mark again to check that changes are not duplicated
+        models.CostInputChange.mark([self.usage_type.id], self.date2)
+        self.assertEquals(self._get_changes(), set([
+            (self.date1, self.usage_type.id, False),
+            (self.date2, self.usage_type.id, False),
+            (self.date2, self.usage_type.id, True),
+        ]))
+
+    def test_mark_not_calculated_date(self):
+        models.CostInputChange.mark([self.usage_type], self.date3, self.date3)
+        self.assertEquals(self._get_changes(), set())
+
+    def test_daily_usage_changes_not_tracked(self):
+        daily_usage = DailyUsageFactory(type=self.usage_type, date=self.date1)
+        daily_usage.delete()
+        self.assertEquals(self._get_changes(), set())
+
+    def test_mark_usages(self):
+        models.CostInputChange.mark_usages(
+            [self.usage_type],
+            self.date1,
+            self.date1,
+        )
+        self.assertEquals(self._get_changes(), set([
+            (self.date1, self.usage_type.id, False),
+        ]))
+
+    def test_mark_usages_by_cost(self):
+        usage_type = UsageTypeFactory(by_cost=True)
+        UsagePriceFactory(type=usage_type, start=self.date1, end=self.date2)
+        models.CostInputChange.objects.all().delete()
+        models.CostInputChange.mark_usages(
+            [usage_type],
+            self.date1,
+            self.date1,
+        )
+        # every day of price period is marked as changed
+        self.assertEquals(self._get_changes(), set([
+            (self.date1, usage_type.id, False),
+            (self.date2, usage_type.id, False),
+            (self.date2, usage_type.id, True),
+        ]))
+
+    def test_usage_price_changes(self):
+        usage_price = UsagePriceFactory(
+            type=self.usage_type,
+            start=self.date3,
+            end=self.date3,
+        )
+        self.assertEquals(self._get_changes(), set())
+        usage_price.start = self.date2
+        usage_price.save()
+        self.assertEquals(self._get_changes(), set([
+            (self.date2, self.usage_type.id, False),
+            (self.date2, self.usage_type.id, True),
+        ]))
+
+    def test_accepted_date_not_marked(self):
+        CostDateStatusFactory(
+            date=self.date3,
+            calculated=True,
+            accepted=True,
+            forecast_calculated=True,
+        )
+        UsagePriceFactory(
+            type=self.usage_type,
+            start=self.date3,
+            end=self.date3,
+        )
+        # only forecast costs (not accepted) are recalculated
+        self.assertEquals(self._get_changes(), set([
+            (self.date3, self.usage_type.id, True),
+        ]))
+
+    def test_dynamic_extra_cost_division_changes(self):
+        dynamic_extra_cost = DynamicExtraCostFactory(
+            start=self.date2,
+            end=self.date2,
+        )
+        models.CostInputChange.objects.all().delete()
+        DynamicExtraCostDivisionFactory(
+            dynamic_extra_cost_type=dynamic_extra_cost.dynamic_extra_cost_type,
+        )
+        # only days of dynamic extra costs of division type are marked
+        type_id = dynamic_extra_cost.dynamic_extra_cost_type_id
+        self.assertEquals(self._get_changes(), set([
+            (self.date2, type_id, False),
+            (self.date2, type_id, True),
+        ]))
+
+    def test_team_cost_dates_changes(self):
+        team_cost = TeamCostFactory(start=self.date1, end=self.date1)
+        models.CostInputChange.objects.all().delete()
+        team_cost.start = team_cost.end = self.date3
+        team_cost.save()
+        # previous dates range is marked as changed too
+        self.assertEquals(self._get_changes(), set([
+            (self.date1, team_cost.team.id, False),
+        ]))
+
+
+class TestMonthlyCost(ScroogeTestCase):
+    def setUp(self):
+        self.base_usage = BaseUsageFactory()
+        self.service_environment = ServiceEnvironmentFactory()
+        for day, forecast in [
+            (datetime.date(2014, 10, 1), False),
+            (datetime.date(2014, 10, 31), False),
+            (datetime.date(2014, 10, 31), True),
+            (datetime.date(2014, 11, 1), False),
+        ]:
+            DailyCostFactory(
+                date=day,
+                service_environment=self.service_environment,
+                type=self.base_usage,
+                forecast=forecast,
+                cost=10,
+                value=2,
+            )
+
+    def test_get_months(self):
+        self.assertEquals(
+            models.MonthlyCost.get_months(
+                datetime.date(2014, 11, 15),
+                datetime.date(2015, 1, 10),
+            ),
+            [
+                (datetime.date(2014, 11, 1), datetime.date(2014, 11, 30)),
+                (datetime.date(2014, 12, 1), datetime.date(2014, 12, 31)),
+                (datetime.date(2015, 1, 1), datetime.date(2015, 1, 31)),
+            ]
+        )
+
+    def test_split_period(self):
+        self.assertEquals(
+            models.MonthlyCost.split_period(
+                datetime.date(2014, 11, 15),
+                datetime.date(2015, 1, 10),
+            ),
+            (
+                [(datetime.date(2014, 12, 1), datetime.date(2014, 12, 31))],
+                [
+                    (datetime.date(2014, 11, 15), datetime.date(2014, 11, 30)),
+                    (datetime.date(2015, 1, 1), datetime.date(2015, 1, 10)),
+                ],
+            )
+        )
+
+    def test_refresh(self):
+        models.MonthlyCost.refresh(
+            datetime.date(2014, 10, 15),
+            datetime.date(2014, 11, 15),
+            False,
+        )
+        self.assertEquals(
+            set(models.MonthlyCost.objects.values_list(
+                'month',
+                'service_environment',
+                'type',
+                'forecast',
+                'cost',
+                'value',
+            )),
+            set([
+                (
+                    datetime.date(2014, 10, 1),
+                    self.service_environment.id,
+                    self.base_usage.id,
+                    False,
+                    D(20),
+                    4,
+                ),
+                (
+                    datetime.date(2014, 11, 1),
+                    self.service_environment.id,
+                    self.base_usage.id,
+                    False,
+                    D(10),
+                    2,
+                ),
+            ])
+        )
+
+    def test_refresh_replaces_month(self):
+        models.MonthlyCost.refresh(
+            datetime.date(2014, 10, 1),
+            datetime.date(2014, 10, 1),
+            False,
+        )
+        models.DailyCost.objects.filter(
+            date=datetime.date(2014, 10, 1),
+        ).delete()
+        models.MonthlyCost.refresh(
+            datetime.date(2014, 10, 31),
+            datetime.date(2014, 10, 31),
+            False,
+        )
+        monthly_cost = models.MonthlyCost.objects.get()
+        self.assertEquals(monthly_cost.cost, D(10))
+        self.assertEquals(monthly_cost.value, 2)
@@ -6,10 +6,25 @@ from __future__ import print_function
 from __future__ import unicode_literals
 
 from datetime import date
+from decimal import Decimal as D
 
+import mock
+
+from django.core.cache import get_cache
 from django.test import TestCase
 
+from ralph_scrooge.models import ServiceEnvironment
+from ralph_scrooge.tests.utils.factory import ServiceEnvironmentFactory
 from ralph_scrooge.utils import common
+from ralph_scrooge.utils.cost_tree import CostNode
+from ralph_scrooge.utils.networks import NetworksIndex, ip_to_int
+from ralph_scrooge.utils.profiling import Profiler
+from ralph_scrooge.utils.result_store import (
+    ResultStore,
+    dumps,
+    loads,
+    to_columns,
+)
 
 
 class TestRangesOverlap(TestCase):
@@ -50,3 +65,217 @@ class TestRangesOverlap(TestCase):
             ],
             result
         )
+
+
+class TestChunks(TestCase):
+    def test_chunks(self):
+        self.assertEquals(
+            list(common.chunks(range(5), 2)),
+            [[0, 1], [2, 3], [4]],
+        )
+
+    def test_chunks_generator(self):
+        self.assertEquals(
+            list(common.chunks((i for i in range(4)), 2)),
+            [[0, 1], [2, 3]],
+        )
+
+    def test_chunks_empty(self):
+        self.assertEquals(list(common.chunks([], 2)), [])
+
+
+class TestCostNode(TestCase):
+    def setUp(self):
+        self.node = CostNode(
+            type_id=1,
+            cost=D('10'),
+            pricing_object_id=2,
+            children=[CostNode(type_id=3, cost=D('4'), value=5)],
+        )
+
+    def test_dict_like_access(self):
+        self.assertEquals(self.node['type'], 1)
+        self.assertEquals(self.node['pricing_object_id'], 2)
+        self.assertEquals(len(self.node['_children']), 1)
+        self.assertNotIn('value', self.node)
+        self.assertIsNone(self.node.get('warehouse'))
+        with self.assertRaises(KeyError):
+            self.node['invalid']
+
+    def test_set_related_field_as_object(self):
+        self.node['warehouse'] = mock.Mock(id=7)
+        self.assertEquals(self.node.warehouse_id, 7)
+
+    def test_equal_to_dict(self):
+        self.assertEquals(self.node, {
+            'type': mock.Mock(id=1),
+            'cost': D('10'),
+            'pricing_object_id': 2,
+            '_children': [{'type_id': 3, 'cost': D('4'), 'value': 5}],
+        })
+        self.assertNotEquals(self.node, {'type_id': 1, 'cost': D('10')})
+        self.assertNotEquals(self.node, {'type_id': 1, 'invalid': 1})
+
+    def test_to_dict_from_dict(self):
+        self.assertEquals(
+            CostNode.from_dict(self.node.to_dict()).to_dict(),
+            {
+                'type_id': 1,
+                'cost': D('10'),
+                'pricing_object_id': 2,
+                '_children': [{'type_id': 3, 'cost': D('4'), 'value': 5}],
+            }
+        )
+
+    def test_no_instance_dict(self):
+        self.assertFalse(hasattr(self.node, '__dict__'))
+
+
+class TestMemoizeLRU(TestCase):
+    def setUp(self):
+        self.calls = []
+
+        @common.memoize_lru(skip_first=True, max_size=2)
+        def func(obj, x, y=None):
+            self.calls.append((x, y))
+            return x
+        self.func = func
+
+    def test_cache(self):
+        self.func(1, 10, y=[1, 2])
+        self.func(2, 10, y=[1, 2])  # first argument is skipped
+        self.func(1, 20)
+        self.assertEquals(self.calls, [(10, [1, 2]), (20, None)])
+        self.assertEquals(self.func.cache.get_stats(), {
+            'hits': 1,
+            'misses': 2,
+            'evictions': 0,
+            'size': 2,
+        })
+
+    def test_eviction(self):
+        for x in [1, 2, 3, 1]:
+            self.func(None, x)
+        self.assertEquals(self.calls, [(x, None) for x in [1, 2, 3, 1]])
+        self.assertEquals(self.func.cache.evictions, 2)
+        self.assertEquals(len(self.func.cache), 2)
+
+    def test_timeout(self):
+        self.func.cache.timeout = 10
+        with mock.patch('ralph_scrooge.utils.common.time.time') as time_mock:
+            time_mock.return_value = 100
+            self.func(None, 1)
+            time_mock.return_value = 105
+            self.func(None, 1)
+            time_mock.return_value = 120
+            self.func(None, 1)
+        self.assertEquals(self.calls, [(1, None), (1, None)])
+
+    def test_unhashable_argument_not_cached(self):
+        self.func(None, {1: [2]}, y=bytearray(b'a'))
+        self.func(None, {1: [2]}, y=bytearray(b'a'))
+        self.assertEquals(len(self.calls), 2)
+
+    def test_clear_all(self):
+        self.func(None, 1)
+        self.assertIn(
+            self.func.cache.name,
+            common.MemoizeCache.get_all_stats(),
+        )
+        common.MemoizeCache.clear_all()
+        self.assertEquals(len(self.func.cache), 0)
+        self.assertEquals(self.func.cache.misses, 0)
+        self.func(None, 1)
+        self.assertEquals(len(self.calls), 2)
+
+
+class TestProfiler(TestCase):
+    def test_profiler(self):
+        ServiceEnvironmentFactory.create_batch(3)
+        with Profiler() as profiler:
+            list(ServiceEnvironment.objects.all())
+            ServiceEnvironment.objects.count()
+        self.assertEquals(profiler.queries_count, 2)
+        self.assertEquals(profiler.rows_count, 4)
+        self.assertGreaterEqual(profiler.wall_time, profiler.db_time)
+
+    def test_cursor_restored(self):
+        with self.assertRaises(ValueError):
+            with Profiler() as profiler:
+                raise ValueError()
+        list(ServiceEnvironment.objects.all())
+        self.assertEquals(profiler.queries_count, 0)
+
+
+class TestResultStore(TestCase):
+    def setUp(self):
+        self.header = [[('Name', {}), ('Cost', {'colspan': 2})], []]
+        self.rows = [
+            ['se1', D('10.50'), 1.5],
+            ['se2', D('0.25'), None],
+        ]
+
+    def test_to_columns(self):
+        columns = to_columns((self.header, self.rows))[1]
+        self.assertEquals(columns.rows_count, 2)
+        self.assertEquals(columns.columns[0], ['se1', 'se2'])
+        self.assertEquals(columns.columns[1].values, ['10.50', '0.25'])
+
+    def test_dumps_loads(self):
+        for value in [
+            (self.header, self.rows),
+            {date(2014, 10, 1): {'plugin': True}},
+            [],
+            None,
+        ]:
+            self.assertEquals(loads(dumps(value)), value)
+
+    def test_save_load(self):
+        store = ResultStore(get_cache('locmem://'))
+        handle = store.save('report?a=1', (self.header, self.rows))
+        self.assertEquals(store.load(handle), (self.header, self.rows))
+        store.delete('report?a=1')
+        self.assertIsNone(store.load(handle))
+
+
+class TestNetworksIndex(TestCase):
+    def test_ip_to_int(self):
+        self.assertEquals(ip_to_int('0.0.0.0'), 0)
+        self.assertEquals(ip_to_int('10.0.0.1'), 167772161)
+        self.assertEquals(ip_to_int('255.255.255.255'), 2 ** 32 - 1)
+
+    def test_ip_to_int_invalid_address(self):
+        with self.assertRaises(ValueError):
+            ip_to_int('10.0.0.256')
+
+    def test_contains(self):
+        index = NetworksIndex([
+            '10.0.0.0/8',
+            '10.10.0.0/16',  # overlapping with 10.0.0.0/8
+            '192.168.1.0/24',
+            '192.168.2.0/24',  # adjacent to 192.168.1.0/24
+            '172.16.0.1',
+        ])
+        for address, result in [
+            ('9.255.255.255', False),
+            ('10.0.0.0', True),
+            ('10.10.10.10', True),
+            ('10.255.255.255', True),
+            ('11.0.0.0', False),
+            ('172.16.0.1', True),
+            ('172.16.0.2', False),
+            ('192.168.0.255', False),
+            ('192.168.1.0', True),
+            ('192.168.2.255', True),
+            ('192.168.3.0', False),
+        ]:
+            self.assertEquals(address in index, result, address)
+
+    def test_empty(self):
+        index = NetworksIndex([])
+        self.assertFalse('10.0.0.1' in index)
+        self.assertEquals(len(index), 0)
+
+    def test_iter(self):
+        networks = ['10.0.0.0/8', '172.16.0.1']
+        self.assertEquals(list(NetworksIndex(networks)), networks)
@@ -5,11 +5,13 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
 
+import itertools
+import time
+from collections import OrderedDict
 from decimal import Decimal
 from functools import wraps
 
 from django.conf import settings
-from lck.cache import memoize as memoize_orig
 
 
 class AttributeDict(dict):
@@ -35,6 +37,8 @@ class HashableDict(dict):
         if isinstance(el, list):
             for i, x in enumerate(el):
                 el[i] = HashableDict.parse(x)
+        elif hasattr(el, 'to_dict'):  # ex. CostNode
+            return HashableDict.parse(el.to_dict())
         elif isinstance(el, dict):
             d = HashableDict()
             for k, v in el.iteritems():
@@ -106,6 +110,22 @@ def sum_of_intervals(intervals):
     return result
 
 
+def chunks(iterable, size):
+    """
+    Yields lists of (at most) size consecutive elements of iterable. Iterable
+    is consumed lazily, so it could be a generator of any length.
+
+    >>> list(chunks(range(5), 2))
+    [[0, 1], [2, 3], [4]]
+    """
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
 def normalize_decimal(d):
     """
     Normalize decimal without scientific notation (remove exponent and trailing
@@ -138,6 +158,158 @@ def memoize_proxy(func=None, *rargs, **rkwargs):
 
     return wrapper_standard
 
+
+class MemoizeCache(object):
+    """
+    Bounded (LRU) cache of results of single memoized function, with
+    statistics of hits, misses and evictions. Entries older than timeout
+    (in seconds) are treated as missing.
+    """
+    _caches = []
+
+    def __init__(self, name, max_size=None, timeout=None):
+        self.name = name
+        self.max_size = max_size
+        self.timeout = timeout
+        self._entries = OrderedDict()
+        self.hits = self.misses = self.evictions = 0
+        MemoizeCache._caches.append(self)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """
+        Returns (found, value) tuple for key.
+        """
+        try:
+            created, value = self._entries.pop(key)
+        except KeyError:
+            self.misses += 1
+            return False, None
+        if self.timeout is not None and time.time() - created > self.timeout:
+            self.misses += 1
+            return False, None
+        # move entry to the end (most recently used)
+        self._entries[key] = (created, value)
+        self.hits += 1
+        return True, value
+
+    def set(self, key, value):
+        self._entries[key] = (time.time(), value)
+        if self.max_size is not None:
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """
+        Removes all entries and resets statistics.
+        """
+        self._entries.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def get_stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self),
+        }
+
+    @classmethod
+    def clear_all(cls):
+        """
+        Clears caches of all memoized functions (ex. at the beginning of
+        costs calculation, so results from previous run are not used).
+        """
+        for cache in cls._caches:
+            cache.clear()
+
+    @classmethod
+    def get_all_stats(cls):
+        """
+        Returns statistics of caches of all memoized functions (which were
+        called since last clear), grouped by function name (including module,
+        ex. plugin).
+        """
+        return dict([
+            (cache.name, cache.get_stats()) for cache in cls._caches
+            if cache.hits or cache.misses
+        ])
+
+
+def _make_key(value):
+    """
+    Converts (possibly unhashable) arguments to hashable key.
+    """
+    if isinstance(value, (list, tuple)):
+        return tuple(_make_key(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_make_key(v) for v in value)
+    if isinstance(value, dict):
+        return frozenset((k, _make_key(v)) for k, v in value.items())
+    return value
+
+
+def memoize_lru(
+    func=None,
+    skip_first=False,
+    max_size=None,
+    timeout=None,
+):
+    """
+    Memoize decorator caching results of function in bounded (LRU) cache
+    (see `MemoizeCache`). If skip_first is True, first argument (ex. self) is
+    not part of cache key. By default size and timeout of cache are taken
+    from MEMOIZE_MAX_SIZE and MEMOIZE_TIMEOUT settings.
+
+    >>> @memoize_lru(max_size=2)
+    ... def square(x):
+    ...     return x * x
+    >>> [square(x) for x in (2, 2, 3, 4, 2)]
+    [4, 4, 9, 16, 4]
+    >>> stats = square.cache.get_stats()
+    >>> stats['hits'], stats['misses'], stats['evictions'], stats['size']
+    (1, 4, 2, 2)
+    """
+    if func is None:
+        def wrapper(f):
+            return memoize_lru(
+                func=f,
+                skip_first=skip_first,
+                max_size=max_size,
+                timeout=timeout,
+            )
+        return wrapper
+
+    cache = MemoizeCache(
+        name='{}.{}'.format(func.__module__, func.__name__),
+        max_size=(
+            max_size if max_size is not None else
+            getattr(settings, 'MEMOIZE_MAX_SIZE', None)
+        ),
+        timeout=(
+            timeout if timeout is not None else
+            getattr(settings, 'MEMOIZE_TIMEOUT', None)
+        ),
+    )
+
+    @wraps(func)
+    def wrapper_lru(*args, **kwargs):
+        try:
+            key = _make_key((args[1:] if skip_first else args, kwargs))
+            found, result = cache.get(key)
+        except TypeError:  # unhashable argument - don't cache
+            return func(*args, **kwargs)
+        if not found:
+            result = func(*args, **kwargs)
+            cache.set(key, result)
+        return result
+
+    wrapper_lru.cache = cache
+    return wrapper_lru
+
 # if in testing environment (ex unit tests), set memoize decorator to memoize
-# proxy, else to original (caching) memoize
-memoize = memoize_proxy if getattr(settings, 'TESTING', None) else memoize_orig
+# proxy, else to (caching) LRU memoize
+memoize = memoize_proxy if getattr(settings, 'TESTING', None) else memoize_lru
@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+"""
+Compact representation of costs tree returned by costs plugins.
+
+Single node of costs tree was previously represented as a dict (ex.
+`{'type_id': 1, 'cost': D(10), '_children': [...]}`). For every pricing
+object and every level of costs hierarchy new dict was allocated, which
+(for tens of thousands of pricing objects) dominated memory usage of costs
+collecting. `CostNode` is using `__slots__` (no instance dict), but still
+supports (for compatibility) dict-like access to its fields, including old
+keys ('type', 'pricing_object', 'warehouse', '_children'), so it could be
+used wherever dict was used.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+
+COST_NODE_FIELDS = (
+    'type_id',
+    'cost',
+    'value',
+    'pricing_object_id',
+    'warehouse_id',
+    'percent',
+)
+# dict keys supported for compatibility (mapped to node fields)
+COST_NODE_ALIASES = {
+    'type': 'type_id',
+    'pricing_object': 'pricing_object_id',
+    'warehouse': 'warehouse_id',
+    '_children': 'children',
+}
+# fields, which values could be set as model instance in dict-like access
+# (id is stored)
+COST_NODE_RELATED_FIELDS = ('type_id', 'pricing_object_id', 'warehouse_id')
+
+
+def _get_id(obj):
+    return getattr(obj, 'id', obj)
+
+
+class CostNode(object):
+    """
+    Single node of costs tree. Fields with None value are treated as not set
+    (ex. they are not passed to DailyCost).
+
+    Related fields (type, pricing object, warehouse) have to be passed to
+    constructor as ids (model instances are accepted only in dict-like
+    access, ex. in `from_dict`).
+    """
+    __slots__ = COST_NODE_FIELDS + ('children',)
+    __hash__ = None
+
+    def __init__(
+        self,
+        type_id,
+        cost,
+        value=None,
+        pricing_object_id=None,
+        warehouse_id=None,
+        percent=None,
+        children=None,
+    ):
+        self.type_id = type_id
+        self.cost = cost
+        self.value = value
+        self.pricing_object_id = pricing_object_id
+        self.warehouse_id = warehouse_id
+        self.percent = percent
+        self.children = children
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Creates costs (sub)tree from dict (in format returned previously by
+        costs plugins).
+        """
+        node = cls(type_id=None, cost=None)
+        for key, value in data.items():
+            if key == '_children':
+                value = [cls.from_dict(child) for child in value]
+            node[key] = value
+        return node
+
+    def to_dict(self):
+        """
+        Returns costs (sub)tree as dict (with children converted to dicts).
+        """
+        result = {}
+        for key, value in self.items():
+            if key == '_children':
+                value = [to_dict(child) for child in value]
+            result[key] = value
+        return result
+
+    # dict-like interface
+    @classmethod
+    def _get_field(cls, key):
+        field = COST_NODE_ALIASES.get(key, key)
+        if field not in cls.__slots__:
+            raise KeyError(key)
+        return field
+
+    def __getitem__(self, key):
+        value = getattr(self, self._get_field(key))
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        field = self._get_field(key)
+        if field in COST_NODE_RELATED_FIELDS:
+            value = _get_id(value)
+        setattr(self, field, value)
+
+    def __contains__(self, key):
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def items(self):
+        """
+        Returns list of (key, value) of set fields (children are returned
+        with '_children' key).
+        """
+        result = [
+            (field, getattr(self, field)) for field in COST_NODE_FIELDS
+            if getattr(self, field) is not None
+        ]
+        if self.children is not None:
+            result.append(('_children', self.children))
+        return result
+
+    def keys(self):
+        return [key for key, value in self.items()]
+
+    # comparison (with other nodes or with dicts)
+    def __eq__(self, other):
+        if isinstance(other, (CostNode, dict)):
+            try:
+                return self.to_dict() == to_dict(other)
+            except KeyError:  # dict with key unknown for node
+                return False
+        return NotImplemented
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        if result is NotImplemented:
+            return result
+        return not result
+
+    def __lt__(self, other):
+        if isinstance(other, (CostNode, dict)):
+            return self.to_dict() < to_dict(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return 'CostNode({})'.format(', '.join(
+            '{}={!r}'.format(key, value) for key, value in self.items()
+        ))
+
+
+def to_dict(node):
+    """
+    Returns costs (sub)tree (CostNode or dict) as normalized dict (with ids
+    instead of model instances and node fields names as keys).
+    """
+    if isinstance(node, CostNode):
+        return node.to_dict()
+    return CostNode.from_dict(node).to_dict()
+
+
+def count_nodes(nodes):
+    """
+    Returns number of nodes (CostNodes or dicts) in costs tree (including
+    children) or in pricing service costs hierarchy (dict with tuples (cost,
+    children hierarchy) as values).
+
+    >>> count_nodes([CostNode(1, 10, children=[CostNode(2, 5)]), {'type': 3}])
+    3
+    >>> count_nodes({1: (10, {2: (5, {}), 3: (5, None)})})
+    3
+    """
+    if isinstance(nodes, dict):
+        return sum(
+            1 + count_nodes(children or {})
+            for cost, children in nodes.values()
+        )
+    return sum(
+        1 + count_nodes(node.get('_children') or [])
+        for node in nodes
+    )
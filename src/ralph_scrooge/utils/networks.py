@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+Index of IPv4 networks.
+
+Networks are compiled once into sorted, non-overlapping ranges of integer
+addresses, so checking if address belongs to any of networks is a binary
+search over ranges (instead of testing every network). Addresses are parsed
+straight into integers, without building `ipaddr` objects.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import bisect
+import socket
+import struct
+
+import ipaddr
+
+
+def ip_to_int(address):
+    """
+    Returns IPv4 address as integer.
+
+    >>> ip_to_int('10.0.0.1')
+    167772161
+    """
+    try:
+        return struct.unpack(b'!I', socket.inet_aton(address))[0]
+    except (socket.error, UnicodeError):
+        raise ipaddr.AddressValueError(address)
+
+
+class NetworksIndex(object):
+    """
+    Index of IPv4 networks (ex. '10.0.0.0/8' or single address '10.0.0.1').
+    Iterating over index yields networks from which index was built.
+
+    >>> index = NetworksIndex(['10.0.0.0/8', '192.168.1.1'])
+    >>> '10.1.2.3' in index, '192.168.1.2' in index
+    (True, False)
+    """
+    def __init__(self, networks):
+        self.networks = list(networks)
+        ranges = sorted(
+            (int(network.network), int(network.broadcast))
+            for network in map(ipaddr.IPv4Network, self.networks)
+        )
+        # merge overlapping and adjacent ranges
+        merged = []
+        for first, last in ranges:
+            if merged and first <= merged[-1][1] + 1:
+                merged[-1][1] = max(merged[-1][1], last)
+            else:
+                merged.append([first, last])
+        self._firsts = [first for first, last in merged]
+        self._lasts = [last for first, last in merged]
+
+    def __iter__(self):
+        return iter(self.networks)
+
+    def __len__(self):
+        return len(self.networks)
+
+    def __contains__(self, address):
+        return self.contains_int(ip_to_int(address))
+
+    def contains_int(self, address):
+        """
+        Checks if address (as integer) belongs to any of networks.
+        """
+        index = bisect.bisect_right(self._firsts, address) - 1
+        return index >= 0 and address <= self._lasts[index]
+
+
+def get_networks_index(networks):
+    """
+    Returns index of networks (networks itself if it's already index).
+    """
+    if isinstance(networks, NetworksIndex):
+        return networks
+    return NetworksIndex(networks)
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""
+Lightweight profiling of database usage (working without DEBUG).
+
+While `Profiler` is active, every cursor returned by database connection is
+wrapped, so time of every query and number of rows fetched from it are
+recorded.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import time
+
+from django.db import connection as default_connection
+
+
+class ProfilingCursorWrapper(object):
+    """
+    Cursor wrapper recording time of executed queries and number of fetched
+    rows in profiler.
+    """
+    def __init__(self, cursor, profiler):
+        self.cursor = cursor
+        self.profiler = profiler
+
+    def _execute(self, method, *args):
+        start = time.time()
+        try:
+            return method(*args)
+        finally:
+            self.profiler.add_query(time.time() - start)
+
+    def execute(self, sql, params=()):
+        return self._execute(self.cursor.execute, sql, params)
+
+    def executemany(self, sql, param_list):
+        return self._execute(self.cursor.executemany, sql, param_list)
+
+    def fetchone(self):
+        row = self.cursor.fetchone()
+        if row is not None:
+            self.profiler.rows_count += 1
+        return row
+
+    def fetchmany(self, *args, **kwargs):
+        rows = self.cursor.fetchmany(*args, **kwargs)
+        self.profiler.rows_count += len(rows)
+        return rows
+
+    def fetchall(self):
+        rows = self.cursor.fetchall()
+        self.profiler.rows_count += len(rows)
+        return rows
+
+    def __getattr__(self, attr):
+        return getattr(self.cursor, attr)
+
+    def __iter__(self):
+        for row in self.cursor:
+            self.profiler.rows_count += 1
+            yield row
+
+
+class Profiler(object):
+    """
+    Context manager measuring wall time, database time, queries count and
+    rows count of code executed inside it.
+
+    Usage:
+
+        with Profiler() as profiler:
+            ...
+        print(profiler.wall_time, profiler.queries_count)
+    """
+    def __init__(self, connection=None):
+        self.connection = connection or default_connection
+        self.wall_time = 0
+        self.db_time = 0
+        self.queries_count = 0
+        self.rows_count = 0
+
+    def add_query(self, duration):
+        self.db_time += duration
+        self.queries_count += 1
+
+    def __enter__(self):
+        self._original_cursor = self.connection.cursor
+
+        def cursor():
+            return ProfilingCursorWrapper(self._original_cursor(), self)
+
+        self.connection.cursor = cursor
+        self._start = time.time()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.wall_time = time.time() - self._start
+        self.connection.cursor = self._original_cursor
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+Compressed, columnar storage of worker jobs results.
+
+Results of worker jobs (ex. reports) are mostly long lists of rows with
+values of the same type in every column. Before saving in cache, such rows
+are transposed into columns (columns of decimals are saved as strings, which
+are much shorter when pickled), pickled and compressed. Result is saved under
+separated key, so only small handle (key of result) is kept together with
+progress of job in cache.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import cPickle as pickle
+import zlib
+from collections import namedtuple
+from decimal import Decimal as D
+
+Columns = namedtuple('Columns', ['rows_count', 'columns'])
+DecimalColumn = namedtuple('DecimalColumn', ['values'])
+
+
+def _is_table(value):
+    """
+    Returns True if value is non-empty list of rows (lists) of the same
+    (non-zero) length.
+    """
+    if not isinstance(value, list) or not value:
+        return False
+    if not all(isinstance(row, list) for row in value):
+        return False
+    length = len(value[0])
+    return length > 0 and all(len(row) == length for row in value)
+
+
+def _encode_column(column):
+    if all(isinstance(value, D) for value in column):
+        return DecimalColumn([str(value) for value in column])
+    return list(column)
+
+
+def _decode_column(column):
+    if isinstance(column, DecimalColumn):
+        return [D(value) for value in column.values]
+    return column
+
+
+def to_columns(value):
+    """
+    Converts (recursively) lists of rows in value into columns.
+    """
+    if _is_table(value):
+        return Columns(len(value), [
+            _encode_column(column) for column in zip(*value)
+        ])
+    if isinstance(value, list):
+        return [to_columns(v) for v in value]
+    if isinstance(value, tuple):
+        return tuple(to_columns(v) for v in value)
+    if isinstance(value, dict):
+        return dict((k, to_columns(v)) for k, v in value.iteritems())
+    return value
+
+
+def from_columns(value):
+    """
+    Reverse of `to_columns` (columns are converted back into list of rows).
+    """
+    if isinstance(value, Columns):
+        return [
+            list(row) for row in zip(*map(_decode_column, value.columns))
+        ]
+    if isinstance(value, list):
+        return [from_columns(v) for v in value]
+    if isinstance(value, tuple):
+        return tuple(from_columns(v) for v in value)
+    if isinstance(value, dict):
+        return dict((k, from_columns(v)) for k, v in value.iteritems())
+    return value
+
+
+def dumps(value):
+    return zlib.compress(
+        pickle.dumps(to_columns(value), pickle.HIGHEST_PROTOCOL),
+    )
+
+
+def loads(data):
+    return from_columns(pickle.loads(zlib.decompress(data)))
+
+
+class ResultStore(object):
+    """
+    Store of compressed results in cache.
+    """
+    def __init__(self, cache):
+        self.cache = cache
+
+    @staticmethod
+    def get_handle(key):
+        return b'{}#result'.format(key)
+
+    def save(self, key, value, timeout=None):
+        """
+        Saves value (compressed) and returns its handle.
+        """
+        handle = self.get_handle(key)
+        self.cache.set(handle, dumps(value), timeout=timeout)
+        return handle
+
+    def load(self, handle):
+        """
+        Returns value saved under handle or None if there is no such value.
+        """
+        data = self.cache.get(handle)
+        if data is None:
+            return None
+        return loads(data)
+
+    def delete(self, key):
+        self.cache.delete(self.get_handle(key))
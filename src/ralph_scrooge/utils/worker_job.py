@@ -13,6 +13,7 @@ from django.core.cache import get_cache
 from django.core.cache.backends.dummy import DummyCache
 from rq.job import Job
 
+from ralph_scrooge.utils.result_store import ResultStore
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +25,11 @@ def _get_cache_key(cache_section, **kwargs):
 class WorkerJob(object):
     """
     Mixin to jobs that are running on RQ worker.
+
+    Only progress of job and handle of its result are kept under job key in
+    cache. Result itself is saved compressed (see `ResultStore`) and loaded
+    only when job is finished (or every time if `load_partial_results` is
+    set).
     """
     cache_section = 'default'
     queue_name = 'default'
@@ -32,37 +38,49 @@ class WorkerJob(object):
     cache_timeout = 60  # 1 minute for result of work in progress
     cache_final_result_timeout = 60 * 10  # 10 minutes for final result
     progress_update = 5  # update cache every 5% of progress
+    load_partial_results = False
 
     def _clear_cache(self, **kwargs):
         cache = get_cache(self.cache_name)
         key = _get_cache_key(self.cache_section, **kwargs)
         cache.set(key, None)
+        ResultStore(cache).delete(key)
 
     def run_on_worker(self, **kwargs):
         cache = get_cache(self.cache_name)
         if isinstance(cache, DummyCache):
             # No caching or queues with dummy cache.
-            data = self._worker_func(**kwargs)
+            data = None
+            for progress, data in self.run(**kwargs):
+                pass
             return 100, data
         key = _get_cache_key(self.cache_section, **kwargs)
         cached = cache.get(key)
+        data = None
         if cached is not None:
-            progress, job_id, data = cached
+            progress, job_id, handle = cached
             if progress < 100 and job_id is not None:
                 connection = django_rq.get_connection(self.queue_name)
                 job = Job.fetch(job_id, connection)
                 if job.is_finished:
-                    data = job.result
+                    handle = job.result
                     progress = 100
                     cache.set(
                         key,
-                        (progress, job_id, data),
+                        (progress, job_id, handle),
                         timeout=self.cache_final_result_timeout,
                     )
                 elif job.is_failed:
-                    data = None
+                    handle = None
                     progress = 100
                     cache.delete(key)
+            if handle is not None and (
+                progress == 100 or self.load_partial_results
+            ):
+                data = ResultStore(cache).load(handle)
+                if data is None and progress == 100:
+                    # result expired - run job again on next request
+                    cache.delete(key)
         else:
             queue = django_rq.get_queue(self.queue_name)
             job = queue.enqueue_call(
@@ -72,7 +90,6 @@ class WorkerJob(object):
                 result_ttl=self.cache_final_result_timeout,
             )
             progress = 0
-            data = None
             cache.set(
                 key,
                 (progress, job.id, data),
@@ -90,6 +107,7 @@ class WorkerJob(object):
         else:
             job_id = None
 
+        store = ResultStore(cache)
         last_progress = 0
         data = None
         for progress, data in cls.run(**kwargs):
@@ -99,18 +117,26 @@ class WorkerJob(object):
             ):
                 # Update cache when progress incremented by cls.progress_update
                 # or every time when cls.progress_update is None
+                handle = None
+                if cls.load_partial_results:
+                    handle = store.save(key, data, timeout=cls.cache_timeout)
                 cache.set(
                     key,
-                    (progress, job_id, data),
+                    (progress, job_id, handle),
                     timeout=cls.cache_timeout,
                 )
                 last_progress = progress
+        handle = store.save(
+            key,
+            data,
+            timeout=cls.cache_final_result_timeout,
+        )
         cache.set(
             key,
-            (progress, job_id, data),
+            (progress, job_id, handle),
             timeout=cls.cache_final_result_timeout,
         )
-        return data
+        return handle
 
     @classmethod
     def run(cls, *args, **kwargs):
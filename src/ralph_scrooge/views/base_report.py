@@ -7,10 +7,14 @@ from __future__ import unicode_literals
 
 import itertools
 import logging
+import os
+from cStringIO import StringIO
 
-from bob.csvutil import make_csv_response
+from bob.csvutil import UnicodeWriter
 from django.conf import settings
 from django.contrib import messages
+from django.core.servers.basehttp import FileWrapper
+from django.http import HttpResponse
 from django.utils.translation import ugettext_lazy as _
 
 from ralph_scrooge.views.base import Base
@@ -47,6 +51,29 @@ def format_csv_header(header):
     return result
 
 
+def make_streaming_csv_response(header, path, filename, chunk_size=8192):
+    """
+    Returns response with header rows followed by content of CSV file, which
+    is streamed in chunks (without loading whole file into memory).
+    """
+    header_file = StringIO()
+    UnicodeWriter(header_file).writerows(header)
+    response = HttpResponse(
+        itertools.chain(
+            [header_file.getvalue()],
+            FileWrapper(open(path, 'rb'), chunk_size),
+        ),
+        content_type='application/csv',
+    )
+    response['Content-Disposition'] = 'attachment; filename={}'.format(
+        filename,
+    )
+    response['Content-Length'] = (
+        len(header_file.getvalue()) + os.path.getsize(path)
+    )
+    return response
+
+
 class BaseReport(Base):
     """
     A base class for the reports. Override ``template_name``, ``Form``,
@@ -88,6 +115,10 @@ class BaseReport(Base):
                 messages.success(
                     self.request, "Cache cleared for this report.",
                 )
+            elif get.get('format', '').lower() == 'csv':
+                response = self._export_csv(**self.form.cleaned_data)
+                if response:
+                    return response
             else:
                 self.progress, result = self.run_on_worker(
                     **self.form.cleaned_data
@@ -97,14 +128,7 @@ class BaseReport(Base):
                     self._format_header()
 
                 self.progress = round(self.progress, 0)
-                if self.progress == 100:
-                    if get.get('format', '').lower() == 'csv':
-                        self.header = format_csv_header(self.header)
-                        return make_csv_response(
-                            itertools.chain(self.header, self.data),
-                            '{}.csv'.format(self.section),
-                        )
-                else:
+                if self.progress < 100:
                     messages.warning(
                         self.request,
                         _("Please wait for the report "
@@ -142,8 +166,39 @@ class BaseReport(Base):
             result.append(output_row)
         self.header = result
 
+    def _export_csv(self, **kwargs):
+        """
+        Exports report to CSV file on worker and returns response streaming
+        this file (or None if export is not finished yet).
+        """
+        # fail before running export on worker, if it's not configured
+        self.report.get_export_dir()
+        self.progress, result = self.run_on_worker(export=True, **kwargs)
+        self.progress = round(self.progress, 0)
+        if self.progress == 100 and result:
+            self.header, path = result
+            if os.path.exists(path):
+                self._format_header()
+                return make_streaming_csv_response(
+                    format_csv_header(self.header),
+                    path,
+                    '{}.csv'.format(self.section),
+                )
+            # file was removed (expired) - export report again
+            logger.warning(
+                'Export file {} not found - exporting report again'.format(
+                    path,
+                )
+            )
+            self.report._clear_cache(export=True, **kwargs)
+        messages.warning(
+            self.request,
+            _("Please wait for the report to finish exporting."),
+        )
+
     def run_on_worker(self, **kwargs):
         return self.report.run_on_worker(**kwargs)
 
     def _clear_cache(self, **kwargs):
+        self.report._clear_cache(export=True, **kwargs)
         return self.report._clear_cache(**kwargs)
@@ -40,6 +40,7 @@ class CollectPlugins(WorkerJob, Base):
     cache_section = 'scrooge_collect'
     cache_timeout = 60 * 60  # 1 hour (max time for plugin to run)
     cache_final_result_timeout = 60  # 1 minute for final result
+    load_partial_results = True  # show results of already collected days
 
     def __init__(self, *args, **kwargs):
         super(CollectPlugins, self).__init__(*args, **kwargs)
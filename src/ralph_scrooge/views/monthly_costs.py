@@ -10,6 +10,7 @@ from dateutil import rrule
 
 from django.contrib import messages
 from django.core.cache import get_cache
+from django.core.cache.backends.dummy import DummyCache
 from django.utils.translation import ugettext_lazy as _
 
 from ralph_scrooge.plugins.cost.collector import Collector
@@ -75,7 +76,8 @@ class MonthlyCosts(WorkerJob, Base):
 
     def run_jobs(self, start, end, **kwargs):
         """
-        Run calculating as separated jobs - each for one day in period.
+        Run calculating as separated jobs - each for one day in period (the
+        last finished job refreshes monthly rollup of costs, see `run`).
 
         :param start: start date
         :type start: datetime.date
@@ -89,7 +91,12 @@ class MonthlyCosts(WorkerJob, Base):
         step = 100.0 / days
         all_done = True
         for day in rrule.rrule(rrule.DAILY, dtstart=start, until=end):
-            progress, result = self.run_on_worker(day=day, **kwargs)
+            progress, result = self.run_on_worker(
+                day=day,
+                start=start,
+                end=end,
+                **kwargs
+            )
             if progress == 100 and result:
                 self.progress += step
                 self.data.update(result)
@@ -99,6 +106,25 @@ class MonthlyCosts(WorkerJob, Base):
         if all_done:
             self.forget_cache(start, end, **kwargs)
 
+    @classmethod
+    def _is_last_job(cls, start, end, forecast):
+        """
+        Counts finished jobs of period and returns True if job is the last
+        finished job of period.
+        """
+        cache = get_cache(cls.cache_name)
+        key = _get_cache_key(
+            '{}-done'.format(cls.cache_section),
+            start=start,
+            end=end,
+            forecast=forecast,
+        )
+        cache.add(key, 0, timeout=cls.cache_timeout)
+        if cache.incr(key) < (end - start).days + 1:
+            return False
+        cache.delete(key)
+        return True
+
     def forget_cache(self, start, end, **kwargs):
         """
         Set cache timeout to `cache_all_done_timeout` when all jobs are
@@ -111,7 +137,13 @@ class MonthlyCosts(WorkerJob, Base):
         """
         cache = get_cache(self.cache_name)
         for day in rrule.rrule(rrule.DAILY, dtstart=start, until=end):
-            key = _get_cache_key(self.cache_section, day=day, **kwargs)
+            key = _get_cache_key(
+                self.cache_section,
+                day=day,
+                start=start,
+                end=end,
+                **kwargs
+            )
             cached = cache.get(key)
             cache.set(key, cached, timeout=self.cache_all_done_timeout)
 
@@ -125,7 +157,7 @@ class MonthlyCosts(WorkerJob, Base):
         :type end: datetime.date
         """
         for day in rrule.rrule(rrule.DAILY, dtstart=start, until=end):
-            self._clear_cache(day=day, **kwargs)
+            self._clear_cache(day=day, start=start, end=end, **kwargs)
 
     def get_context_data(self, **kwargs):
         context = super(MonthlyCosts, self).get_context_data(**kwargs)
@@ -161,15 +193,34 @@ class MonthlyCosts(WorkerJob, Base):
             ))
 
     @classmethod
-    def run(cls, day, forecast):
+    def run(cls, day, forecast, start, end):
         """
-        Run collecting costs for one day.
+        Run collecting costs for one day of period (start - end).
+
+        Jobs of single days are not refreshing monthly rollup of costs (so
+        they are not rebuilding the same months concurrently) - it's
+        refreshed once for all days of period by the last finished job
+        (until then, reports are using daily costs of recalculated months).
+        Without workers (dummy cache) rollup is refreshed with every day.
         """
         collector = Collector()
+        run_in_place = isinstance(get_cache(cls.cache_name), DummyCache)
         try:
-            collector.process(day, forecast)
+            collector.process(day, forecast, refresh_monthly=run_in_place)
             success = True
         except Exception as e:
             logger.exception(e)
             success = False
+        if not run_in_place and cls._is_last_job(start, end, forecast):
+            try:
+                collector.refresh_monthly_costs(
+                    [d.date() for d in rrule.rrule(
+                        rrule.DAILY,
+                        dtstart=start,
+                        until=end,
+                    )],
+                    forecast,
+                )
+            except Exception as e:
+                logger.exception(e)
         yield 100, {day: success}